@@ -8,52 +8,60 @@ __version__ = "1.0.0"
 __author__ = "LolgamerHD"
 __description__ = "SysDash Backend - System monitoring and benchmarking with secure logging"
 
-# Core system information functions
-from backend.sysinfo import (
-    get_all_cpu_info,
-    get_cpu_details,
-    get_cpu_stats,
-    get_disk_io,
-    get_disk_partitions,
-    get_full_system_info,
-    get_lscpu_info,
-    get_network_info,
-    get_platform_info,
-    get_ram_info,
-    get_sys_info,
-    get_sysctl_info,
-    get_wmic_info
-)
+import importlib
+import importlib.util
 
-# Network speed testing functions
-from backend.speedtest import (
-    ping_server,
-    get_speedtest_results,
-    test_download_speed,
-    test_upload_speed
-)
+# Public functions are imported from their submodule on first access, so
+# importing backend does not pull in numpy, requests or cryptography
+_LAZY_EXPORTS = {
+    # Core system information functions
+    'get_all_cpu_info': 'backend.sysinfo',
+    'get_cpu_details': 'backend.sysinfo',
+    'get_cpu_stats': 'backend.sysinfo',
+    'get_disk_io': 'backend.sysinfo',
+    'get_disk_partitions': 'backend.sysinfo',
+    'get_full_system_info': 'backend.sysinfo',
+    'get_lscpu_info': 'backend.sysinfo',
+    'get_network_info': 'backend.sysinfo',
+    'get_platform_info': 'backend.sysinfo',
+    'get_ram_info': 'backend.sysinfo',
+    'get_sys_info': 'backend.sysinfo',
+    'get_sysctl_info': 'backend.sysinfo',
+    'get_wmic_info': 'backend.sysinfo',
 
-# Benchmark functions
-from backend.benchmark import (
-    ram_copy_speed,
-    run_full_benchmark,
-    gpu_benchmark,
-    disk_benchmark,
-    cpu_multi_thread,
-    cpu_single_thread
-)
+    # System information cache
+    'get_cache_stats': 'backend.cache',
+    'refresh_cache': 'backend.cache',
+
+    # Network speed testing functions
+    'ping_server': 'backend.speedtest',
+    'get_speedtest_results': 'backend.speedtest',
+    'test_download_speed': 'backend.speedtest',
+    'test_upload_speed': 'backend.speedtest',
+
+    # Benchmark functions
+    'ram_copy_speed': 'backend.benchmark',
+    'run_full_benchmark': 'backend.benchmark',
+    'gpu_benchmark': 'backend.benchmark',
+    'disk_benchmark': 'backend.benchmark',
+    'cpu_multi_thread': 'backend.benchmark',
+    'cpu_single_thread': 'backend.benchmark',
+}
 
 # Secure logging system
-try:
-    from backend.crypto_utils import SecureLogger
-    from backend.test_logger import TestResultLogger
-    from backend.log_backup import LogBackupManager
-    from backend.logging_config import LoggingConfig
-    from backend.init_logging import initialize_logging
-    LOGGING_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Secure logging system not available: {e}")
-    LOGGING_AVAILABLE = False
+LOGGING_AVAILABLE = importlib.util.find_spec('cryptography') is not None
+
+if LOGGING_AVAILABLE:
+    _LAZY_EXPORTS.update({
+        'SecureLogger': 'backend.crypto_utils',
+        'TestResultLogger': 'backend.test_logger',
+        'get_logger': 'backend.test_logger',
+        'LogBackupManager': 'backend.log_backup',
+        'LoggingConfig': 'backend.logging_config',
+        'initialize_logging': 'backend.init_logging',
+    })
+else:
+    print("Warning: Secure logging system not available: cryptography is not installed")
     
     # Create dummy classes for graceful degradation
     class SecureLogger:
@@ -64,6 +72,9 @@ except ImportError as e:
         def __init__(self, *args, **kwargs):
             raise ImportError("Test result logging not available")
     
+    def get_logger(*args, **kwargs):
+        raise ImportError("Test result logging not available")
+    
     class LogBackupManager:
         def __init__(self, *args, **kwargs):
             raise ImportError("Log backup system not available")
@@ -76,10 +87,22 @@ except ImportError as e:
     def initialize_logging():
         raise ImportError("Logging initialization not available")
 
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'backend' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 # Utility functions for easy access
 def get_system_overview():
     """Get a comprehensive system overview with key metrics"""
     try:
+        from backend.sysinfo import get_full_system_info
         system_info = get_full_system_info()
         
         # Extract key metrics for overview
@@ -109,6 +132,7 @@ def get_system_overview():
 def run_quick_benchmark():
     """Run a quick benchmark suite with essential tests"""
     try:
+        from backend.benchmark import cpu_single_thread, cpu_multi_thread, ram_copy_speed, disk_benchmark, gpu_benchmark
         results = {
             'cpu_single': cpu_single_thread(),
             'cpu_multi': cpu_multi_thread(),
@@ -138,6 +162,9 @@ def run_quick_benchmark():
 def run_network_test():
     """Run comprehensive network testing"""
     try:
+        from backend.sysinfo import get_network_info
+        from backend.speedtest import get_speedtest_results
+
         # Get network info
         network_info = get_network_info()
         
@@ -160,7 +187,8 @@ def log_test_result(test_type, results, logger=None):
     
     try:
         if logger is None:
-            logger = TestResultLogger()
+            from backend.test_logger import get_logger
+            logger = get_logger()
         
         if test_type in ['cpu_single', 'cpu_multi', 'ram', 'disk', 'gpu']:
             return logger.log_benchmark_result(test_type, results)
@@ -178,18 +206,15 @@ def get_test_history(test_type=None, limit=10):
         return []
     
     try:
-        logger = TestResultLogger()
+        from backend.test_logger import get_logger
+        logger = get_logger()
         
         if test_type == 'speedtest':
             return logger.get_speedtest_history(limit)
         elif test_type and test_type in ['cpu_single', 'cpu_multi', 'ram', 'disk', 'gpu']:
             return logger.get_benchmark_history(test_type, limit)
         else:
-            # Get all results
-            all_results = logger.secure_logger.get_test_results()
-            if test_type:
-                all_results = [r for r in all_results if r.get('test_type') == test_type]
-            return all_results[-limit:] if len(all_results) > limit else all_results
+            return logger.secure_logger.get_test_results(test_type, limit)
     except Exception as e:
         print(f"Warning: Failed to get test history: {e}")
         return []
@@ -207,6 +232,7 @@ def verify_system_integrity():
     
     # Test system info
     try:
+        from backend.sysinfo import get_full_system_info
         info = get_full_system_info()
         status['system_info_working'] = 'error' not in info
     except Exception:
@@ -214,6 +240,7 @@ def verify_system_integrity():
     
     # Test benchmarks
     try:
+        from backend.benchmark import cpu_single_thread
         cpu_result = cpu_single_thread()
         status['benchmarks_working'] = isinstance(cpu_result, (int, float))
     except Exception:
@@ -221,6 +248,7 @@ def verify_system_integrity():
     
     # Test speedtest
     try:
+        from backend.speedtest import ping_server
         ping_result = ping_server()
         status['speedtest_working'] = ping_result > 0
     except Exception:
@@ -229,7 +257,8 @@ def verify_system_integrity():
     # Test log integrity
     if LOGGING_AVAILABLE:
         try:
-            logger = TestResultLogger()
+            from backend.test_logger import get_logger
+            logger = get_logger()
             integrity = logger.verify_integrity()
             status['log_integrity'] = integrity['status']
         except Exception as e:
@@ -249,7 +278,8 @@ def create_system_report():
     # Add recent test history if logging is available
     if LOGGING_AVAILABLE:
         try:
-            logger = TestResultLogger()
+            from backend.test_logger import get_logger
+            logger = get_logger()
             report['recent_tests'] = {
                 'total_tests': len(logger.secure_logger.get_test_results()),
                 'statistics': logger.get_test_statistics(),
@@ -282,6 +312,8 @@ __all__ = [
     'get_sys_info',
     'get_sysctl_info',
     'get_wmic_info',
+    'get_cache_stats',
+    'refresh_cache',
     
     # Speed testing
     'ping_server',
@@ -300,6 +332,7 @@ __all__ = [
     # Secure logging (if available)
     'SecureLogger',
     'TestResultLogger',
+    'get_logger',
     'LogBackupManager',
     'LoggingConfig',
     'initialize_logging',
@@ -315,16 +348,8 @@ __all__ = [
     'create_system_report'
 ]
 
-# Initialize logging system on import if available
-if LOGGING_AVAILABLE:
-    try:
-        initialize_logging()
-        print("✅ SysDash backend initialized with secure logging")
-    except Exception as e:
-        print(f"⚠️ SysDash backend initialized but logging setup failed: {e}")
-        LOGGING_AVAILABLE = False
-else:
-    print("⚠️ SysDash backend initialized without secure logging")
+# Logging is initialised by the application at startup (see main.py), not
+# on import, so importing backend stays cheap
 
 # Module-level configuration
 BACKEND_CONFIG = {
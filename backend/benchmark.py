@@ -1,151 +1,231 @@
-import os
 import time
-import json
-import shutil
-import tempfile
+import statistics
 import numpy as np
-import multiprocessing
-from timeit import timeit
-from .test_logger import TestResultLogger
+import psutil
+from .test_logger import get_logger
+from .executor import get_process_pool
+from .disk_bench import run_disk_benchmark, DEFAULT_FILE_SIZE
+from .cpu_kernels import (
+    run_kernels,
+    composite_score,
+    get_kernel_pool,
+    blas_thread_limit,
+    REFERENCE_RATES,
+    DEFAULT_WARMUP,
+    DEFAULT_REPEATS
+)
 
-# Initialize logger
-logger = TestResultLogger()
+# Optional GPU support, numba is only imported when the GPU benchmark runs
+_cuda = None
+_cuda_probed = False
 
-# Optional GPU support
-try:
-    from numba import cuda
-    GPU_AVAILABLE = cuda.is_available()
-except:
-    GPU_AVAILABLE = False
+def get_cuda():
+    """Return numba's cuda module if a CUDA device is usable, else None.
 
-def cpu_single_thread():
-    """CPU single-thread benchmark with logging"""
-    def cpu_task():
-        total = 0
-        for i in range(1_000_000):
-            total += i ** 0.5
-        return total
-    
+    The probe runs once, on first call.
+    """
+    global _cuda, _cuda_probed
+    if not _cuda_probed:
+        try:
+            from numba import cuda
+            _cuda = cuda if cuda.is_available() else None
+        except Exception:
+            _cuda = None
+        _cuda_probed = True
+    return _cuda
+
+def measure_cpu_single(warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS):
+    """Run the CPU kernel suite on one core without logging.
+
+    Module-level so it can be sent to a process pool, returns the summed
+    median kernel duration and the results dict.
+    """
     start_time = time.time()
-    duration = timeit(cpu_task, number=5)
+    kernels = run_kernels(warmup=warmup, repeats=repeats)
     end_time = time.time()
     
+    duration = sum(kernel['median_duration_seconds'] for kernel in kernels.values())
     results = {
         'duration_seconds': round(duration, 3),
-        'test_iterations': 5,
-        'operations_per_test': 1_000_000,
+        'warmup_iterations': warmup,
+        'test_iterations': repeats,
+        'kernels': kernels,
+        'blas_thread_limit': blas_thread_limit(),
         'total_duration': round(end_time - start_time, 3),
-        'score': round(1000 / duration, 2)  # Higher is better
+        'score': composite_score([kernel['score'] for kernel in kernels.values()])  # Higher is better
     }
     
+    return duration, results
+
+def cpu_single_thread():
+    """CPU single-thread benchmark with logging.
+
+    The kernels run in the shared process pool, the interpreter kernel
+    would otherwise hold the GIL of this process for its whole run.
+    """
+    duration, results = get_process_pool().submit(measure_cpu_single).result()
+    
     # Log the result
-    logger.log_benchmark_result('cpu_single', results)
+    get_logger().log_benchmark_result('cpu_single', results)
     
     return duration
 
-def cpu_multi_thread():
-    """CPU multi-thread benchmark with logging"""
-    def worker(_):
-        total = 0
-        for i in range(500_000):
-            total += i ** 0.5
-        return total
+def cpu_multi_thread(warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS):
+    """CPU multi-thread benchmark with logging.
 
-    cpu_count = multiprocessing.cpu_count()
-    start = time.time()
-    with multiprocessing.Pool() as pool:
-        pool.map(worker, range(cpu_count))
-    end = time.time()
+    Every core runs the kernel suite in a pinned worker of the shared
+    kernel pool, kernel rates are summed across workers and scored against
+    the reference rates. Only the compute phase is timed, pool start-up is
+    reported separately.
+    """
+    pool = get_kernel_pool()
+    per_core, compute, startup = pool.run(None, warmup, repeats)
     
-    duration = round(end - start, 3)
+    duration = round(compute, 3)
+    
+    kernels = {}
+    for name in per_core[0]['kernels']:
+        rate = sum(core['kernels'][name]['median_rate'] for core in per_core)
+        kernels[name] = {
+            'unit': per_core[0]['kernels'][name]['unit'],
+            'aggregate_rate': round(rate, 3),
+            'score': round(1000 * rate / REFERENCE_RATES[name], 2)
+        }
     
     results = {
         'duration_seconds': duration,
-        'cpu_cores_used': cpu_count,
-        'operations_per_core': 500_000,
-        'total_operations': 500_000 * cpu_count,
-        'score': round(1000 / duration, 2)  # Higher is better
+        'cpu_cores_used': pool.workers,
+        'pinned_cores': [core['core'] for core in per_core if core['core'] is not None],
+        'pool_startup_seconds': round(startup, 3),
+        'pool_reused': startup == 0,
+        'blas_thread_limit': per_core[0]['blas_thread_limit'],
+        'warmup_iterations': warmup,
+        'test_iterations': repeats,
+        'kernels': kernels,
+        'score': composite_score([kernel['score'] for kernel in kernels.values()])  # Higher is better
     }
     
     # Log the result
-    logger.log_benchmark_result('cpu_multi', results)
+    get_logger().log_benchmark_result('cpu_multi', results)
     
     return duration
 
-def ram_copy_speed():
-    """RAM benchmark with logging"""
-    size = 500_000_000  # 500 MB
-    a = np.random.rand(size).astype(np.float32)
+# RAM bandwidth buffers use at most this share of available memory, capped
+# so the benchmark stays well clear of the OOM killer on small nodes
+RAM_BUFFER_FRACTION = 0.1
+RAM_BUFFER_MAX_BYTES = 768 * 1024 ** 2
+RAM_BUFFER_MIN_BYTES = 24 * 1024 ** 2
 
-    start = time.time()
-    b = a.copy()
-    end = time.time()
+def _ram_array_size(buffer_bytes: int = None) -> int:
+    """Elements per float64 array, three arrays share the buffer budget"""
+    if buffer_bytes is None:
+        available = psutil.virtual_memory().available
+        buffer_bytes = max(RAM_BUFFER_MIN_BYTES, min(int(available * RAM_BUFFER_FRACTION), RAM_BUFFER_MAX_BYTES))
+    return max(1, buffer_bytes // 3 // 8)
 
-    duration = end - start
-    mbps = (a.nbytes / duration) / (1024 ** 2)
-    
-    results = {
-        'speed_mbps': round(mbps, 2),
-        'test_size_mb': round(a.nbytes / (1024 ** 2), 2),
-        'duration_seconds': round(duration, 3),
-        'data_type': 'float32'
+def _bandwidth_summary(samples: list) -> dict:
+    return {
+        'median_mbps': round(statistics.median(samples), 2),
+        'stdev_mbps': round(statistics.stdev(samples), 2) if len(samples) > 1 else 0.0,
+        'min_mbps': round(min(samples), 2),
+        'max_mbps': round(max(samples), 2)
     }
+
+def measure_ram_bandwidth(buffer_bytes: int = None, passes: int = 5, warmup: int = 1) -> dict:
+    """Measure read, write, copy and triad bandwidth STREAM-style.
+
+    Three float64 arrays are allocated once, sized from available memory
+    unless ``buffer_bytes`` is given, and reused by every pass. Bytes moved
+    are counted the way STREAM does (copy 2x, triad 3x the array size).
+    """
+    n = _ram_array_size(buffer_bytes)
+    a = np.ones(n, dtype=np.float64)
+    b = np.full(n, 2.0, dtype=np.float64)
+    c = np.zeros(n, dtype=np.float64)
+    scalar = 3.0
+    mb = a.nbytes / (1024 ** 2)
+
+    kernels = {
+        'read': (lambda: a.sum(), 1),
+        'write': (lambda: c.fill(scalar), 1),
+        'copy': (lambda: np.copyto(c, a), 2),
+        'triad': (lambda: (np.multiply(b, scalar, out=c), np.add(c, a, out=c)), 3)
+    }
+
+    results = {}
+    for name, (kernel, traffic) in kernels.items():
+        for _ in range(warmup):
+            kernel()
+        samples = []
+        for _ in range(passes):
+            start = time.perf_counter()
+            kernel()
+            samples.append(traffic * mb / (time.perf_counter() - start))
+        results[name] = _bandwidth_summary(samples)
+
+    return {
+        'speed_mbps': results['copy']['median_mbps'],
+        'read': results['read'],
+        'write': results['write'],
+        'copy': results['copy'],
+        'triad': results['triad'],
+        'test_size_mb': round(mb, 2),
+        'buffer_mb': round(3 * mb, 2),
+        'passes': passes,
+        'warmup_passes': warmup,
+        'data_type': 'float64'
+    }
+
+def ram_copy_speed():
+    """RAM benchmark with logging, returns the median copy bandwidth"""
+    results = measure_ram_bandwidth()
     
     # Log the result
-    logger.log_benchmark_result('ram', results)
+    get_logger().log_benchmark_result('ram', results)
     
-    return mbps
+    return results['speed_mbps']
 
-def disk_benchmark():
-    """Disk benchmark with logging"""
-    temp_dir = tempfile.mkdtemp()
-    path = os.path.join(temp_dir, "testfile.tmp")
-    size_mb = 100
-    data = os.urandom(size_mb * 1024 * 1024)
+def disk_benchmark(mountpoint: str = None, mode: str = 'direct', configurations: list = None,
+                   file_size: int = DEFAULT_FILE_SIZE):
+    """Disk benchmark with logging, returns sequential write and read MB/s.
 
-    try:
-        # Write test
-        start = time.time()
-        with open(path, "wb") as f:
-            f.write(data)
-        write_end = time.time()
-        write_speed = size_mb / (write_end - start)
-
-        # Read test
-        read_start = time.time()
-        with open(path, "rb") as f:
-            read_data = f.read()
-        read_end = time.time()
-        read_speed = size_mb / (read_end - read_start)
+    Runs the disk engine on ``mountpoint`` (the temp directory by default)
+    and logs every configuration it measured.
+    """
+    report = run_disk_benchmark(mountpoint, mode, file_size, configurations)
 
-        results = {
-            'write_speed_mbps': round(write_speed, 2),
-            'read_speed_mbps': round(read_speed, 2),
-            'test_size_mb': size_mb,
-            'write_duration': round(write_end - start, 3),
-            'read_duration': round(read_end - read_start, 3),
-            'temp_dir': temp_dir
-        }
-        
-                # Log the result
-        logger.log_benchmark_result('disk', results)
+    def throughput(operation):
+        for result in report['results']:
+            if result['pattern'] == 'seq' and result['operation'] == operation:
+                return result['throughput_mbps']
+        return -1
 
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
-        shutil.rmtree(temp_dir)
+    write_speed = throughput('write')
+    read_speed = throughput('read')
+    results = {
+        'write_speed_mbps': write_speed,
+        'read_speed_mbps': read_speed,
+        'test_size_mb': report['file_size_mb'],
+        'mode': report['mode'],
+        'target': report['target'],
+        'configurations': report['results']
+    }
+    
+    # Log the result
+    get_logger().log_benchmark_result('disk', results)
 
     return write_speed, read_speed
 
 def gpu_benchmark():
     """GPU benchmark with logging"""
-    if not GPU_AVAILABLE:
+    cuda = get_cuda()
+    if cuda is None:
         results = {
             'status': 'unavailable',
             'reason': 'CUDA not available or no NVIDIA GPU detected',
             'duration_seconds': 0
         }
-        logger.log_benchmark_result('gpu', results)
+        get_logger().log_benchmark_result('gpu', results)
         return None
 
     try:
@@ -193,7 +273,7 @@ def gpu_benchmark():
         }
         
         # Log the result
-        logger.log_benchmark_result('gpu', results)
+        get_logger().log_benchmark_result('gpu', results)
         
         return total_duration
 
@@ -203,21 +283,38 @@ def gpu_benchmark():
             'error': str(e),
             'duration_seconds': 0
         }
-        logger.log_benchmark_result('gpu', results)
+        get_logger().log_benchmark_result('gpu', results)
         return None
 
-def run_full_benchmark():
-    """Run complete benchmark suite with comprehensive logging"""
+def run_full_benchmark(progress_callback=None):
+    """Run complete benchmark suite with comprehensive logging
+
+    ``progress_callback(stage, status, value)`` is called with status
+    'running' before and 'completed' or 'failed' after each stage.
+    """
     benchmark_start = time.time()
     
     print("Starting comprehensive benchmark suite...")
     
+    def run_stage(stage, func):
+        if progress_callback:
+            progress_callback(stage, 'running', None)
+        try:
+            value = func()
+        except Exception as e:
+            if progress_callback:
+                progress_callback(stage, 'failed', str(e))
+            raise
+        if progress_callback:
+            progress_callback(stage, 'completed', value)
+        return value
+    
     # Run all benchmarks
-    cpu_single = cpu_single_thread()
-    cpu_multi = cpu_multi_thread()
-    ram_speed = ram_copy_speed()
-    disk_write, disk_read = disk_benchmark()
-    gpu = gpu_benchmark()
+    cpu_single = run_stage('cpu_single', cpu_single_thread)
+    cpu_multi = run_stage('cpu_multi', cpu_multi_thread)
+    ram_speed = run_stage('ram', ram_copy_speed)
+    disk_write, disk_read = run_stage('disk', disk_benchmark)
+    gpu = run_stage('gpu', gpu_benchmark)
     
     benchmark_end = time.time()
     total_duration = round(benchmark_end - benchmark_start, 2)
@@ -235,7 +332,7 @@ def run_full_benchmark():
     }
     
     # Log the complete benchmark session
-    logger.log_benchmark_result('full_suite', full_results)
+    get_logger().log_benchmark_result('full_suite', full_results)
     
     print(f"Benchmark suite completed in {total_duration} seconds")
     
@@ -244,8 +341,8 @@ def run_full_benchmark():
 # Add function to get benchmark history
 def get_benchmark_history(benchmark_type: str = None, limit: int = 10):
     """Get benchmark history from encrypted logs"""
-    return logger.get_benchmark_history(benchmark_type, limit)
+    return get_logger().get_benchmark_history(benchmark_type, limit)
 
 def get_benchmark_statistics():
     """Get benchmark statistics"""
-    return logger.get_test_statistics()
+    return get_logger().get_test_statistics()
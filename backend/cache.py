@@ -0,0 +1,99 @@
+import os
+import copy
+import time
+import functools
+import threading
+
+DEFAULT_DYNAMIC_TTL = 1.0
+
+# All cached functions by name, used for stats and refreshes
+_cache_registry = {}
+
+def get_dynamic_ttl() -> float:
+    """Get the TTL in seconds for dynamic counters"""
+    try:
+        return float(os.getenv('SYSDASH_DYNAMIC_TTL', DEFAULT_DYNAMIC_TTL))
+    except ValueError:
+        return DEFAULT_DYNAMIC_TTL
+
+class CachedFunction:
+    """Caches the results of a function per argument tuple.
+
+    A ``ttl`` of None keeps results for the process lifetime, which is meant
+    for static hardware facts. Results are deep-copied on the way out so
+    callers can't modify the cached value.
+    """
+
+    def __init__(self, func, ttl: float = None, kind: str = 'dynamic'):
+        self.func = func
+        self.ttl = ttl
+        self.kind = kind
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and (self.ttl is None or time.monotonic() - cached[0] < self.ttl):
+                self.hits += 1
+                value = cached[1]
+            else:
+                self.misses += 1
+                value = self.func(*args, **kwargs)
+                now = time.monotonic()
+                if self.ttl is not None:
+                    # Drop expired entries so per-argument keys don't pile up
+                    for stale in [k for k, (stamp, _) in self._values.items() if now - stamp >= self.ttl]:
+                        del self._values[stale]
+                self._values[key] = (now, value)
+        return copy.deepcopy(value)
+
+    def clear(self):
+        """Drop all cached values, the next call recomputes them"""
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            ages = [time.monotonic() - stamp for stamp, _ in self._values.values()]
+        total = self.hits + self.misses
+        return {
+            'kind': self.kind,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else None,
+            'entries': len(ages),
+            'oldest_entry_age_seconds': round(max(ages), 3) if ages else None
+        }
+
+def static_fact(func):
+    """Cache a function for the process lifetime, refreshable on demand"""
+    cached = CachedFunction(func, ttl=None, kind='static')
+    _cache_registry[func.__name__] = cached
+    return cached
+
+def dynamic_counter(ttl: float = None):
+    """Cache a function for a short TTL (SYSDASH_DYNAMIC_TTL by default)"""
+    def decorator(func):
+        cached = CachedFunction(func, ttl=ttl if ttl is not None else get_dynamic_ttl(), kind='dynamic')
+        _cache_registry[func.__name__] = cached
+        return cached
+    return decorator
+
+def refresh_cache(kind: str = None) -> list:
+    """Clear cached values, optionally only 'static' or 'dynamic' ones"""
+    refreshed = []
+    for name, cached in _cache_registry.items():
+        if kind is None or cached.kind == kind:
+            cached.clear()
+            refreshed.append(name)
+    return refreshed
+
+def get_cache_stats() -> dict:
+    """Return hit/miss counters of every cached function"""
+    return {name: cached.stats() for name, cached in _cache_registry.items()}
@@ -0,0 +1,272 @@
+import os
+import math
+import time
+import zlib
+import hashlib
+import threading
+import statistics
+import multiprocessing
+import numpy as np
+import psutil
+
+# BLAS libraries read these once, when NumPy loads them, so they only
+# count when the process was started with them
+BLAS_THREAD_VARIABLES = ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS')
+_BLAS_LIMITED_BY_ENV = all(os.environ.get(name) == '1' for name in BLAS_THREAD_VARIABLES)
+
+# BLAS thread control, without it NumPy may spread a single matmul over
+# several cores. Pool workers fall back to the environment variables above.
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+DEFAULT_WARMUP = 2
+DEFAULT_REPEATS = 7
+
+MATMUL_SIZE = 512
+HASH_BYTES = 8 * 1024 ** 2
+COMPRESS_BYTES = 1 * 1024 ** 2
+INTERPRETER_LOOPS = 300_000
+
+# Seconds pool workers wait for each other before a run is abandoned
+POOL_BARRIER_TIMEOUT = 120
+
+# Median rates of the reference machine, a kernel scores 1000 when it runs
+# exactly as fast. Keep these fixed so scores stay comparable across hosts.
+REFERENCE_RATES = {
+    'matmul': 20.0,        # GFLOPS
+    'hash': 1000.0,        # MB/s
+    'compress': 15.0,      # MB/s
+    'interpreter': 10.0,   # Mops/s
+}
+
+_inputs = {}
+
+def _input(name: str):
+    """Build kernel inputs once per process so they aren't part of the timing"""
+    if name not in _inputs:
+        if name == 'matmul':
+            rng = np.random.default_rng(42)
+            _inputs[name] = (rng.random((MATMUL_SIZE, MATMUL_SIZE)), rng.random((MATMUL_SIZE, MATMUL_SIZE)))
+        elif name == 'hash':
+            _inputs[name] = np.random.default_rng(42).bytes(HASH_BYTES)
+        elif name == 'compress':
+            # Repeated text with every eighth byte randomised, compresses to
+            # a fraction of its size without being trivial
+            rng = np.random.default_rng(42)
+            text = np.frombuffer(b'sysdash benchmark kernel cpu median score ' * (COMPRESS_BYTES // 42 + 1), dtype=np.uint8)
+            data = text[:COMPRESS_BYTES].copy()
+            data[::8] = rng.integers(0, 256, size=len(data[::8]), dtype=np.uint8)
+            _inputs[name] = data.tobytes()
+    return _inputs.get(name)
+
+def kernel_matmul() -> float:
+    """Dense float64 matrix multiply, returns GFLOP done"""
+    a, b = _input('matmul')
+    np.matmul(a, b)
+    return 2 * MATMUL_SIZE ** 3 / 1e9
+
+def kernel_hash() -> float:
+    """SHA-256 over a fixed buffer for integer throughput, returns MB hashed"""
+    hashlib.sha256(_input('hash')).digest()
+    return HASH_BYTES / 1024 ** 2
+
+def kernel_compress() -> float:
+    """zlib level 6 on semi-compressible data, returns MB compressed"""
+    zlib.compress(_input('compress'), 6)
+    return COMPRESS_BYTES / 1024 ** 2
+
+def kernel_interpreter() -> float:
+    """Pure Python loop measuring interpreter dispatch, returns Mops done"""
+    total = 0
+    for i in range(INTERPRETER_LOOPS):
+        total += i ** 0.5
+    return INTERPRETER_LOOPS / 1e6
+
+KERNELS = {
+    'matmul': (kernel_matmul, 'GFLOPS'),
+    'hash': (kernel_hash, 'MB/s'),
+    'compress': (kernel_compress, 'MB/s'),
+    'interpreter': (kernel_interpreter, 'Mops/s'),
+}
+
+def run_kernel(name: str, warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Run one kernel after warm-up and summarise its rate over the repeats"""
+    func, unit = KERNELS[name]
+    for _ in range(warmup):
+        func()
+
+    rates = []
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work = func()
+        duration = time.perf_counter() - start
+        durations.append(duration)
+        rates.append(work / duration)
+
+    median = statistics.median(rates)
+    return {
+        'unit': unit,
+        'median_rate': round(median, 3),
+        'stdev_rate': round(statistics.stdev(rates), 3) if len(rates) > 1 else 0.0,
+        'min_rate': round(min(rates), 3),
+        'max_rate': round(max(rates), 3),
+        'median_duration_seconds': round(statistics.median(durations), 6),
+        'score': round(1000 * median / REFERENCE_RATES[name], 2)
+    }
+
+def blas_thread_limit() -> str:
+    """How this process keeps BLAS to one thread.
+
+    'threadpoolctl', 'environment' (started with the BLAS thread variables
+    set to 1) or 'none', in which case matmul may use several cores.
+    """
+    if threadpool_limits is not None:
+        return 'threadpoolctl'
+    if _BLAS_LIMITED_BY_ENV:
+        return 'environment'
+    return 'none'
+
+def run_kernels(names: list = None, warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Run kernels in this process, limited to one BLAS thread when possible.
+
+    Module-level so it can be mapped over a process pool.
+    """
+    names = names or list(KERNELS)
+    if threadpool_limits is not None:
+        with threadpool_limits(limits=1):
+            return {name: run_kernel(name, warmup, repeats) for name in names}
+    return {name: run_kernel(name, warmup, repeats) for name in names}
+
+def composite_score(scores: list) -> float:
+    """Geometric mean of kernel scores, so no single kernel dominates"""
+    scores = [score for score in scores if score > 0]
+    if not scores:
+        return 0.0
+    return round(math.exp(sum(math.log(score) for score in scores) / len(scores)), 2)
+
+# Per-worker state set by the pool initializer
+_worker_core = None
+_worker_barrier = None
+
+def _init_pool_worker(cores, barrier):
+    """Pin the new worker to the next free core"""
+    global _worker_core, _worker_barrier
+    _worker_barrier = barrier
+    try:
+        _worker_core = cores.get_nowait()
+        psutil.Process().cpu_affinity([_worker_core])
+    except Exception:
+        # No core left or affinity unsupported (macOS), run unpinned
+        _worker_core = None
+
+def _pool_ready(_):
+    """Make every worker start up before the first measurement"""
+    _worker_barrier.wait(timeout=POOL_BARRIER_TIMEOUT)
+    return _worker_core
+
+def _pool_run_kernels(names, warmup, repeats):
+    """Run the suite once all workers are ready, so each takes exactly one task"""
+    _worker_barrier.wait(timeout=POOL_BARRIER_TIMEOUT)
+    started = time.time()
+    kernels = run_kernels(names, warmup, repeats)
+    return {'core': _worker_core, 'started': started, 'finished': time.time(), 'kernels': kernels,
+            'blas_thread_limit': blas_thread_limit()}
+
+class KernelPool:
+    """Long-lived process pool with one worker pinned to each usable core.
+
+    Started lazily on first use; the start-up cost (process creation and
+    imports) is measured once and kept apart from the compute timings.
+    Without threadpoolctl the workers are spawned with the BLAS thread
+    variables set to 1, so they load NumPy limited to one thread.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+        self.workers = 0
+        self.pinned_cores = []
+        self.startup_seconds = None
+
+    def _start(self):
+        try:
+            cores = psutil.Process().cpu_affinity()
+        except (AttributeError, psutil.Error):
+            cores = list(range(multiprocessing.cpu_count()))
+        context = multiprocessing.get_context('spawn' if threadpool_limits is None else None)
+        core_queue = context.Queue()
+        for core in cores:
+            core_queue.put(core)
+        barrier = context.Barrier(len(cores))
+
+        start = time.perf_counter()
+        if threadpool_limits is None:
+            # Spawned workers copy the environment when they start
+            saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+            os.environ.update({name: '1' for name in BLAS_THREAD_VARIABLES})
+        try:
+            self._pool = context.Pool(len(cores), initializer=_init_pool_worker, initargs=(core_queue, barrier))
+        finally:
+            if threadpool_limits is None:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+        self.workers = len(cores)
+        self.pinned_cores = self._pool.map(_pool_ready, range(self.workers), chunksize=1)
+        self.startup_seconds = time.perf_counter() - start
+
+    def run(self, names: list = None, warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS) -> tuple:
+        """Run the kernel suite on every worker at once.
+
+        Returns the per-worker results, the compute time from the first
+        worker starting to the last one finishing, and the start-up cost
+        paid by this call (0 when the pool was already running).
+        """
+        with self._lock:
+            startup = 0.0
+            if self._pool is None:
+                self._start()
+                startup = self.startup_seconds
+            try:
+                per_core = self._pool.starmap(_pool_run_kernels, [(names, warmup, repeats)] * self.workers,
+                                              chunksize=1)
+            except Exception:
+                # A broken barrier or dead worker leaves the pool unusable
+                self._close()
+                raise
+
+        compute = max(core['finished'] for core in per_core) - min(core['started'] for core in per_core)
+        return per_core, compute, startup
+
+    def _close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def close(self):
+        """Stop the worker processes, the next run starts a new pool"""
+        with self._lock:
+            self._close()
+
+_kernel_pool = None
+_kernel_pool_lock = threading.Lock()
+
+def get_kernel_pool() -> KernelPool:
+    """Return the process-wide benchmark worker pool"""
+    global _kernel_pool
+    with _kernel_pool_lock:
+        if _kernel_pool is None:
+            _kernel_pool = KernelPool()
+        return _kernel_pool
+
+def shutdown_kernel_pool():
+    """Stop the benchmark worker pool if it was started"""
+    with _kernel_pool_lock:
+        if _kernel_pool is not None:
+            _kernel_pool.close()
@@ -0,0 +1,120 @@
+import os
+import time
+import threading
+from collections import deque
+import psutil
+
+DEFAULT_SAMPLE_INTERVAL = 1.0
+DEFAULT_HISTORY_SIZE = 300
+
+def _busy_and_total(times) -> tuple:
+    """Return busy and total CPU time of a psutil cpu_times entry"""
+    total = sum(times)
+    # Linux already counts guest time in user and guest_nice in nice
+    total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+class CpuSampler:
+    """Samples per-core CPU usage on a fixed tick in a background thread.
+
+    Each sample is the usage of every core since the previous tick, computed
+    from ``psutil.cpu_times(percpu=True)`` deltas, and kept in a ring buffer
+    so readers never have to sleep.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.interval = interval
+        self._samples = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_times = None
+
+    def _take_sample(self):
+        now = time.time()
+        times = psutil.cpu_times(percpu=True)
+        previous = self._last_times
+        self._last_times = times
+        if previous is None or len(previous) != len(times):
+            return
+
+        percents = []
+        for old, new in zip(previous, times):
+            old_busy, old_total = _busy_and_total(old)
+            new_busy, new_total = _busy_and_total(new)
+            total_delta = new_total - old_total
+            if total_delta <= 0:
+                percents.append(0.0)
+            else:
+                busy = max(0.0, new_busy - old_busy)
+                percents.append(round(min(100.0, busy / total_delta * 100), 1))
+
+        with self._lock:
+            self._samples.append((now, percents))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._take_sample()
+            except Exception as e:
+                print(f"Error sampling CPU usage: {e}")
+
+    def start(self):
+        """Start the sampler thread, taking a short first sample synchronously"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._take_sample()
+        time.sleep(min(0.1, self.interval))
+        self._take_sample()
+        self._thread = threading.Thread(target=self._run, name='sysdash-cpu-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_samples(self, window: float = None) -> list:
+        """Return (timestamp, per-core percents) samples from the last window seconds"""
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return []
+        if not window:
+            return samples[-1:]
+        cutoff = samples[-1][0] - window
+        return [sample for sample in samples if sample[0] >= cutoff]
+
+    def get_per_core(self, window: float = None) -> list:
+        """Return per-core usage of the latest sample or averaged over a window"""
+        samples = self.get_samples(window)
+        if not samples:
+            return []
+        cores = len(samples[-1][1])
+        samples = [percents for _, percents in samples if len(percents) == cores]
+        return [round(sum(core) / len(samples), 1) for core in zip(*samples)]
+
+_cpu_sampler = None
+_cpu_sampler_lock = threading.Lock()
+
+def get_cpu_sampler() -> CpuSampler:
+    """Return the process-wide CPU sampler, starting it on first use"""
+    global _cpu_sampler
+    with _cpu_sampler_lock:
+        if _cpu_sampler is None:
+            try:
+                interval = float(os.getenv('SYSDASH_CPU_SAMPLE_INTERVAL', DEFAULT_SAMPLE_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_SAMPLE_INTERVAL
+            _cpu_sampler = CpuSampler(interval)
+        if not _cpu_sampler.running:
+            _cpu_sampler.start()
+        return _cpu_sampler
@@ -1,92 +1,632 @@
 import json
+import re
 import base64
 import hashlib
+import threading
 from datetime import datetime
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
+from .logging_config import LoggingConfig
+from .log_index import (
+    load_segment_index,
+    write_segment_index,
+    append_index_entry,
+    remove_segment_index,
+    index_path
+)
+from .log_stats import (
+    new_segment_stats,
+    add_entry as add_stats_entry,
+    merge_stats,
+    load_segment_stats,
+    write_segment_stats,
+    remove_segment_stats,
+    stats_path
+)
+
+# Derived keys are cached per password so PBKDF2 runs once per process
+_key_cache = {}
+_key_cache_lock = threading.Lock()
+
+
+def list_log_segments(log_file: str) -> list:
+    """Return the sealed segments of a log followed by its active file, oldest first"""
+    log_dir = os.path.dirname(log_file) or '.'
+    base_name = os.path.basename(log_file)
+    pattern = re.compile(re.escape(base_name) + r'\.(\d{6})$')
+
+    sealed = []
+    if os.path.isdir(log_dir):
+        for filename in os.listdir(log_dir):
+            match = pattern.match(filename)
+            if match:
+                sealed.append((int(match.group(1)), os.path.join(log_dir, filename)))
+
+    segments = [path for _, path in sorted(sealed)]
+    if os.path.exists(log_file):
+        segments.append(log_file)
+    return segments
+
+
+def copy_log_segments(log_file: str, output_file: str) -> int:
+    """Concatenate all segments of a log into a single file, returns bytes written"""
+    import shutil
+
+    segments = list_log_segments(log_file)
+    if len(segments) == 1:
+        shutil.copy2(segments[0], output_file)
+        return os.path.getsize(output_file)
+
+    written = 0
+    with open(output_file, 'wb') as out:
+        for path in segments:
+            with open(path, 'rb') as f:
+                written += out.write(f.read())
+    return written
+
+
+def default_password() -> str:
+    """Generate the default log password from system info"""
+    import platform
+    import getpass
+
+    # Create a unique password based on system characteristics
+    system_info = f"{platform.node()}-{platform.system()}-{getpass.getuser()}"
+    return hashlib.sha256(system_info.encode()).hexdigest()[:32]
+
+
+def remove_segment_sidecars(segment_path: str):
+    """Remove the index and statistics files of a segment"""
+    remove_segment_index(segment_path)
+    remove_segment_stats(segment_path)
+
+
+def parse_cursor(cursor: str) -> tuple:
+    """Split a history cursor into (timestamp, entries at it already returned).
+
+    Cursors look like ``<timestamp>~<n>``: the next page starts after the
+    first n matches with exactly that timestamp, so entries sharing the
+    boundary timestamp are neither skipped nor repeated. A bare timestamp
+    returns only entries strictly older than it (n is None).
+    """
+    timestamp, separator, seen = cursor.rpartition('~')
+    if separator and seen.isdigit():
+        return timestamp, int(seen)
+    return cursor, None
+
+
+def make_cursor(page_timestamps: list, before: str = None) -> str:
+    """Build the cursor after a page, given its timestamps newest first"""
+    oldest = page_timestamps[-1]
+    seen = sum(1 for timestamp in page_timestamps if timestamp == oldest)
+    if before:
+        before_timestamp, before_seen = parse_cursor(before)
+        if before_timestamp == oldest and before_seen:
+            seen += before_seen
+    return f"{oldest}~{seen}"
+
+
+class _CursorFilter:
+    """Applies the since/until/before filters while walking newest to oldest"""
+
+    def __init__(self, since: str = None, until: str = None, before: str = None):
+        self.since = since
+        self.until = until
+        self.before, self.before_seen = parse_cursor(before) if before else (None, None)
+        self.skipped = 0
+
+    def accept(self, timestamp: str) -> bool:
+        if (self.until and timestamp > self.until) or (self.since and timestamp < self.since):
+            return False
+        if self.before is not None:
+            if timestamp > self.before:
+                return False
+            if timestamp == self.before and (self.before_seen is None or self.skipped < self.before_seen):
+                self.skipped += 1
+                return False
+        return True
+
 
 class SecureLogger:
-    def __init__(self, password: str = None, log_file: str = "test_results.enc"):
+    """Encrypted, append-only test result log.
+
+    Every entry is stored as its own Fernet token on a separate line, so
+    logging a result appends one line instead of rewriting the whole file.
+    Once the active file grows past ``segment_size`` bytes it is sealed as
+    ``<log_file>.000001``, ``<log_file>.000002``, ... and a fresh active file
+    is started. Files written by the old single-blob format are still read
+    and are migrated to the line format on the next write.
+
+    Every segment has a plain-text ``.idx`` sidecar with the offset, length,
+    timestamp and test type of each entry, so history queries only decrypt
+    the entries they return. An encrypted ``.stats`` sidecar keeps running
+    counts and score aggregates per segment for ``get_statistics``.
+    """
+
+    def __init__(self, password: str = None, log_file: str = "test_results.enc",
+                 segment_size: int = None, max_entries: int = None):
         self.log_file = log_file
         self.password = password or self._generate_default_password()
         self.key = self._derive_key(self.password)
         self.fernet = Fernet(self.key)
+        self.segment_size = segment_size or LoggingConfig.get_segment_size()
+        self.max_entries = max_entries or LoggingConfig.get_max_entries()
+        self._lock = threading.RLock()
+        self._index_cache = {}
+        self._stats_cache = {}
+        self._legacy_cache = {}
+        self._partial_stats = None
         
     def _generate_default_password(self) -> str:
         """Generate a default password based on system info"""
-        import platform
-        import getpass
-        
-        # Create a unique password based on system characteristics
-        system_info = f"{platform.node()}-{platform.system()}-{getpass.getuser()}"
-        return hashlib.sha256(system_info.encode()).hexdigest()[:32]
+        return default_password()
     
     def _derive_key(self, password: str) -> bytes:
-        """Derive encryption key from password"""
-        # Use a fixed salt for consistency (in production, use random salt stored separately)
-        salt = b'sysdash_salt_2025'  # 16 bytes
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key
+        """Derive encryption key from password, cached for the process lifetime"""
+        with _key_cache_lock:
+            key = _key_cache.get(password)
+            if key is None:
+                # Use a fixed salt for consistency (in production, use random salt stored separately)
+                salt = b'sysdash_salt_2025'  # 16 bytes
+                kdf = PBKDF2HMAC(
+                    algorithm=hashes.SHA256(),
+                    length=32,
+                    salt=salt,
+                    iterations=100000,
+                )
+                key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+                _key_cache[password] = key
+            return key
     
     def _calculate_checksum(self, data: dict) -> str:
         """Calculate checksum for data integrity"""
         data_str = json.dumps(data, sort_keys=True)
         return hashlib.sha256(data_str.encode()).hexdigest()
-    
+
+    def _encrypt_entry(self, entry: dict) -> bytes:
+        """Encrypt a single log entry into one newline-terminated token"""
+        token = self.fernet.encrypt(json.dumps(entry, separators=(',', ':')).encode())
+        return token + b'\n'
+
+    def _decrypt_entry(self, token: bytes) -> dict:
+        """Decrypt a single log entry token"""
+        return json.loads(self.fernet.decrypt(token).decode())
+
+    def _is_legacy_file(self, path: str) -> bool:
+        """Check whether a file still uses the single encrypted blob format.
+
+        Line format files end with a newline. A file that doesn't is only
+        legacy if it holds a single token that decrypts as a whole, otherwise
+        it is a line format file with a torn last write.
+        """
+        try:
+            size = os.path.getsize(path)
+            if size == 0:
+                return False
+            with open(path, 'rb') as f:
+                f.seek(size - 1)
+                if f.read(1) == b'\n':
+                    return False
+
+            cached = self._legacy_cache.get(path)
+            if cached and cached[0] == size:
+                return cached[1]
+            with open(path, 'rb') as f:
+                data = f.read().strip()
+            legacy = b'\n' not in data
+            if legacy:
+                try:
+                    self.fernet.decrypt(data)
+                except InvalidToken:
+                    legacy = False
+            self._legacy_cache[path] = (size, legacy)
+            return legacy
+        except OSError:
+            return False
+
+    def _repair_torn_tail(self, path: str):
+        """Truncate a line format file back to its last complete entry.
+
+        A crash in the middle of an append leaves a partial token without a
+        newline at the end of the active file, the next append would glue
+        its entry onto it.
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            return
+        with open(path, 'rb+') as f:
+            f.seek(max(0, size - 1))
+            if f.read(1) == b'\n':
+                return
+            # Entries are short, the last newline is near the end
+            end = size
+            while end > 0:
+                start = max(0, end - 65536)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            f.truncate(end)
+        print(f"Truncated torn entry at the end of {path} ({size - end} bytes)")
+
+    def _load_legacy_blob(self, path: str) -> list:
+        """Decrypt a log file written in the single blob format"""
+        with open(path, 'rb') as f:
+            encrypted_data = f.read().strip()
+
+        decrypted_data = self.fernet.decrypt(encrypted_data)
+        data = json.loads(decrypted_data.decode())
+
+        # Verify data integrity
+        if not self._verify_data_integrity(data):
+            raise ValueError("Data integrity check failed - possible tampering detected")
+
+        return data.get('results', [])
+
+    def _iter_segment(self, path: str):
+        """Yield decrypted entries of a segment, or None for unreadable tokens"""
+        if self._is_legacy_file(path):
+            try:
+                for entry in self._load_legacy_blob(path):
+                    yield entry
+            except Exception as e:
+                print(f"Error loading encrypted data: {e}")
+                yield None
+            return
+
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield self._decrypt_entry(line)
+                except (InvalidToken, ValueError):
+                    yield None
+
+    def _iter_entries(self):
+        """Yield every entry of every segment, oldest first"""
+        for path in list_log_segments(self.log_file):
+            try:
+                yield from self._iter_segment(path)
+            except FileNotFoundError:
+                # Segment was sealed or dropped by a concurrent writer
+                continue
+
     def _load_encrypted_data(self) -> list:
         """Load and decrypt existing log data"""
-        if not os.path.exists(self.log_file):
-            return []
-        
         try:
-            with open(self.log_file, 'rb') as f:
-                encrypted_data = f.read()
-            
-            if not encrypted_data:
-                return []
-            
-            decrypted_data = self.fernet.decrypt(encrypted_data)
-            data = json.loads(decrypted_data.decode())
-            
-            # Verify data integrity
-            if not self._verify_data_integrity(data):
-                raise ValueError("Data integrity check failed - possible tampering detected")
-            
-            return data.get('results', [])
-            
+            data = [entry for entry in self._iter_entries() if entry is not None]
         except Exception as e:
             print(f"Error loading encrypted data: {e}")
             return []
+
+        if len(data) > self.max_entries:
+            data = data[-self.max_entries:]
+        return data
     
     def _save_encrypted_data(self, data: list):
-        """Encrypt and save log data"""
+        """Rewrite the whole log with the given entries.
+
+        Only used for bulk operations such as cleanup and export; regular
+        logging goes through ``_append_entry``.
+        """
         try:
-            # Create data structure with metadata
-            log_data = {
-                'version': '1.0.0',
-                'created': datetime.now().isoformat(),
-                'results': data,
-                'checksum': self._calculate_checksum({'results': data})
-            }
-            
-            # Encrypt data
-            json_data = json.dumps(log_data, indent=2)
-            encrypted_data = self.fernet.encrypt(json_data.encode())
-            
-            # Write to file
-            with open(self.log_file, 'wb') as f:
-                f.write(encrypted_data)
+            with self._lock:
+                log_dir = os.path.dirname(self.log_file)
+                if log_dir and not os.path.exists(log_dir):
+                    os.makedirs(log_dir)
+
+                tmp_path = f"{self.log_file}.tmp"
+                index = []
+                stats = new_segment_stats()
+                with open(tmp_path, 'wb') as f:
+                    for entry in data:
+                        offset = f.tell()
+                        length = f.write(self._encrypt_entry(entry))
+                        index.append((offset, length, entry.get('timestamp'), entry.get('test_type')))
+                        add_stats_entry(stats, entry)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    stats['size'] = f.tell()
+
+                for path in list_log_segments(self.log_file):
+                    if path != self.log_file:
+                        os.remove(path)
+                    remove_segment_sidecars(path)
+                self._index_cache.clear()
+                self._stats_cache.clear()
+                os.replace(tmp_path, self.log_file)
+                write_segment_index(self.log_file, index)
+                write_segment_stats(self.fernet, self.log_file, stats)
+                self._stats_cache[self.log_file] = stats
                 
         except Exception as e:
             print(f"Error saving encrypted data: {e}")
+
+    def replace_contents(self, chunks: list, previous_copy: str = None):
+        """Replace the whole log with raw encrypted bytes, e.g. from a backup.
+
+        Runs under the write lock. The current segments are first copied to
+        ``previous_copy`` if given, then sealed segments and all sidecars are
+        dropped and the caches reset, so the index and statistics are rebuilt
+        from the new contents on the next read.
+        """
+        with self._lock:
+            if previous_copy and os.path.exists(self.log_file):
+                copy_log_segments(self.log_file, previous_copy)
+
+            log_dir = os.path.dirname(self.log_file)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+
+            tmp_path = f"{self.log_file}.tmp"
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            for path in list_log_segments(self.log_file):
+                if path != self.log_file:
+                    os.remove(path)
+                remove_segment_sidecars(path)
+            os.replace(tmp_path, self.log_file)
+            self._index_cache.clear()
+            self._stats_cache.clear()
+            self._legacy_cache.clear()
+            self._partial_stats = None
+
+    def _append_entry(self, entry: dict):
+        """Append one encrypted entry to the active segment"""
+        with self._lock:
+            if self._is_legacy_file(self.log_file):
+                self.migrate_legacy_log()
+            elif os.path.exists(self.log_file):
+                self._repair_torn_tail(self.log_file)
+
+            log_dir = os.path.dirname(self.log_file)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+
+            # Make sure the index covers the file before appending to both
+            index = self._segment_index(self.log_file) if os.path.exists(self.log_file) else []
+            if index is None:
+                index = []
+            stats = self._segment_stats(self.log_file) if os.path.exists(self.log_file) else None
+            if stats is None:
+                stats = new_segment_stats()
+
+            # Update the statistics first, so an entry they can't take fails
+            # before anything is written
+            try:
+                add_stats_entry(stats, entry)
+                with open(self.log_file, 'ab') as f:
+                    offset = f.tell()
+                    length = f.write(self._encrypt_entry(entry))
+                    size = f.tell()
+            except Exception:
+                # The cached statistics may be half updated, rebuild them on the next read
+                self._stats_cache.pop(self.log_file, None)
+                raise
+
+            append_index_entry(self.log_file, offset, length, entry['timestamp'], entry['test_type'])
+            index.append((offset, length, entry['timestamp'], entry['test_type']))
+            self._index_cache[self.log_file] = (size, index)
+
+            stats['size'] = size
+            write_segment_stats(self.fernet, self.log_file, stats)
+            self._stats_cache[self.log_file] = stats
+
+            if size >= self.segment_size:
+                self._roll_segment()
+
+    def _roll_segment(self):
+        """Seal the active file and drop segments beyond the retention limit"""
+        sealed = list_log_segments(self.log_file)[:-1]
+        next_number = int(sealed[-1].rsplit('.', 1)[1]) + 1 if sealed else 1
+        sealed_path = f"{self.log_file}.{next_number:06d}"
+        os.replace(self.log_file, sealed_path)
+        if os.path.exists(index_path(self.log_file)):
+            os.replace(index_path(self.log_file), index_path(sealed_path))
+        cached = self._index_cache.pop(self.log_file, None)
+        if cached:
+            self._index_cache[sealed_path] = cached
+        if os.path.exists(stats_path(self.log_file)):
+            os.replace(stats_path(self.log_file), stats_path(sealed_path))
+        cached = self._stats_cache.pop(self.log_file, None)
+        if cached:
+            self._stats_cache[sealed_path] = cached
+
+        # Remove the oldest sealed segments while the newer ones alone
+        # already hold at least max_entries entries
+        segments = list_log_segments(self.log_file)
+        counts = [self._segment_entry_count(path) for path in segments]
+
+        while len(segments) > 1 and sum(counts[1:]) >= self.max_entries:
+            dropped = segments.pop(0)
+            os.remove(dropped)
+            remove_segment_sidecars(dropped)
+            self._index_cache.pop(dropped, None)
+            self._stats_cache.pop(dropped, None)
+            counts.pop(0)
+
+    def _segment_entry_count(self, path: str) -> int:
+        """Number of entries in a segment, taken from its statistics"""
+        stats = self._segment_stats(path)
+        if stats is None:
+            with open(path, 'rb') as f:
+                return f.read().count(b'\n')
+        return sum(type_stats['count'] for type_stats in stats['types'].values())
+
+    def _rebuild_segment_index(self, path: str) -> list:
+        """Scan a segment once to recreate its index"""
+        entries = []
+        with open(path, 'rb') as f:
+            offset = 0
+            for line in f:
+                timestamp = test_type = None
+                if line.strip():
+                    try:
+                        entry = self._decrypt_entry(line.strip())
+                        timestamp, test_type = entry.get('timestamp'), entry.get('test_type')
+                    except (InvalidToken, ValueError):
+                        pass
+                entries.append((offset, len(line), timestamp, test_type))
+                offset += len(line)
+
+        # Don't persist an index built with the wrong key or from a damaged
+        # segment, it would hide readable entries from other loggers
+        if all(test_type is not None for _, _, _, test_type in entries):
+            write_segment_index(path, entries)
+        return entries
+
+    def _segment_index(self, path: str) -> list:
+        """Return the index of a segment, loading or rebuilding it as needed.
+
+        Returns None for legacy single blob files, which have no index.
+        """
+        with self._lock:
+            size = os.path.getsize(path)
+            cached = self._index_cache.get(path)
+            if cached and cached[0] == size:
+                return cached[1]
+            if self._is_legacy_file(path):
+                return None
+
+            entries = load_segment_index(path, size)
+            if entries is None:
+                entries = self._rebuild_segment_index(path)
+            self._index_cache[path] = (size, entries)
+            return entries
+
+    def _segment_stats(self, path: str) -> dict:
+        """Return the statistics of a segment, loading or rebuilding them as needed.
+
+        Returns None for legacy single blob files.
+        """
+        with self._lock:
+            size = os.path.getsize(path)
+            cached = self._stats_cache.get(path)
+            if cached and cached['size'] == size:
+                return cached
+            if self._is_legacy_file(path):
+                return None
+
+            stats = load_segment_stats(self.fernet, path, size)
+            if stats is None:
+                stats = new_segment_stats()
+                readable = True
+                for entry in self._iter_segment(path):
+                    if entry is None:
+                        readable = False
+                    else:
+                        add_stats_entry(stats, entry)
+                stats['size'] = size
+                # Same as for the index, don't persist partial statistics
+                if readable:
+                    write_segment_stats(self.fernet, path, stats)
+            self._stats_cache[path] = stats
+            return stats
+
+    def query_entries(self, test_type: str = None, limit: int = None, since: str = None,
+                      until: str = None, before: str = None) -> tuple:
+        """Find entries through the segment indexes, decrypting only the matches.
+
+        ``since`` and ``until`` bound the ISO timestamp range (inclusive) and
+        ``before`` is a pagination cursor (see ``parse_cursor``): only entries
+        older than it are returned. Returns the matching entries oldest first
+        and the cursor for the next page, or None when there are no older
+        matches.
+        """
+        try:
+            segments = [(path, self._segment_index(path)) for path in list_log_segments(self.log_file)]
+        except FileNotFoundError:
+            # A segment was sealed or dropped concurrently, retry once
+            segments = [(path, self._segment_index(path)) for path in list_log_segments(self.log_file)]
+
+        if any(index is None for _, index in segments):
+            return self._query_loaded_entries(test_type, limit, since, until, before)
+
+        # Walk newest to oldest within the retention window
+        window = self.max_entries
+        selected = []
+        cursor_filter = _CursorFilter(since, until, before)
+        for path, index in reversed(segments):
+            for offset, length, timestamp, entry_type in reversed(index):
+                if entry_type is None:
+                    continue
+                if window == 0:
+                    break
+                window -= 1
+                if test_type and entry_type != test_type:
+                    continue
+                if not cursor_filter.accept(timestamp):
+                    continue
+                selected.append((path, offset, length, timestamp))
+                if limit and len(selected) > limit:
+                    break
+            if window == 0 or (limit and len(selected) > limit):
+                break
+
+        has_more = bool(limit) and len(selected) > limit
+        if has_more:
+            selected = selected[:limit]
+        next_cursor = make_cursor([timestamp for _, _, _, timestamp in selected], before) \
+            if has_more and selected else None
+
+        entries = []
+        handles = {}
+        try:
+            for path, offset, length, _ in selected:
+                if path not in handles:
+                    handles[path] = open(path, 'rb')
+                handle = handles[path]
+                handle.seek(offset)
+                try:
+                    entries.append(self._decrypt_entry(handle.read(length).strip()))
+                except (InvalidToken, ValueError):
+                    continue
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        entries.reverse()
+        return entries, next_cursor
+
+    def _query_loaded_entries(self, test_type, limit, since, until, before) -> tuple:
+        """Fallback for logs without an index: filter the fully loaded data"""
+        cursor_filter = _CursorFilter(since, until, before)
+        data = []
+        for entry in reversed(self._load_encrypted_data()):
+            if test_type and entry['test_type'] != test_type:
+                continue
+            if not cursor_filter.accept(entry['timestamp']):
+                continue
+            data.append(entry)
+            if limit and len(data) > limit:
+                break
+
+        has_more = bool(limit) and len(data) > limit
+        if has_more:
+            data = data[:limit]
+        next_cursor = make_cursor([entry['timestamp'] for entry in data], before) if has_more and data else None
+        data.reverse()
+        return data, next_cursor
+
+    def migrate_legacy_log(self) -> int:
+        """Convert a single blob log file into the append-only line format"""
+        with self._lock:
+            if not self._is_legacy_file(self.log_file):
+                return 0
+
+            data = self._load_legacy_blob(self.log_file)
+            self._save_encrypted_data(data)
+            return len(data)
     
     def _verify_data_integrity(self, data: dict) -> bool:
         """Verify data integrity using checksum"""
@@ -98,9 +638,6 @@ class SecureLogger:
     
     def log_test_result(self, test_type: str, results: dict, metadata: dict = None):
         """Log a test result securely"""
-        # Load existing data
-        existing_data = self._load_encrypted_data()
-        
         # Create new log entry
         log_entry = {
             'id': hashlib.md5(f"{datetime.now().isoformat()}-{test_type}".encode()).hexdigest(),
@@ -112,32 +649,78 @@ class SecureLogger:
             'integrity_hash': self._calculate_checksum(results)
         }
         
-        # Add to existing data
-        existing_data.append(log_entry)
-        
-        # Keep only last 1000 entries to prevent file from growing too large
-        if len(existing_data) > 1000:
-            existing_data = existing_data[-1000:]
-        
-        # Save encrypted data
-        self._save_encrypted_data(existing_data)
+        # Append to the active segment
+        self._append_entry(log_entry)
         
         return log_entry['id']
     
     def get_test_results(self, test_type: str = None, limit: int = None) -> list:
         """Retrieve test results"""
-        data = self._load_encrypted_data()
-        
-        if test_type:
-            data = [entry for entry in data if entry['test_type'] == test_type]
-        
-        if limit:
-            data = data[-limit:]
+        if not test_type and not limit:
+            return self._load_encrypted_data()
         
+        data, _ = self.query_entries(test_type, limit)
         return data
     
+    def _partial_segment_stats(self, path: str, keep: int) -> dict:
+        """Statistics of the newest ``keep`` entries of a segment.
+
+        Used for the oldest segment inside the retention window, which is
+        usually only partly inside it. Only those entries are decrypted and
+        the result is kept until the segment or the window changes.
+        """
+        size = os.path.getsize(path)
+        if self._partial_stats and self._partial_stats[:3] == (path, size, keep):
+            return self._partial_stats[3]
+
+        stats = new_segment_stats()
+        entries = [entry for entry in self._segment_index(path) if entry[3] is not None][-keep:]
+        with open(path, 'rb') as f:
+            for offset, length, _, _ in entries:
+                f.seek(offset)
+                try:
+                    add_stats_entry(stats, self._decrypt_entry(f.read(length).strip()))
+                except (InvalidToken, ValueError):
+                    continue
+        self._partial_stats = (path, size, keep, stats)
+        return stats
+
+    def _window_stats(self, segments: list, segment_stats: list) -> list:
+        """Limit segment statistics to the newest max_entries entries, like reads"""
+        window = self.max_entries
+        selected = []
+        for path, stats in zip(reversed(segments), reversed(segment_stats)):
+            if window == 0:
+                break
+            count = sum(type_stats['count'] for type_stats in stats['types'].values())
+            if count <= window:
+                selected.append(stats)
+                window -= count
+            else:
+                selected.append(self._partial_segment_stats(path, window))
+                window = 0
+        return selected
+
     def get_statistics(self) -> dict:
-        """Get statistics about logged tests"""
+        """Get statistics about logged tests.
+
+        Merges the per-segment running statistics, so the cost depends on
+        the number of test types and segments rather than on the entries.
+        Besides counts and the date range it reports per test type date
+        ranges and min/max/mean/p50/p95 of the score fields, covering the
+        same newest ``max_entries`` entries that reads return.
+        """
+        try:
+            with self._lock:
+                segments = list_log_segments(self.log_file)
+                segment_stats = [self._segment_stats(path) for path in segments]
+                if all(stats is not None for stats in segment_stats):
+                    return merge_stats(self._window_stats(segments, segment_stats))
+        except FileNotFoundError:
+            # A concurrent writer sealed or dropped a segment
+            pass
+
+        # Legacy single blob logs have no statistics files yet
         data = self._load_encrypted_data()
         
         if not data:
@@ -190,20 +773,22 @@ class SecureLogger:
             new_logger._save_encrypted_data(data)
             return True
         else:
-            # Copy current file
-            import shutil
-            shutil.copy2(self.log_file, output_file)
+            # Copy all segments into a single file
+            copy_log_segments(self.log_file, output_file)
             return True
     
     def verify_file_integrity(self) -> dict:
         """Verify the integrity of the log file"""
         try:
-            data = self._load_encrypted_data()
+            data = list(self._iter_entries())
+            segments = list_log_segments(self.log_file)
             
-            # Check each entry's integrity
+            # Check each entry's integrity, unreadable tokens count as corrupted
             corrupted_entries = []
             for i, entry in enumerate(data):
-                if 'integrity_hash' in entry and 'results' in entry:
+                if entry is None:
+                    corrupted_entries.append(i)
+                elif 'integrity_hash' in entry and 'results' in entry:
                     expected_hash = self._calculate_checksum(entry['results'])
                     if entry['integrity_hash'] != expected_hash:
                         corrupted_entries.append(i)
@@ -213,7 +798,9 @@ class SecureLogger:
                 'total_entries': len(data),
                 'corrupted_entries': corrupted_entries,
                 'file_exists': os.path.exists(self.log_file),
-                'file_size': os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
+                'file_size': sum(os.path.getsize(path) for path in segments),
+                'segments': len(segments),
+                'legacy_format': self._is_legacy_file(self.log_file)
             }
             
         except Exception as e:
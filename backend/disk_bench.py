@@ -0,0 +1,257 @@
+import os
+import mmap
+import time
+import random
+import shutil
+import tempfile
+import threading
+import statistics
+
+KB = 1024
+MB = 1024 ** 2
+
+DEFAULT_FILE_SIZE = 256 * MB
+DEFAULT_DURATION = 2.0
+
+# (pattern, operation, block_size, queue_depth) run by default: sequential
+# throughput plus random 4K at low and high queue depth
+DEFAULT_CONFIGURATIONS = [
+    ('seq', 'write', 1 * MB, 1),
+    ('seq', 'read', 1 * MB, 1),
+    ('rand', 'write', 4 * KB, 1),
+    ('rand', 'read', 4 * KB, 1),
+    ('rand', 'write', 4 * KB, 8),
+    ('rand', 'read', 4 * KB, 8),
+]
+
+# 'direct' bypasses the page cache with O_DIRECT, 'fsync' goes through the
+# cache but syncs every write and evicts every block after reading it
+MODES = ('direct', 'fsync')
+PATTERNS = ('seq', 'rand')
+OPERATIONS = ('write', 'read')
+
+def build_configurations(block_sizes: list = None, queue_depths: list = None,
+                         patterns: list = None, operations: list = None) -> list:
+    """Build a sweep over block sizes and queue depths, or the default set"""
+    if not block_sizes and not queue_depths and not patterns and not operations:
+        return list(DEFAULT_CONFIGURATIONS)
+    configurations = []
+    for pattern in patterns or PATTERNS:
+        if pattern not in PATTERNS:
+            raise ValueError(f"Unknown pattern '{pattern}', expected one of {', '.join(PATTERNS)}")
+        for operation in operations or OPERATIONS:
+            if operation not in OPERATIONS:
+                raise ValueError(f"Unknown operation '{operation}', expected one of {', '.join(OPERATIONS)}")
+            default_block = 1 * MB if pattern == 'seq' else 4 * KB
+            for block_size in block_sizes or [default_block]:
+                if block_size <= 0 or block_size % (4 * KB):
+                    raise ValueError(f"Block size {block_size} must be a positive multiple of 4096")
+                for queue_depth in queue_depths or [1]:
+                    if queue_depth < 1:
+                        raise ValueError("Queue depth must be at least 1")
+                    configurations.append((pattern, operation, block_size, queue_depth))
+    return configurations
+
+def resolve_target(mountpoint: str = None) -> str:
+    """Return the directory to benchmark, validating mountpoints against the partition list"""
+    if not mountpoint:
+        return tempfile.gettempdir()
+    from .sysinfo import get_disk_partitions
+    mountpoints = [p['mountpoint'] for p in get_disk_partitions()]
+    if mountpoint not in mountpoints:
+        raise ValueError(f"'{mountpoint}' is not a mounted partition")
+    return mountpoint
+
+def _direct_io_supported(path: str) -> bool:
+    if not hasattr(os, 'O_DIRECT'):
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+    except OSError:
+        # tmpfs and some network filesystems reject O_DIRECT
+        return False
+    os.close(fd)
+    return True
+
+def _prepare_file(path: str, file_size: int):
+    """Fill the test file with incompressible data, reusing one random block"""
+    block = os.urandom(MB)
+    with open(path, 'wb') as f:
+        remaining = file_size
+        while remaining > 0:
+            remaining -= f.write(block[:min(MB, remaining)])
+        f.flush()
+        os.fsync(f.fileno())
+
+# Without posix_fadvise fsync-mode reads are served from the page cache
+CAN_DROP_CACHE = hasattr(os, 'posix_fadvise')
+
+def _drop_cache(path: str):
+    """Ask the kernel to forget cached pages of the file"""
+    if CAN_DROP_CACHE:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+# Positional vectored I/O reads into the aligned buffer without copies,
+# platforms without it seek on the worker's own descriptor instead
+if hasattr(os, 'preadv'):
+    def _pread(fd, buffer, offset):
+        os.preadv(fd, [buffer], offset)
+
+    def _pwrite(fd, buffer, offset):
+        os.pwritev(fd, [buffer], offset)
+else:
+    def _pread(fd, buffer, offset):
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.read(fd, len(buffer))
+
+    def _pwrite(fd, buffer, offset):
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, buffer)
+
+_datasync = getattr(os, 'fdatasync', os.fsync)
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _worker(path: str, mode: str, pattern: str, operation: str, block_size: int,
+            region: tuple, deadline: float, seed: int, latencies: list):
+    """Issue blocking I/O on one file descriptor until the deadline"""
+    flags = (os.O_RDWR if operation == 'write' else os.O_RDONLY) | getattr(os, 'O_BINARY', 0)
+    if mode == 'direct':
+        flags |= os.O_DIRECT
+    fd = os.open(path, flags)
+    # mmap memory is page aligned, which O_DIRECT requires
+    buffer = mmap.mmap(-1, block_size)
+    buffer.write(os.urandom(block_size))
+    rng = random.Random(seed)
+    # Reads through the page cache evict each block again, so wrapping
+    # sequential passes and repeated random offsets still go to the disk
+    evict = mode == 'fsync' and operation == 'read' and CAN_DROP_CACHE
+    start, end = region
+    blocks = (end - start) // block_size
+    offset = start
+
+    try:
+        while time.perf_counter() < deadline:
+            if pattern == 'rand':
+                offset = start + rng.randrange(blocks) * block_size
+            elif offset + block_size > end:
+                offset = start
+            op_start = time.perf_counter()
+            if operation == 'write':
+                _pwrite(fd, buffer, offset)
+                if mode == 'fsync':
+                    _datasync(fd)
+            else:
+                _pread(fd, buffer, offset)
+            latencies.append(time.perf_counter() - op_start)
+            if evict:
+                os.posix_fadvise(fd, offset, block_size, os.POSIX_FADV_DONTNEED)
+            offset += block_size
+    finally:
+        os.close(fd)
+        buffer.close()
+
+def run_configuration(path: str, mode: str, pattern: str, operation: str, block_size: int,
+                      queue_depth: int, duration: float = DEFAULT_DURATION) -> dict:
+    """Run one pattern/operation/block size/queue depth combination.
+
+    Queue depth is emulated with one thread per outstanding request, each
+    with its own descriptor. Sequential workers stream through their own
+    slice of the file, random workers pick aligned offsets anywhere.
+    ``cached`` is True for fsync-mode reads on platforms where the page
+    cache can't be dropped, those numbers are not disk throughput.
+    """
+    file_size = os.path.getsize(path)
+    if operation == 'read' and mode == 'fsync':
+        _drop_cache(path)
+
+    if pattern == 'seq':
+        slice_size = file_size // queue_depth // block_size * block_size
+        regions = [(i * slice_size, (i + 1) * slice_size) for i in range(queue_depth)]
+    else:
+        regions = [(0, file_size // block_size * block_size)] * queue_depth
+    if any(end - start < block_size for start, end in regions):
+        raise ValueError(f"File of {file_size} bytes is too small for {queue_depth} x {block_size} byte blocks")
+
+    per_worker = [[] for _ in range(queue_depth)]
+    errors = []
+
+    def run_worker(i):
+        try:
+            _worker(path, mode, pattern, operation, block_size, regions[i], deadline, i, per_worker[i])
+        except OSError as e:
+            errors.append(e)
+
+    started = time.perf_counter()
+    deadline = started + duration
+    threads = [threading.Thread(target=run_worker, args=(i,)) for i in range(queue_depth)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    latencies = sorted(latency for worker in per_worker for latency in worker)
+    operations = len(latencies)
+    if not operations:
+        raise RuntimeError("No I/O completed within the benchmark duration")
+
+    return {
+        'pattern': pattern,
+        'operation': operation,
+        'block_size': block_size,
+        'queue_depth': queue_depth,
+        'cached': mode == 'fsync' and operation == 'read' and not CAN_DROP_CACHE,
+        'operations': operations,
+        'iops': round(operations / elapsed, 1),
+        'throughput_mbps': round(operations * block_size / MB / elapsed, 2),
+        'latency_ms': {
+            'mean': round(statistics.mean(latencies) * 1000, 3),
+            'p50': round(_percentile(latencies, 0.50) * 1000, 3),
+            'p95': round(_percentile(latencies, 0.95) * 1000, 3),
+            'p99': round(_percentile(latencies, 0.99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3)
+        }
+    }
+
+def run_disk_benchmark(mountpoint: str = None, mode: str = 'direct', file_size: int = DEFAULT_FILE_SIZE,
+                       configurations: list = None, duration: float = DEFAULT_DURATION) -> dict:
+    """Benchmark the disk behind a mountpoint (the temp directory by default).
+
+    Falls back from 'direct' to 'fsync' mode when the filesystem doesn't
+    support O_DIRECT, the mode actually used is reported as ``mode``.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {', '.join(MODES)}")
+    configurations = configurations or list(DEFAULT_CONFIGURATIONS)
+    target = resolve_target(mountpoint)
+    temp_dir = tempfile.mkdtemp(prefix='sysdash_disk_', dir=target)
+    path = os.path.join(temp_dir, 'testfile.tmp')
+
+    try:
+        _prepare_file(path, file_size)
+        if mode == 'direct' and not _direct_io_supported(path):
+            mode = 'fsync'
+
+        results = [
+            run_configuration(path, mode, pattern, operation, block_size, queue_depth, duration)
+            for pattern, operation, block_size, queue_depth in configurations
+        ]
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'target': target,
+        'mode': mode,
+        'file_size_mb': round(file_size / MB, 2),
+        'duration_per_test_seconds': duration,
+        'results': results
+    }
@@ -0,0 +1,66 @@
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Pool sizes, overridable from the environment
+DEFAULT_IO_WORKERS = 8
+DEFAULT_CPU_WORKERS = 2
+
+_thread_pool = None
+_process_pool = None
+_pool_lock = threading.Lock()
+
+def _get_worker_count(env_name: str, default: int) -> int:
+    """Read a pool size from the environment"""
+    try:
+        return max(1, int(os.getenv(env_name, default)))
+    except ValueError:
+        return default
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Return the shared thread pool for blocking I/O work"""
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=_get_worker_count('SYSDASH_IO_WORKERS', DEFAULT_IO_WORKERS),
+                thread_name_prefix='sysdash-io'
+            )
+        return _thread_pool
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool for CPU-bound benchmark work"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_get_worker_count('SYSDASH_CPU_WORKERS', DEFAULT_CPU_WORKERS)
+            )
+        return _process_pool
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function in the I/O thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(func, *args, **kwargs))
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """Run a CPU-bound function in the process pool.
+
+    The function and its arguments must be picklable, so pass module-level
+    functions only.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(func, *args, **kwargs))
+
+def shutdown_executors(wait: bool = False):
+    """Shut down the shared pools, they are recreated on next use"""
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=wait)
+            _thread_pool = None
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=wait)
+            _process_pool = None
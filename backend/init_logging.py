@@ -1,8 +1,8 @@
 import os
-from .test_logger import TestResultLogger
+from .test_logger import get_logger
 
-def initialize_logging():
-    """Initialize the logging system"""
+def prepare_logging():
+    """Create the logs directory and the shared logger (key derivation)"""
     # Create logs directory if it doesn't exist
     logs_dir = "logs"
     if not os.path.exists(logs_dir):
@@ -10,9 +10,10 @@ def initialize_logging():
         print(f"Created logs directory: {logs_dir}")
     
     # Initialize logger to create encrypted file
-    logger = TestResultLogger()
-    
-    # Test the logging system
+    return get_logger()
+
+def record_initialization(logger):
+    """Write the logging system initialization entry"""
     test_results = {
         'initialization': True,
         'timestamp': '2025-01-01T00:00:00',
@@ -26,37 +27,48 @@ def initialize_logging():
     )
     
     print(f"Logging system initialized successfully. Log ID: {log_id}")
-    
-        # Verify integrity
+    return log_id
+
+def verify_logging(logger) -> dict:
+    """Run the full log integrity check, reads every entry"""
     integrity_check = logger.verify_integrity()
     print(f"Log file integrity check: {integrity_check['status']}")
-    
+    return integrity_check
+
+def initialize_logging():
+    """Initialize the logging system"""
+    logger = prepare_logging()
+    record_initialization(logger)
+    verify_logging(logger)
     return logger
 
 def cleanup_old_logs(days_to_keep: int = 30):
     """Clean up old log entries (keep only recent ones)"""
     try:
         from datetime import datetime, timedelta
-        logger = TestResultLogger()
+        logger = get_logger()
         
-        # Get all test results
-        all_results = logger.secure_logger.get_test_results()
+        # Hold the write lock from reading to rewriting, entries appended
+        # in between would be lost otherwise
+        with logger.secure_logger._lock:
+            # Get all test results
+            all_results = logger.secure_logger.get_test_results()
         
-        # Filter results to keep only recent ones
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        recent_results = []
+            # Filter results to keep only recent ones
+            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+            recent_results = []
         
-        for result in all_results:
-            try:
-                result_date = datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
-                if result_date >= cutoff_date:
+            for result in all_results:
+                try:
+                    result_date = datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
+                    if result_date >= cutoff_date:
+                        recent_results.append(result)
+                except:
+                    # Keep results with invalid timestamps
                     recent_results.append(result)
-            except:
-                # Keep results with invalid timestamps
-                recent_results.append(result)
         
-        # Save filtered results
-        logger.secure_logger._save_encrypted_data(recent_results)
+            # Save filtered results
+            logger.secure_logger._save_encrypted_data(recent_results)
         
         removed_count = len(all_results) - len(recent_results)
         print(f"Cleanup completed. Removed {removed_count} old entries, kept {len(recent_results)} recent entries.")
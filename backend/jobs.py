@@ -0,0 +1,292 @@
+import os
+import time
+import uuid
+import queue
+import asyncio
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # No inter-process locking on Windows, jobs are still serialised per process
+    fcntl = None
+
+BENCHMARK_STAGES = ['cpu_single', 'cpu_multi', 'ram', 'disk', 'gpu']
+SPEEDTEST_STAGES = ['ping', 'download', 'upload']
+
+# Heavy jobs hold this lock so only one runs per host, even across workers
+HOST_LOCK_FILE = os.path.join(tempfile.gettempdir(), 'sysdash_heavy_job.lock')
+
+# Number of finished jobs kept in memory for polling
+MAX_FINISHED_JOBS = 50
+
+def _run_benchmark_job(progress_callback):
+    from .benchmark import run_full_benchmark
+    return run_full_benchmark(progress_callback)
+
+def _run_speedtest_job(progress_callback):
+    from .speedtest import get_speedtest_results
+    return get_speedtest_results(progress_callback)
+
+def _single_stage_job(stage: str, func):
+    """Wrap one benchmark stage as a job runner reporting that stage"""
+    def run(progress_callback, **params):
+        progress_callback(stage, 'running', None)
+        try:
+            value = func(**params)
+        except Exception as e:
+            progress_callback(stage, 'failed', str(e))
+            raise
+        progress_callback(stage, 'completed', value)
+        return value
+    return run
+
+def _cpu_single_stage():
+    from .benchmark import cpu_single_thread
+    return cpu_single_thread()
+
+def _cpu_multi_stage():
+    from .benchmark import cpu_multi_thread
+    return cpu_multi_thread()
+
+def _ram_stage():
+    from .benchmark import ram_copy_speed
+    return ram_copy_speed()
+
+def _disk_stage(**params):
+    from .benchmark import disk_benchmark
+    return disk_benchmark(**params)
+
+def _gpu_stage():
+    from .benchmark import gpu_benchmark
+    return gpu_benchmark()
+
+def _ping_stage():
+    from .speedtest import ping_server
+    return ping_server()
+
+def _download_stage(**params):
+    from .speedtest import test_download_speed
+    return test_download_speed(**params)
+
+def _upload_stage(**params):
+    from .speedtest import test_upload_speed
+    return test_upload_speed(**params)
+
+JOB_TYPES = {
+    'benchmark': (BENCHMARK_STAGES, _run_benchmark_job),
+    'speedtest': (SPEEDTEST_STAGES, _run_speedtest_job),
+    # Single benchmark stages share the queue and host lock with full runs
+    'benchmark_cpu_single': (['cpu_single'], _single_stage_job('cpu_single', _cpu_single_stage)),
+    'benchmark_cpu_multi': (['cpu_multi'], _single_stage_job('cpu_multi', _cpu_multi_stage)),
+    'benchmark_ram': (['ram'], _single_stage_job('ram', _ram_stage)),
+    'benchmark_disk': (['disk'], _single_stage_job('disk', _disk_stage)),
+    'benchmark_gpu': (['gpu'], _single_stage_job('gpu', _gpu_stage)),
+    'speedtest_ping': (['ping'], _single_stage_job('ping', _ping_stage)),
+    'speedtest_download': (['download'], _single_stage_job('download', _download_stage)),
+    'speedtest_upload': (['upload'], _single_stage_job('upload', _upload_stage)),
+}
+
+class BenchmarkJob:
+    """A queued heavy job with per-stage progress"""
+
+    def __init__(self, job_type: str, params: dict = None):
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        self.id = uuid.uuid4().hex
+        self.job_type = job_type
+        self.params = params or {}
+        self.status = 'queued'
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.exception = None
+        self.stages = OrderedDict(
+            (stage, {'status': 'pending', 'value': None, 'duration_seconds': None})
+            for stage in JOB_TYPES[job_type][0]
+        )
+        self._stage_started = {}
+        self._done = threading.Event()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    def update_stage(self, stage: str, status: str, value=None):
+        """Progress callback passed to the benchmark and speedtest runners"""
+        info = self.stages.setdefault(stage, {'status': 'pending', 'value': None, 'duration_seconds': None})
+        info['status'] = status
+        if status == 'running':
+            self._stage_started[stage] = time.time()
+        else:
+            info['value'] = value
+            if stage in self._stage_started:
+                info['duration_seconds'] = round(time.time() - self._stage_started[stage], 3)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job has finished"""
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback):
+        """Call callback(job) from the worker thread once the job has finished,
+        right away if it already has"""
+        with self._callbacks_lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self):
+        with self._callbacks_lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Error in job callback: {e}")
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def to_dict(self, queue_position: int = None) -> dict:
+        completed = sum(1 for info in self.stages.values() if info['status'] in ('completed', 'failed'))
+        return {
+            'id': self.id,
+            'type': self.job_type,
+            'status': self.status,
+            'queue_position': queue_position,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': {
+                'completed_stages': completed,
+                'total_stages': len(self.stages),
+                'percent': round(completed * 100 / len(self.stages), 1) if self.stages else 100.0
+            },
+            'stages': {stage: dict(info) for stage, info in self.stages.items()},
+            'partial_results': {
+                stage: info['value'] for stage, info in self.stages.items()
+                if info['status'] == 'completed'
+            },
+            'result': self.result,
+            'error': self.error
+        }
+
+class JobManager:
+    """Runs heavy jobs one at a time in a background thread"""
+
+    def __init__(self, lock_file: str = HOST_LOCK_FILE):
+        self.lock_file = lock_file
+        self._jobs = OrderedDict()
+        self._pending = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, job_type: str = 'benchmark', **params) -> BenchmarkJob:
+        """Queue a new job and return it immediately, params go to the job runner"""
+        job = BenchmarkJob(job_type, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._pending.append(job.id)
+            self._prune_finished()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name='sysdash-jobs', daemon=True)
+                self._worker.start()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> BenchmarkJob:
+        """Return a job by id, or None if unknown"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def describe(self, job: BenchmarkJob) -> dict:
+        """Return the job state including its position in the queue"""
+        with self._lock:
+            position = self._pending.index(job.id) + 1 if job.id in self._pending else None
+        return job.to_dict(position)
+
+    def list_jobs(self) -> list:
+        """Return all known jobs, newest first"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [self.describe(job) for job in reversed(jobs)]
+
+    def _prune_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _acquire_host_lock(self):
+        if fcntl is None:
+            return None
+        handle = open(self.lock_file, 'a')
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _release_host_lock(self, handle):
+        if handle is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+    def _run_worker(self):
+        while True:
+            job = self._queue.get()
+            handle = None
+            try:
+                handle = self._acquire_host_lock()
+                with self._lock:
+                    self._pending.remove(job.id)
+                job.status = 'running'
+                job.started_at = datetime.now().isoformat()
+                job.result = JOB_TYPES[job.job_type][1](job.update_stage, **job.params)
+                job.status = 'completed'
+            except Exception as e:
+                with self._lock:
+                    if job.id in self._pending:
+                        self._pending.remove(job.id)
+                job.status = 'failed'
+                job.error = str(e)
+                job.exception = e
+            finally:
+                self._release_host_lock(handle)
+                job.finished_at = datetime.now().isoformat()
+                job._finish()
+                self._queue.task_done()
+
+async def wait_for_job(job: BenchmarkJob):
+    """Wait for a job on the event loop without holding an executor thread"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve():
+        if not future.done():
+            future.set_result(None)
+
+    def on_done(_job):
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            # The event loop has been closed meanwhile
+            pass
+
+    job.add_done_callback(on_done)
+    await future
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
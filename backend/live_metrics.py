@@ -0,0 +1,178 @@
+import os
+import time
+import asyncio
+import threading
+import psutil
+from .cpu_sampler import get_cpu_sampler
+from .executor import run_blocking
+
+DEFAULT_STREAM_INTERVAL = 1.0
+
+# Messages buffered per client before it is resynced with a full snapshot
+CLIENT_QUEUE_SIZE = 10
+
+def collect_dynamic_metrics() -> dict:
+    """Collect the metrics that change between dashboard updates"""
+    per_core = get_cpu_sampler().get_per_core()
+    vm = psutil.virtual_memory()
+    sm = psutil.swap_memory()
+    disk = psutil.disk_io_counters()
+    net = psutil.net_io_counters(pernic=True)
+
+    return {
+        'cpu': {
+            'per_core': per_core,
+            'percent': round(sum(per_core) / len(per_core), 1) if per_core else 0.0
+        },
+        'ram': {
+            'used': vm.used,
+            'available': vm.available,
+            'percent': vm.percent,
+            'swap_used': sm.used,
+            'swap_percent': sm.percent
+        },
+        'disk_io': {
+            'read_bytes': disk.read_bytes,
+            'write_bytes': disk.write_bytes,
+            'read_count': disk.read_count,
+            'write_count': disk.write_count
+        } if disk else {},
+        'net': {
+            name: {
+                'bytes_sent': counters.bytes_sent,
+                'bytes_recv': counters.bytes_recv,
+                'packets_sent': counters.packets_sent,
+                'packets_recv': counters.packets_recv
+            }
+            for name, counters in net.items()
+        }
+    }
+
+def compute_delta(previous: dict, current: dict) -> dict:
+    """Return the keys of current that differ from previous, recursing into dicts.
+
+    Keys that disappeared are reported with a value of None.
+    """
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = compute_delta(old, value)
+            if nested:
+                delta[key] = nested
+        elif value != old:
+            delta[key] = value
+    for key in previous:
+        if key not in current:
+            delta[key] = None
+    return delta
+
+class MetricsBroadcaster:
+    """Collects dynamic metrics once per tick and fans them out to all clients.
+
+    Clients receive a full snapshot when they subscribe and compact deltas
+    afterwards. The collector thread only runs while someone is subscribed.
+    """
+
+    def __init__(self, interval: float = DEFAULT_STREAM_INTERVAL, collector=collect_dynamic_metrics):
+        self.interval = interval
+        self.collector = collector
+        self._latest = None
+        self._seq = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _message(self, message_type: str, data: dict) -> dict:
+        return {'type': message_type, 'seq': self._seq, 'timestamp': time.time(), 'data': data}
+
+    def _offer(self, queue: asyncio.Queue, message: dict):
+        """Queue a message on the client's loop, resyncing clients that fall behind"""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            with self._lock:
+                message = self._message('snapshot', self._latest)
+        queue.put_nowait(message)
+
+    def _tick(self):
+        snapshot = self.collector()
+        with self._lock:
+            previous = self._latest
+            self._latest = snapshot
+            self._seq += 1
+            message = self._message('delta', compute_delta(previous, snapshot)) if previous else \
+                self._message('snapshot', snapshot)
+            subscribers = list(self._subscribers)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # Client's event loop is closed, it unsubscribes on its own
+                pass
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self._tick()
+            except Exception as e:
+                print(f"Error collecting live metrics: {e}")
+            time.sleep(self.interval)
+
+    def latest(self) -> dict:
+        """Return the most recent full snapshot, collecting one if needed"""
+        with self._lock:
+            if self._latest is not None:
+                return self._latest
+        snapshot = self.collector()
+        with self._lock:
+            if self._latest is None:
+                self._latest = snapshot
+            return self._latest
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    async def subscribe(self):
+        """Async generator yielding a snapshot followed by delta messages"""
+        loop = asyncio.get_running_loop()
+        subscriber = (loop, asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE))
+        # The first collection starts the CPU sampler and may sleep, keep it off the loop
+        snapshot = await run_blocking(self.latest)
+
+        with self._lock:
+            self._subscribers.add(subscriber)
+            initial = self._message('snapshot', snapshot)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sysdash-live-metrics', daemon=True)
+                self._thread.start()
+
+        try:
+            yield initial
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+def get_metrics_broadcaster() -> MetricsBroadcaster:
+    """Return the process-wide metrics broadcaster shared by all stream clients"""
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            try:
+                interval = float(os.getenv('SYSDASH_STREAM_INTERVAL', DEFAULT_STREAM_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_STREAM_INTERVAL
+            _broadcaster = MetricsBroadcaster(interval)
+        return _broadcaster
@@ -1,125 +1,310 @@
 import os
-import shutil
+import re
+import json
 import time
+import hashlib
+import threading
 from datetime import datetime, timedelta
-from .test_logger import TestResultLogger
+from .test_logger import get_logger
 from .logging_config import LoggingConfig
+from .crypto_utils import list_log_segments
+
+MANIFEST_FILE = 'manifest.json'
+OBJECTS_DIR = 'objects'
+
+# Backups written before the manifest existed, migrated on first load
+_LEGACY_BACKUP = re.compile(r'test_results_backup_\d{8}_\d{6}\.enc$')
+
+# One lock for all managers, the API creates a manager per request
+_manifest_lock = threading.RLock()
+
+def _sha256(data) -> str:
+    return hashlib.sha256(data).hexdigest()
 
 class LogBackupManager:
-    """Manages automatic backups of encrypted log files"""
-    
+    """Manages incremental backups of encrypted log files.
+
+    Backups are content-addressed: every log segment is stored under
+    ``objects/`` by its SHA-256 and shared by all backups that contain it.
+    Sealed segments never change, so they are stored once; for the active
+    segment, which only grows, a backup stores just the bytes appended
+    since the previous backup. A single ``manifest.json`` lists every
+    backup with its segments, so listing reads one file.
+    """
+
     def __init__(self, backup_dir: str = "logs/backups"):
         self.backup_dir = backup_dir
+        self.manifest_path = os.path.join(backup_dir, MANIFEST_FILE)
+        self.objects_dir = os.path.join(backup_dir, OBJECTS_DIR)
         self.ensure_backup_dir()
-        
+
     def ensure_backup_dir(self):
         """Ensure backup directory exists"""
-        if not os.path.exists(self.backup_dir):
-            os.makedirs(self.backup_dir)
-            
-    def create_backup(self, log_file: str = None) -> str:
-        """Create a backup of the current log file"""
+        if not os.path.exists(self.objects_dir):
+            os.makedirs(self.objects_dir)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _store_object(self, data, manifest: dict) -> tuple:
+        """Store bytes as an object, returns (digest, bytes newly written)"""
+        digest = _sha256(data)
+        path = self._object_path(digest)
+        if digest in manifest['objects'] and os.path.exists(path):
+            return digest, 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        manifest['objects'][digest] = len(data)
+        return digest, len(data)
+
+    def _load_manifest(self) -> dict:
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        manifest = {'version': 1, 'backups': [], 'objects': {}}
+        self._migrate_legacy_backups(manifest)
+        return manifest
+
+    def _save_manifest(self, manifest: dict):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _migrate_legacy_backups(self, manifest: dict):
+        """Move full-copy backups and their metadata files into the manifest"""
+        legacy = sorted(name for name in os.listdir(self.backup_dir) if _LEGACY_BACKUP.match(name))
+        if not legacy:
+            return
+
+        migrated = []
+        for filename in legacy:
+            file_path = os.path.join(self.backup_dir, filename)
+            metadata_path = file_path.replace('.enc', '_metadata.json')
+            metadata = {}
+            if os.path.exists(metadata_path):
+                try:
+                    with open(metadata_path, 'r') as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError):
+                    pass
+
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            digest, _ = self._store_object(data, manifest)
+            original_file = metadata.get('original_file', '')
+            original_file = os.path.abspath(original_file) if original_file else ''
+            manifest['backups'].append({
+                'filename': filename,
+                'original_file': original_file,
+                'created': metadata.get('backup_created') or datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
+                'backup_type': metadata.get('backup_type', 'automatic'),
+                'size': len(data),
+                'stored_bytes': len(data),
+                'segments': [{
+                    'name': os.path.basename(original_file) or filename,
+                    'size': len(data),
+                    'mtime_ns': None,
+                    'hash': digest,
+                    'chunks': [digest]
+                }]
+            })
+            migrated.append((file_path, metadata_path))
+
+        manifest['backups'].sort(key=lambda backup: backup['created'])
+        self._save_manifest(manifest)
+        for file_path, metadata_path in migrated:
+            os.remove(file_path)
+            if os.path.exists(metadata_path):
+                os.remove(metadata_path)
+
+    def _snapshot_segment(self, path: str, previous: dict, by_hash: dict, manifest: dict) -> tuple:
+        """Back up one segment, returns (segment entry, bytes newly stored).
+
+        Unchanged segments (same size and mtime as in the previous backup)
+        are not read at all; a segment that only had bytes appended stores
+        just the new tail.
+        """
+        stat = os.stat(path)
+        name = os.path.basename(path)
+        old = previous.get(name)
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            return dict(old), 0
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        view = memoryview(data)
+        digest = _sha256(view)
+        entry = {'name': name, 'size': len(data), 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+
+        # Same content under another name, e.g. the active file after it was sealed
+        if digest in by_hash:
+            entry['chunks'] = list(by_hash[digest]['chunks'])
+            return entry, 0
+
+        # Appended to since the previous backup, only store the new bytes
+        if old and 0 < old['size'] < len(data) and _sha256(view[:old['size']]) == old['hash']:
+            chunk, stored = self._store_object(view[old['size']:], manifest)
+            entry['chunks'] = old['chunks'] + [chunk]
+            return entry, stored
+
+        chunk, stored = self._store_object(view, manifest)
+        entry['chunks'] = [chunk]
+        return entry, stored
+
+    def create_backup(self, log_file: str = None, backup_type: str = 'automatic') -> str:
+        """Back up the current log file, returns the backup name.
+
+        Backups are entries of the manifest, not files; pass the name to
+        ``restore_backup``. If nothing changed since the latest backup of
+        this log, no new backup is recorded and the latest name is returned.
+        """
         if not log_file:
             log_file = LoggingConfig.get_log_file_path()
-            
+
         if not os.path.exists(log_file):
             raise FileNotFoundError(f"Log file not found: {log_file}")
-            
-        # Generate backup filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"test_results_backup_{timestamp}.enc"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-        
-        # Copy the encrypted file
-        shutil.copy2(log_file, backup_path)
-        
-        # Create metadata file
-        metadata = {
-            'original_file': log_file,
-            'backup_created': datetime.now().isoformat(),
-            'file_size': os.path.getsize(backup_path),
-            'backup_type': 'automatic'
-        }
-        
-        metadata_path = backup_path.replace('.enc', '_metadata.json')
-        import json
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
-            
-        return backup_path
-    
+
+        original_file = os.path.abspath(log_file)
+        with _manifest_lock:
+            manifest = self._load_manifest()
+            latest = next((backup for backup in reversed(manifest['backups'])
+                           if backup['original_file'] == original_file), None)
+            previous = {segment['name']: segment for segment in latest['segments']} if latest else {}
+            by_hash = {segment['hash']: segment for segment in previous.values()}
+
+            segments = []
+            stored_bytes = 0
+            for path in list_log_segments(log_file):
+                entry, stored = self._snapshot_segment(path, previous, by_hash, manifest)
+                segments.append(entry)
+                stored_bytes += stored
+
+            if latest and [s['hash'] for s in segments] == [s['hash'] for s in latest['segments']]:
+                # Remember the new mtimes so the next check skips reading
+                latest['segments'] = segments
+                self._save_manifest(manifest)
+                return latest['filename']
+
+            # Generate backup name with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_filename = f"test_results_backup_{timestamp}"
+            names = {backup['filename'] for backup in manifest['backups']}
+            suffix = 1
+            while backup_filename in names:
+                suffix += 1
+                backup_filename = f"test_results_backup_{timestamp}_{suffix}"
+
+            manifest['backups'].append({
+                'filename': backup_filename,
+                'original_file': original_file,
+                'created': datetime.now().isoformat(),
+                'backup_type': backup_type,
+                'size': sum(segment['size'] for segment in segments),
+                'stored_bytes': stored_bytes,
+                'segments': segments
+            })
+            self._save_manifest(manifest)
+
+        return backup_filename
+
     def cleanup_old_backups(self, days_to_keep: int = 7):
-        """Remove old backup files"""
-        cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
-        removed_files = []
-        
-        for filename in os.listdir(self.backup_dir):
-            if filename.startswith('test_results_backup_'):
-                file_path = os.path.join(self.backup_dir, filename)
-                if os.path.getmtime(file_path) < cutoff_time:
-                    os.remove(file_path)
-                    removed_files.append(filename)
-                    
-                    # Remove corresponding metadata file
-                    metadata_file = filename.replace('.enc', '_metadata.json')
-                    metadata_path = os.path.join(self.backup_dir, metadata_file)
-                    if os.path.exists(metadata_path):
-                        os.remove(metadata_path)
-                        
+        """Remove backups older than days_to_keep and objects no longer used.
+
+        The newest backup of every log file is always kept.
+        """
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
+        with _manifest_lock:
+            manifest = self._load_manifest()
+            backups = manifest['backups']
+            newest = {}
+            for backup in backups:
+                if backup['original_file'] not in newest or backup['created'] >= newest[backup['original_file']]['created']:
+                    newest[backup['original_file']] = backup
+            kept = {backup['filename'] for backup in newest.values()}
+            removed_files = [backup['filename'] for backup in backups
+                             if backup['created'] < cutoff and backup['filename'] not in kept]
+            if not removed_files:
+                return []
+
+            manifest['backups'] = [backup for backup in backups if backup['filename'] not in removed_files]
+            referenced = {chunk for backup in manifest['backups']
+                          for segment in backup['segments'] for chunk in segment['chunks']}
+            unused = [digest for digest in manifest['objects'] if digest not in referenced]
+            for digest in unused:
+                del manifest['objects'][digest]
+            self._save_manifest(manifest)
+
+            for digest in unused:
+                try:
+                    os.remove(self._object_path(digest))
+                except FileNotFoundError:
+                    pass
+
         return removed_files
-    
+
     def list_backups(self) -> list:
-        """List all available backups"""
+        """List all available backups, newest first"""
+        with _manifest_lock:
+            manifest = self._load_manifest()
+
         backups = []
-        
-        for filename in os.listdir(self.backup_dir):
-            if filename.startswith('test_results_backup_') and filename.endswith('.enc'):
-                file_path = os.path.join(self.backup_dir, filename)
-                metadata_path = file_path.replace('.enc', '_metadata.json')
-                
-                backup_info = {
-                    'filename': filename,
-                    'path': file_path,
-                    'size': os.path.getsize(file_path),
-                    'created': datetime.fromtimestamp(os.path.getctime(file_path)).isoformat()
+        for backup in manifest['backups']:
+            backups.append({
+                'filename': backup['filename'],
+                'size': backup['size'],
+                'created': backup['created'],
+                'metadata': {
+                    'original_file': backup['original_file'],
+                    'backup_created': backup['created'],
+                    'file_size': backup['size'],
+                    'stored_bytes': backup['stored_bytes'],
+                    'segments': len(backup['segments']),
+                    'backup_type': backup['backup_type']
                 }
-                
-                # Load metadata if available
-                if os.path.exists(metadata_path):
-                    try:
-                        import json
-                        with open(metadata_path, 'r') as f:
-                            metadata = json.load(f)
-                        backup_info['metadata'] = metadata
-                    except:
-                        pass
-                        
-                backups.append(backup_info)
-                
+            })
+
         return sorted(backups, key=lambda x: x['created'], reverse=True)
-    
-    def restore_backup(self, backup_filename: str, target_file: str = None) -> bool:
-        """Restore a backup file"""
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-        
-        if not os.path.exists(backup_path):
-            raise FileNotFoundError(f"Backup file not found: {backup_path}")
-            
+
+    def restore_backup(self, backup_filename: str, target_file: str = None, password: str = None) -> bool:
+        """Restore a backup by name into target_file (the configured log by default).
+
+        The log is replaced through its shared logger, under the same lock
+        as appends, and its index and statistics are rebuilt. The current
+        log is kept as ``<target_file>.backup_<time>``. Returns whether the
+        restored log passes the integrity check with ``password``.
+        """
+        with _manifest_lock:
+            manifest = self._load_manifest()
+        backup = next((b for b in manifest['backups'] if b['filename'] == backup_filename), None)
+
+        if backup is None:
+            raise FileNotFoundError(f"Backup not found: {backup_filename}")
+
         if not target_file:
             target_file = LoggingConfig.get_log_file_path()
-            
-        # Create backup of current file before restoring
-        if os.path.exists(target_file):
-            current_backup = target_file + f".backup_{int(time.time())}"
-            shutil.copy2(target_file, current_backup)
-            
-        # Restore the backup
-        shutil.copy2(backup_path, target_file)
-        
+
+        # Read and check every object before touching the target
+        data = []
+        for segment in backup['segments']:
+            for digest in segment['chunks']:
+                with open(self._object_path(digest), 'rb') as f:
+                    chunk = f.read()
+                if _sha256(chunk) != digest:
+                    raise ValueError(f"Backup object {digest} is corrupted")
+                data.append(chunk)
+
+        logger = get_logger(target_file, password)
+        logger.secure_logger.replace_contents(data, previous_copy=target_file + f".backup_{int(time.time())}")
+
         # Verify the restored file
         try:
-            logger = TestResultLogger()
             integrity = logger.verify_integrity()
             return integrity['status'] == 'valid'
         except:
-            return False
\ No newline at end of file
+            return False
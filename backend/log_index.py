@@ -0,0 +1,64 @@
+import os
+
+# Each log segment gets a sidecar index file with one line per entry:
+#   "<offset> <length> <timestamp> <test_type>"
+# Only the test type and timestamp are stored in plain text, the entry
+# itself stays encrypted. Unreadable lines are indexed with "-" so the
+# index always covers the whole segment.
+INDEX_SUFFIX = '.idx'
+
+def index_path(segment_path: str) -> str:
+    """Return the index file path for a log segment"""
+    return segment_path + INDEX_SUFFIX
+
+def format_index_line(offset: int, length: int, timestamp: str = None, test_type: str = None) -> str:
+    return f"{offset} {length} {timestamp or '-'} {test_type or '-'}\n"
+
+def load_segment_index(segment_path: str, segment_size: int) -> list:
+    """Load a segment index as (offset, length, timestamp, test_type) tuples.
+
+    Returns None when the index is missing or doesn't cover the segment,
+    in which case it has to be rebuilt.
+    """
+    path = index_path(segment_path)
+    if not os.path.exists(path):
+        return None
+
+    entries = []
+    end = 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split(' ', 3)
+                if len(parts) != 4:
+                    return None
+                offset, length = int(parts[0]), int(parts[1])
+                if offset != end:
+                    return None
+                timestamp = None if parts[2] == '-' else parts[2]
+                test_type = None if parts[3] == '-' else parts[3]
+                entries.append((offset, length, timestamp, test_type))
+                end = offset + length
+    except (OSError, ValueError):
+        return None
+
+    return entries if end == segment_size else None
+
+def write_segment_index(segment_path: str, entries: list):
+    """Write a complete segment index"""
+    tmp_path = index_path(segment_path) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for offset, length, timestamp, test_type in entries:
+            f.write(format_index_line(offset, length, timestamp, test_type))
+    os.replace(tmp_path, index_path(segment_path))
+
+def append_index_entry(segment_path: str, offset: int, length: int, timestamp: str, test_type: str):
+    """Append one entry to a segment index"""
+    with open(index_path(segment_path), 'a', encoding='utf-8') as f:
+        f.write(format_index_line(offset, length, timestamp, test_type))
+
+def remove_segment_index(segment_path: str):
+    """Remove the index of a segment if it exists"""
+    path = index_path(segment_path)
+    if os.path.exists(path):
+        os.remove(path)
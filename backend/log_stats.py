@@ -0,0 +1,165 @@
+import os
+import json
+import math
+from cryptography.fernet import InvalidToken
+
+# Every log segment gets an encrypted ".stats" sidecar with running
+# aggregates of its entries. Segment aggregates are merged on read, so
+# statistics never have to decrypt the log itself.
+STATS_SUFFIX = '.stats'
+
+# Result fields aggregated per test type. Negative values are the error
+# sentinels used by the benchmark and speedtest modules and are skipped,
+# as are NaN and infinities, which have no histogram bucket.
+SCORE_FIELDS = (
+    'score',
+    'speed_mbps',
+    'write_speed_mbps',
+    'read_speed_mbps',
+    'operations_per_second',
+    'ping_ms',
+    'download_speed_mbps',
+    'upload_speed_mbps',
+    'value',
+)
+
+# Percentiles come from log-scale histograms with ~1% relative error,
+# which can be merged across segments
+BUCKET_BASE = 1.02
+
+def stats_path(segment_path: str) -> str:
+    """Return the statistics file path for a log segment"""
+    return segment_path + STATS_SUFFIX
+
+def new_segment_stats() -> dict:
+    return {'size': 0, 'types': {}}
+
+def extract_scores(results: dict) -> dict:
+    """Pick the numeric score fields out of a results dict"""
+    if not isinstance(results, dict):
+        return {}
+    return {
+        field: float(results[field]) for field in SCORE_FIELDS
+        if isinstance(results.get(field), (int, float)) and not isinstance(results.get(field), bool)
+        and math.isfinite(results[field]) and results[field] >= 0
+    }
+
+def _bucket(value: float) -> str:
+    if value <= 0:
+        return 'z'
+    return str(math.floor(math.log(value, BUCKET_BASE)))
+
+def _bucket_value(bucket: str) -> float:
+    if bucket == 'z':
+        return 0.0
+    # Geometric middle of the bucket
+    return BUCKET_BASE ** (int(bucket) + 0.5)
+
+def add_entry(stats: dict, entry: dict):
+    """Add one log entry to segment statistics"""
+    test_type = entry.get('test_type')
+    timestamp = entry.get('timestamp')
+    type_stats = stats['types'].setdefault(test_type, {'count': 0, 'first': timestamp, 'last': timestamp, 'fields': {}})
+    type_stats['count'] += 1
+    if timestamp:
+        if not type_stats['first'] or timestamp < type_stats['first']:
+            type_stats['first'] = timestamp
+        if not type_stats['last'] or timestamp > type_stats['last']:
+            type_stats['last'] = timestamp
+
+    for field, value in extract_scores(entry.get('results')).items():
+        field_stats = type_stats['fields'].setdefault(field, {'count': 0, 'sum': 0.0, 'min': value, 'max': value, 'hist': {}})
+        field_stats['count'] += 1
+        field_stats['sum'] += value
+        field_stats['min'] = min(field_stats['min'], value)
+        field_stats['max'] = max(field_stats['max'], value)
+        bucket = _bucket(value)
+        field_stats['hist'][bucket] = field_stats['hist'].get(bucket, 0) + 1
+
+def _percentile(hist: dict, count: int, fraction: float, low: float, high: float) -> float:
+    rank = max(1, math.ceil(fraction * count))
+    seen = 0
+    for bucket in sorted(hist, key=lambda b: -math.inf if b == 'z' else int(b)):
+        seen += hist[bucket]
+        if seen >= rank:
+            return round(min(high, max(low, _bucket_value(bucket))), 3)
+    return round(high, 3)
+
+def merge_stats(segment_stats: list) -> dict:
+    """Merge segment statistics into the summary returned by get_statistics"""
+    types = {}
+    for stats in segment_stats:
+        for test_type, type_stats in stats['types'].items():
+            merged = types.setdefault(test_type, {'count': 0, 'first': None, 'last': None, 'fields': {}})
+            merged['count'] += type_stats['count']
+            if type_stats['first'] and (not merged['first'] or type_stats['first'] < merged['first']):
+                merged['first'] = type_stats['first']
+            if type_stats['last'] and (not merged['last'] or type_stats['last'] > merged['last']):
+                merged['last'] = type_stats['last']
+            for field, field_stats in type_stats['fields'].items():
+                target = merged['fields'].setdefault(field, {'count': 0, 'sum': 0.0, 'min': field_stats['min'],
+                                                             'max': field_stats['max'], 'hist': {}})
+                target['count'] += field_stats['count']
+                target['sum'] += field_stats['sum']
+                target['min'] = min(target['min'], field_stats['min'])
+                target['max'] = max(target['max'], field_stats['max'])
+                for bucket, count in field_stats['hist'].items():
+                    target['hist'][bucket] = target['hist'].get(bucket, 0) + count
+
+    if not types:
+        return {'total_tests': 0, 'test_types': {}, 'date_range': None}
+
+    firsts = [t['first'] for t in types.values() if t['first']]
+    lasts = [t['last'] for t in types.values() if t['last']]
+    scores = {}
+    for test_type, merged in types.items():
+        if merged['fields']:
+            scores[test_type] = {
+                field: {
+                    'count': f['count'],
+                    'min': round(f['min'], 3),
+                    'max': round(f['max'], 3),
+                    'mean': round(f['sum'] / f['count'], 3),
+                    'p50': _percentile(f['hist'], f['count'], 0.50, f['min'], f['max']),
+                    'p95': _percentile(f['hist'], f['count'], 0.95, f['min'], f['max'])
+                }
+                for field, f in merged['fields'].items()
+            }
+
+    return {
+        'total_tests': sum(t['count'] for t in types.values()),
+        'test_types': {test_type: t['count'] for test_type, t in types.items()},
+        'date_range': {
+            'first': min(firsts),
+            'last': max(lasts)
+        } if firsts else None,
+        'type_date_ranges': {
+            test_type: {'first': t['first'], 'last': t['last']} for test_type, t in types.items()
+        },
+        'scores': scores
+    }
+
+def load_segment_stats(fernet, segment_path: str, segment_size: int) -> dict:
+    """Load segment statistics, or None if missing or out of date"""
+    path = stats_path(segment_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            stats = json.loads(fernet.decrypt(f.read().strip()).decode())
+    except (OSError, InvalidToken, ValueError):
+        return None
+    return stats if stats.get('size') == segment_size else None
+
+def write_segment_stats(fernet, segment_path: str, stats: dict):
+    """Encrypt and write segment statistics"""
+    tmp_path = stats_path(segment_path) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(fernet.encrypt(json.dumps(stats, separators=(',', ':')).encode()))
+    os.replace(tmp_path, stats_path(segment_path))
+
+def remove_segment_stats(segment_path: str):
+    """Remove the statistics of a segment if they exist"""
+    path = stats_path(segment_path)
+    if os.path.exists(path):
+        os.remove(path)
@@ -8,6 +8,7 @@ class LoggingConfig:
     DEFAULT_LOG_FILE = "logs/test_results.enc"
     DEFAULT_MAX_ENTRIES = 1000
     DEFAULT_CLEANUP_DAYS = 30
+    DEFAULT_SEGMENT_SIZE = 1024 * 1024  # Roll over the active log file at 1 MB
     
     # Security settings
     PBKDF2_ITERATIONS = 100000
@@ -43,6 +44,14 @@ class LoggingConfig:
         except ValueError:
             return cls.DEFAULT_MAX_ENTRIES
     
+    @classmethod
+    def get_segment_size(cls) -> int:
+        """Get the size in bytes at which the active log segment is sealed"""
+        try:
+            return int(os.getenv('SYSDASH_LOG_SEGMENT_BYTES', cls.DEFAULT_SEGMENT_SIZE))
+        except ValueError:
+            return cls.DEFAULT_SEGMENT_SIZE
+    
     @classmethod
     def should_backup(cls) -> bool:
         """Check if automatic backups are enabled"""
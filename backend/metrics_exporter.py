@@ -0,0 +1,254 @@
+import os
+import sys
+import math
+import time
+import platform
+import threading
+from datetime import datetime
+from .log_stats import extract_scores
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+DEFAULT_EXPORT_INTERVAL = 2.0
+
+# Test types exported as scores, system events and snapshots are skipped
+SCORE_TEST_PREFIXES = ('benchmark_', 'speedtest')
+SKIPPED_TEST_TYPES = {'benchmark_system_event'}
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    # repr gives nan/inf, OpenMetrics only accepts these spellings
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+class MetricFamilies:
+    """Collects metric families and renders them as OpenMetrics text"""
+
+    def __init__(self):
+        self._families = {}
+
+    def add(self, name: str, metric_type: str, help_text: str, value, labels: dict = None):
+        """Add one sample; counters get the _total and info the _info suffix"""
+        if value is None:
+            return
+        family = self._families.setdefault(name, (metric_type, help_text, []))
+        family[2].append((labels or {}, value))
+
+    def render(self) -> str:
+        suffixes = {'counter': '_total', 'info': '_info'}
+        lines = []
+        for name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.append(f'# HELP {name} {_escape(help_text)}')
+            sample_name = name + suffixes.get(metric_type, '')
+            for labels, value in samples:
+                if labels:
+                    label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                    lines.append(f'{sample_name}{{{label_text}}} {_format_value(value)}')
+                else:
+                    lines.append(f'{sample_name} {_format_value(value)}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+def _timestamp_seconds(timestamp: str):
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def collect_system_metrics(families: MetricFamilies):
+    """Add the sysinfo gauges and counters"""
+    from . import __version__
+    from .sysinfo import get_cpu_stats, get_ram_info, get_disk_partitions, get_disk_io, get_network_info
+
+    families.add('sysdash_build', 'info', 'SysDash version and platform', 1, {
+        'version': __version__,
+        'python_version': platform.python_version(),
+        'platform': sys.platform,
+    })
+
+    cpu = get_cpu_stats()
+    families.add('sysdash_cpu_usage_percent', 'gauge', 'CPU usage of all cores', cpu['cpu_percent'])
+    for core, percent in enumerate(cpu['cpu_percent_per_core']):
+        families.add('sysdash_cpu_core_usage_percent', 'gauge', 'CPU usage per logical core', percent, {'core': core})
+    families.add('sysdash_cpu_logical_count', 'gauge', 'Logical CPUs', cpu['logical_cpus'])
+
+    ram = get_ram_info()
+    families.add('sysdash_memory_total_bytes', 'gauge', 'Total RAM', ram['total_ram'])
+    families.add('sysdash_memory_used_bytes', 'gauge', 'Used RAM', ram['used_ram'])
+    families.add('sysdash_memory_available_bytes', 'gauge', 'Available RAM', ram['available_ram'])
+    families.add('sysdash_swap_total_bytes', 'gauge', 'Total swap', ram['total_swap'])
+    families.add('sysdash_swap_used_bytes', 'gauge', 'Used swap', ram['used_swap'])
+
+    for partition in get_disk_partitions():
+        labels = {'device': partition['device'], 'mountpoint': partition['mountpoint'], 'fstype': partition['fstype']}
+        families.add('sysdash_filesystem_size_bytes', 'gauge', 'Filesystem size', partition.get('total_size'), labels)
+        families.add('sysdash_filesystem_used_bytes', 'gauge', 'Filesystem used space', partition.get('used'), labels)
+        families.add('sysdash_filesystem_free_bytes', 'gauge', 'Filesystem free space', partition.get('free'), labels)
+        families.add('sysdash_filesystem_stale', 'gauge', 'Usage is a cached value, the mount did not answer in time',
+                     partition.get('stale', False), labels)
+
+    disk_io = get_disk_io()
+    for device, counters in disk_io.get('devices', {}).items():
+        labels = {'device': device}
+        families.add('sysdash_disk_reads_completed', 'counter', 'Reads completed', counters['read_count'], labels)
+        families.add('sysdash_disk_writes_completed', 'counter', 'Writes completed', counters['write_count'], labels)
+        families.add('sysdash_disk_read_bytes', 'counter', 'Bytes read', counters['read_bytes'], labels)
+        families.add('sysdash_disk_written_bytes', 'counter', 'Bytes written', counters['write_bytes'], labels)
+        families.add('sysdash_disk_read_time_seconds', 'counter', 'Time spent reading', counters['read_time_ms'] / 1000, labels)
+        families.add('sysdash_disk_write_time_seconds', 'counter', 'Time spent writing', counters['write_time_ms'] / 1000, labels)
+        if 'busy_time_ms' in counters:
+            families.add('sysdash_disk_io_time_seconds', 'counter', 'Time with I/O in flight', counters['busy_time_ms'] / 1000, labels)
+
+    network_fields = (
+        ('rx_bytes', 'receive_bytes', 'Bytes received'),
+        ('tx_bytes', 'transmit_bytes', 'Bytes sent'),
+        ('rx_packets', 'receive_packets', 'Packets received'),
+        ('tx_packets', 'transmit_packets', 'Packets sent'),
+        ('rx_errors', 'receive_errors', 'Receive errors'),
+        ('tx_errors', 'transmit_errors', 'Transmit errors'),
+        ('rx_drops', 'receive_drops', 'Dropped incoming packets'),
+        ('tx_drops', 'transmit_drops', 'Dropped outgoing packets'),
+    )
+    for interface, info in get_network_info().items():
+        labels = {'interface': interface}
+        families.add('sysdash_network_up', 'gauge', 'Interface is up', info['is_up'], labels)
+        if not info['counters']:
+            continue
+        for field, name, help_text in network_fields:
+            families.add(f'sysdash_network_{name}', 'counter', help_text, info['counters'][field], labels)
+
+def collect_test_scores(families: MetricFamilies, scores: dict):
+    """Add the latest benchmark and speedtest scores"""
+    for test_type, (timestamp, values) in sorted(scores.items()):
+        families.add('sysdash_test_last_run_timestamp_seconds', 'gauge', 'Time of the latest logged test run',
+                     _timestamp_seconds(timestamp), {'test_type': test_type})
+        for field, value in sorted(values.items()):
+            families.add('sysdash_test_score', 'gauge', 'Score fields of the latest logged test run',
+                         value, {'test_type': test_type, 'field': field})
+
+class MetricsExporter:
+    """Keeps a rendered OpenMetrics snapshot for /metrics.
+
+    A background thread collects and renders every interval, so a scrape
+    only returns the latest text. Test scores are re-read from the
+    encrypted log only when its active file has changed.
+    """
+
+    def __init__(self, interval: float = DEFAULT_EXPORT_INTERVAL, test_logger=None):
+        self.interval = interval
+        self.test_logger = test_logger
+        self._text = None
+        self._scores = {}
+        self._scores_signature = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _logger(self):
+        if self.test_logger is None:
+            from .test_logger import get_logger
+            self.test_logger = get_logger()
+        return self.test_logger
+
+    def _latest_scores(self) -> dict:
+        logger = self._logger()
+        try:
+            stat = os.stat(logger.secure_logger.log_file)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            return {}
+        if signature == self._scores_signature:
+            return self._scores
+
+        scores = {}
+        for test_type in logger.get_test_statistics().get('test_types', {}):
+            if not test_type.startswith(SCORE_TEST_PREFIXES) or test_type in SKIPPED_TEST_TYPES:
+                continue
+            entries = logger.query_history(test_type, limit=1)['results']
+            if entries:
+                scores[test_type] = (entries[-1].get('timestamp'), extract_scores(entries[-1].get('results')))
+        self._scores = scores
+        self._scores_signature = signature
+        return scores
+
+    def collect(self):
+        """Collect all metrics and render the snapshot"""
+        start = time.time()
+        families = MetricFamilies()
+        collect_system_metrics(families)
+        try:
+            collect_test_scores(families, self._latest_scores())
+        except Exception as e:
+            print(f"Error reading test scores for metrics: {e}")
+        families.add('sysdash_exporter_collect_duration_seconds', 'gauge', 'Time the last collection took',
+                     round(time.time() - start, 4))
+        families.add('sysdash_exporter_last_collect_timestamp_seconds', 'gauge', 'Time of the last collection',
+                     round(start, 3))
+        text = families.render()
+        with self._lock:
+            self._text = text
+
+    def latest(self) -> str:
+        """Return the latest rendered snapshot"""
+        with self._lock:
+            return self._text
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+
+    def start(self):
+        """Start the collector thread, collecting the first snapshot synchronously"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.collect()
+        self._thread = threading.Thread(target=self._run, name='sysdash-metrics-exporter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the collector thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+_metrics_exporter = None
+_metrics_exporter_lock = threading.Lock()
+
+def get_metrics_exporter() -> MetricsExporter:
+    """Return the process-wide metrics exporter, starting it on first use"""
+    global _metrics_exporter
+    with _metrics_exporter_lock:
+        if _metrics_exporter is None:
+            try:
+                interval = float(os.getenv('SYSDASH_EXPORT_INTERVAL', DEFAULT_EXPORT_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_EXPORT_INTERVAL
+            _metrics_exporter = MetricsExporter(interval)
+        if not _metrics_exporter.running:
+            _metrics_exporter.start()
+        return _metrics_exporter
+
+def stop_metrics_exporter():
+    """Stop the metrics exporter if it was started"""
+    with _metrics_exporter_lock:
+        if _metrics_exporter is not None:
+            _metrics_exporter.stop()
@@ -0,0 +1,208 @@
+import os
+import re
+import time
+import threading
+from array import array
+from .live_metrics import collect_dynamic_metrics
+
+DEFAULT_COLLECT_INTERVAL = 1.0
+
+# (name, step seconds, points kept): one hour of seconds, a day of minutes
+# and thirty days of hours, fixed memory per metric
+ROLLUP_LEVELS = (
+    ('1s', 1, 3600),
+    ('1m', 60, 1440),
+    ('1h', 3600, 720),
+)
+
+_RANGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_range(value: str) -> int:
+    """Parse a range like '90s', '15m', '6h', '7d' or plain seconds"""
+    match = re.fullmatch(r'\s*(\d+)\s*([smhd]?)\s*', str(value))
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid range '{value}', use e.g. 300, 15m, 6h or 7d")
+    return int(match.group(1)) * _RANGE_UNITS[match.group(2) or 's']
+
+class RingSeries:
+    """Fixed-size ring of (timestamp, value) points at one resolution.
+
+    Incoming values are averaged per ``step`` bucket; a bucket is stored
+    once a value for a later bucket arrives.
+    """
+
+    def __init__(self, step: int, capacity: int):
+        self.step = step
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self._bucket = None
+        self._sum = 0.0
+        self._samples = 0
+
+    def add(self, timestamp: float, value: float) -> tuple:
+        """Add a value, returns the (bucket, average) completed by it or None"""
+        bucket = timestamp - timestamp % self.step
+        completed = None
+        if self._bucket is not None and bucket != self._bucket:
+            completed = (self._bucket, self._sum / self._samples)
+            self._times[self._head] = completed[0]
+            self._values[self._head] = completed[1]
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._sum = 0.0
+            self._samples = 0
+        self._bucket = bucket
+        self._sum += value
+        self._samples += 1
+        return completed
+
+    def points(self, since: float = 0) -> list:
+        """Return stored points newer than since, oldest first"""
+        start = (self._head - self._count) % self.capacity
+        result = []
+        for i in range(self._count):
+            index = (start + i) % self.capacity
+            if self._times[index] >= since:
+                result.append([self._times[index], round(self._values[index], 3)])
+        return result
+
+def flatten_metrics(previous: dict, current: dict, elapsed: float) -> dict:
+    """Turn dynamic metric snapshots into flat gauge values.
+
+    Disk and network counters become per-second rates, which needs the
+    previous snapshot.
+    """
+    values = {
+        'cpu.percent': current['cpu']['percent'],
+        'ram.used': current['ram']['used'],
+        'ram.percent': current['ram']['percent'],
+        'swap.used': current['ram']['swap_used'],
+    }
+    for core, percent in enumerate(current['cpu']['per_core']):
+        values[f'cpu.core{core}'] = percent
+
+    if previous and elapsed > 0:
+        for key in ('read_bytes', 'write_bytes'):
+            if key in current['disk_io'] and key in previous['disk_io']:
+                values[f'disk.{key}_per_sec'] = max(0, current['disk_io'][key] - previous['disk_io'][key]) / elapsed
+        for key in ('bytes_sent', 'bytes_recv'):
+            now = sum(nic[key] for nic in current['net'].values())
+            before = sum(nic[key] for nic in previous['net'].values())
+            values[f'net.{key}_per_sec'] = max(0, now - before) / elapsed
+    return values
+
+class MetricsHistory:
+    """In-memory metric history with 1s/1m/1h rollups.
+
+    A background thread records one sample per interval; each metric gets
+    one array-backed ring per rollup level, so memory stays fixed no matter
+    how long SysDash runs.
+    """
+
+    def __init__(self, interval: float = DEFAULT_COLLECT_INTERVAL, collector=collect_dynamic_metrics,
+                 levels: tuple = ROLLUP_LEVELS):
+        self.interval = interval
+        self.collector = collector
+        self.levels = levels
+        self._series = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous = None
+
+    def record(self, values: dict, timestamp: float = None):
+        """Record one value per metric, cascading completed buckets into coarser levels"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            for metric, value in values.items():
+                series = self._series.get(metric)
+                if series is None:
+                    series = [RingSeries(step, capacity) for _, step, capacity in self.levels]
+                    self._series[metric] = series
+                point = (timestamp, float(value))
+                for ring in series:
+                    point = ring.add(*point)
+                    if point is None:
+                        break
+
+    def collect(self):
+        """Take one sample from the collector"""
+        now = time.time()
+        snapshot = self.collector()
+        elapsed = now - self._previous[0] if self._previous else 0
+        self.record(flatten_metrics(self._previous[1] if self._previous else None, snapshot, elapsed), now)
+        self._previous = (now, snapshot)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"Error collecting metrics history: {e}")
+
+    def start(self):
+        """Start the collector thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sysdash-metrics-history', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the collector thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def metrics(self) -> list:
+        with self._lock:
+            return sorted(self._series)
+
+    def query(self, metric: str, range_seconds: int) -> dict:
+        """Return points of the last range_seconds at the finest level covering it.
+
+        Raises KeyError for unknown metrics.
+        """
+        with self._lock:
+            series = self._series[metric]
+            for (name, step, capacity), ring in zip(self.levels, series):
+                if step * capacity >= range_seconds:
+                    break
+            points = ring.points(time.time() - range_seconds)
+        return {
+            'metric': metric,
+            'range_seconds': range_seconds,
+            'resolution': name,
+            'points': points
+        }
+
+_metrics_history = None
+_metrics_history_lock = threading.Lock()
+
+def get_metrics_history() -> MetricsHistory:
+    """Return the process-wide metrics history, starting its collector on first use"""
+    global _metrics_history
+    with _metrics_history_lock:
+        if _metrics_history is None:
+            try:
+                interval = float(os.getenv('SYSDASH_HISTORY_INTERVAL', DEFAULT_COLLECT_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_COLLECT_INTERVAL
+            _metrics_history = MetricsHistory(interval)
+        if not _metrics_history.running:
+            _metrics_history.start()
+        return _metrics_history
+
+def stop_metrics_history():
+    """Stop the metrics history collector if it was started"""
+    with _metrics_history_lock:
+        if _metrics_history is not None:
+            _metrics_history.stop()
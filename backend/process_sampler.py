@@ -0,0 +1,195 @@
+import os
+import time
+import heapq
+import threading
+import psutil
+
+DEFAULT_SAMPLE_INTERVAL = 2.0
+DEFAULT_TOP_LIMIT = 20
+# Ticks are spread out so sampling uses at most 1/SAMPLE_DUTY_FACTOR of a
+# core, on hosts with many thousand processes the interval grows
+SAMPLE_DUTY_FACTOR = 5
+MAX_CMDLINE_LENGTH = 200
+
+def _io_rate(row: dict) -> float:
+    if row['read_bytes_per_sec'] is None:
+        return -1
+    return row['read_bytes_per_sec'] + row['write_bytes_per_sec']
+
+def _or_minus_one(value) -> float:
+    return -1 if value is None else value
+
+# Sort keys for top(), processes without access to a value sort last
+SORT_KEYS = {
+    'cpu': lambda row: row['cpu_percent'],
+    'rss': lambda row: row['rss'],
+    'io': _io_rate,
+    'fds': lambda row: _or_minus_one(row['num_fds']),
+}
+
+class _Tracked:
+    """A psutil.Process kept between ticks plus values that rarely change"""
+
+    __slots__ = ('process', 'username', 'cmdline', 'io', 'io_time')
+
+    def __init__(self, process: psutil.Process):
+        self.process = process
+        self.username = None
+        self.cmdline = None
+        self.io = None
+        self.io_time = None
+
+class ProcessSampler:
+    """Samples the process table in a background thread.
+
+    ``psutil.Process`` objects are kept between ticks, so ``cpu_percent``
+    is the usage since the previous tick and the username and command line
+    are read only once per process. Each tick reads a few /proc files per
+    process inside ``oneshot()``; requests only sort the latest snapshot.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._tracked = {}
+        self._snapshot = (None, [])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.sample_duration = 0.0
+
+    def _sample_process(self, pid: int, tracked: _Tracked, now: float, total_ram: int) -> dict:
+        process = tracked.process
+        with process.oneshot():
+            if tracked.username is None:
+                try:
+                    tracked.username = process.username()
+                except (psutil.AccessDenied, KeyError):
+                    tracked.username = ''
+                try:
+                    tracked.cmdline = ' '.join(process.cmdline())[:MAX_CMDLINE_LENGTH]
+                except psutil.AccessDenied:
+                    tracked.cmdline = ''
+
+            rss = process.memory_info().rss
+            row = {
+                'pid': pid,
+                'name': process.name(),
+                'username': tracked.username,
+                'cmdline': tracked.cmdline,
+                'status': process.status(),
+                'cpu_percent': round(process.cpu_percent(None), 1),
+                'rss': rss,
+                'memory_percent': round(rss / total_ram * 100, 2) if total_ram else None,
+                'num_threads': process.num_threads(),
+                'num_fds': None,
+                'read_bytes_per_sec': None,
+                'write_bytes_per_sec': None,
+            }
+
+            try:
+                row['num_fds'] = process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+            except psutil.AccessDenied:
+                pass
+
+            try:
+                io = process.io_counters()
+            except (psutil.AccessDenied, AttributeError):
+                io = None
+            if io is not None:
+                if tracked.io is not None and now > tracked.io_time:
+                    elapsed = now - tracked.io_time
+                    row['read_bytes_per_sec'] = round(max(0, io.read_bytes - tracked.io.read_bytes) / elapsed, 1)
+                    row['write_bytes_per_sec'] = round(max(0, io.write_bytes - tracked.io.write_bytes) / elapsed, 1)
+                tracked.io = io
+                tracked.io_time = now
+        return row
+
+    def _take_sample(self):
+        now = time.time()
+        total_ram = psutil.virtual_memory().total
+        pids = psutil.pids()
+        tracked = {}
+        rows = []
+        for pid in pids:
+            entry = self._tracked.get(pid)
+            try:
+                if entry is None:
+                    entry = _Tracked(psutil.Process(pid))
+                rows.append(self._sample_process(pid, entry, now, total_ram))
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except psutil.AccessDenied:
+                # Keep the process, it may become readable and its CPU baseline is set
+                pass
+            tracked[pid] = entry
+
+        # Exited processes drop out here, their Process objects are released
+        self._tracked = tracked
+        self.sample_duration = time.time() - now
+        with self._lock:
+            self._snapshot = (now, rows)
+
+    def _run(self):
+        while not self._stop.wait(max(self.interval, self.sample_duration * SAMPLE_DUTY_FACTOR)):
+            try:
+                self._take_sample()
+            except Exception as e:
+                print(f"Error sampling processes: {e}")
+
+    def start(self):
+        """Start the sampler thread, taking a short first sample synchronously"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # The first cpu_percent of a process is always 0, prime it
+        self._take_sample()
+        time.sleep(min(0.2, self.interval))
+        self._take_sample()
+        self._thread = threading.Thread(target=self._run, name='sysdash-process-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def top(self, sort: str = 'cpu', limit: int = DEFAULT_TOP_LIMIT) -> dict:
+        """Return the top processes of the latest sample by cpu, rss, io or fds.
+
+        Raises ValueError for an unknown sort key.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}', use one of: {', '.join(SORT_KEYS)}")
+        with self._lock:
+            timestamp, rows = self._snapshot
+        return {
+            'timestamp': timestamp,
+            'interval_seconds': self.interval,
+            'sample_duration_seconds': round(self.sample_duration, 3),
+            'process_count': len(rows),
+            'sort': sort,
+            'processes': [dict(row) for row in heapq.nlargest(max(0, limit), rows, key=SORT_KEYS[sort])]
+        }
+
+_process_sampler = None
+_process_sampler_lock = threading.Lock()
+
+def get_process_sampler() -> ProcessSampler:
+    """Return the process-wide process sampler, starting it on first use"""
+    global _process_sampler
+    with _process_sampler_lock:
+        if _process_sampler is None:
+            try:
+                interval = float(os.getenv('SYSDASH_PROCESS_SAMPLE_INTERVAL', DEFAULT_SAMPLE_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_SAMPLE_INTERVAL
+            _process_sampler = ProcessSampler(interval)
+        if not _process_sampler.running:
+            _process_sampler.start()
+        return _process_sampler
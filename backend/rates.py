@@ -0,0 +1,44 @@
+import time
+import threading
+
+# Samples closer together than this give noisy rates, they are computed
+# against the older sample instead of replacing it
+MIN_RATE_INTERVAL = 0.5
+
+class CounterRates:
+    """Per-second rates of monotonically increasing counters.
+
+    Keeps the previous sample in memory, keyed by device (an interface or
+    a disk) and counter name, so a rate costs one subtraction per counter.
+    Devices that disappear are dropped with the next sample.
+    """
+
+    def __init__(self, min_interval: float = MIN_RATE_INTERVAL):
+        self.min_interval = min_interval
+        self._previous = None
+        self._lock = threading.Lock()
+
+    def update(self, samples: dict, now: float = None) -> tuple:
+        """Record {device: {counter: value}}, returns (rates, elapsed seconds).
+
+        rates maps each device to {counter + '_per_sec': rate}. Devices
+        without a previous sample get None; a counter that went backwards
+        (reset or wrap) gets a rate of 0.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            previous = self._previous
+            elapsed = now - previous[0] if previous else 0
+            rates = {}
+            for device, counters in samples.items():
+                before = previous[1].get(device) if previous and elapsed > 0 else None
+                if before is None:
+                    rates[device] = None
+                    continue
+                rates[device] = {
+                    f'{name}_per_sec': round(max(0, value - before[name]) / elapsed, 2) if name in before else None
+                    for name, value in counters.items()
+                }
+            if previous is None or elapsed >= self.min_interval:
+                self._previous = (now, samples)
+        return rates, round(elapsed, 3)
@@ -1,69 +1,342 @@
 import requests
 import time
 import os
-from .test_logger import TestResultLogger
+import threading
+import statistics
+from requests.adapters import HTTPAdapter
+from .test_logger import get_logger
+from .speedtest_config import SpeedtestConfig
 
-# Initialize logger
-logger = TestResultLogger()
-
-SERVER_URL = "http://fra1.syncwi.de:8080"
+SERVER_URL = SpeedtestConfig.DEFAULT_SERVERS[0]
 UPLOAD_SIZE_MB = 20
-DOWNLOAD_URL = f"{SERVER_URL}/speedtest/download"
-UPLOAD_URL = f"{SERVER_URL}/speedtest/upload"
-PING_URL = f"{SERVER_URL}/speedtest/ping"
+PING_TIMEOUT = 5
+
+# Multi-stream mode: connections are added every RAMP_INTERVAL seconds while
+# each one still raises throughput by RAMP_GAIN, the first SLOW_START_SECONDS
+# (TCP slow start) are never measured
+MAX_STREAMS = 8
+# Connections kept per host by the shared session, more streams than this
+# would wait for a pooled connection instead of transferring
+POOL_MAXSIZE = MAX_STREAMS * 2
+STREAM_TEST_SECONDS = 8.0
+SLOW_START_SECONDS = 1.0
+RAMP_INTERVAL = 0.5
+RAMP_GAIN = 0.1
+STREAM_CHUNK_SIZE = 64 * 1024
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+UPLOAD_REQUEST_BYTES = 64 * 1024 * 1024
+
+_upload_block = None
+_session = None
+_session_lock = threading.Lock()
+_selected_server = None
+_selection_lock = threading.Lock()
+
+def get_endpoints(server_url: str) -> dict:
+    """Return the ping, download and upload URLs of a speedtest server"""
+    return {
+        'ping': f"{server_url}/speedtest/ping",
+        'download': f"{server_url}/speedtest/download",
+        'upload': f"{server_url}/speedtest/upload"
+    }
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session, pooled for the parallel streams"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+def measure_latency(ping_url: str, samples: int = None, timeout: float = PING_TIMEOUT) -> dict:
+    """Sample request round trips over one kept-alive connection.
+
+    The first request opens the connection and isn't counted, so samples
+    measure the round trip instead of TCP and TLS handshakes. Jitter is the
+    mean difference between consecutive samples.
+    """
+    samples = samples or SpeedtestConfig.get_ping_samples()
+    session = get_session()
+    session.get(ping_url, timeout=timeout).raise_for_status()
+
+    rtts = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        response = session.get(ping_url, timeout=timeout)
+        rtts.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+    jitter = statistics.mean(abs(b - a) for a, b in zip(rtts, rtts[1:])) if len(rtts) > 1 else 0.0
+    return {
+        'min_ms': round(min(rtts), 2),
+        'median_ms': round(statistics.median(rtts), 2),
+        'max_ms': round(max(rtts), 2),
+        'jitter_ms': round(jitter, 2),
+        'samples': len(rtts)
+    }
+
+def select_server(force: bool = False) -> dict:
+    """Pick the registered server with the lowest median latency.
+
+    The choice is cached for SpeedtestConfig.SERVER_SELECTION_TTL seconds.
+    With a single registered server no probing is done. Returns a dict
+    with 'name', 'url' and, when probed, 'latency'.
+    """
+    global _selected_server
+    servers = SpeedtestConfig.get_servers()
+    with _selection_lock:
+        if not force and _selected_server:
+            selected_at, server = _selected_server
+            if time.monotonic() - selected_at < SpeedtestConfig.SERVER_SELECTION_TTL and \
+                    server['url'] in [s['url'] for s in servers]:
+                return dict(server)
+
+        chosen = dict(servers[0])
+        if len(servers) > 1:
+            best = None
+            for server in servers:
+                try:
+                    latency = measure_latency(get_endpoints(server['url'])['ping'], samples=3)
+                except Exception as e:
+                    print(f"Speedtest server {server['url']} unreachable: {e}")
+                    continue
+                if best is None or latency['median_ms'] < best['latency']['median_ms']:
+                    best = dict(server, latency=latency)
+            if best:
+                chosen = best
+
+        _selected_server = (time.monotonic(), chosen)
+        return dict(chosen)
+
+def _random_block() -> bytes:
+    """Random upload payload, generated once and reused by every upload"""
+    global _upload_block
+    if _upload_block is None:
+        _upload_block = os.urandom(UPLOAD_BLOCK_SIZE)
+    return _upload_block
+
+def _upload_body(stop: threading.Event, samples: list, limit: int = None, duration: float = None):
+    """Chunked upload body streaming the random block until stopped.
+
+    Memory stays constant whatever the upload size. The body ends after
+    ``limit`` bytes, ``duration`` seconds after its first chunk or when
+    ``stop`` is set. Requests only starts reading the body once the
+    connection is set up, so the first sample, (time, 0), marks the first
+    byte sent. After that a (time, bytes) sample is recorded whenever the
+    previous chunk has been handed to the socket.
+    """
+    block = memoryview(_random_block())
+    sent = 0
+    samples.append((time.perf_counter(), 0))
+    deadline = samples[-1][0] + duration if duration else None
+    while True:
+        for offset in range(0, len(block), STREAM_CHUNK_SIZE):
+            if stop.is_set() or (deadline is not None and time.perf_counter() >= deadline):
+                return
+            chunk = block[offset:offset + STREAM_CHUNK_SIZE]
+            if limit is not None:
+                if sent >= limit:
+                    return
+                chunk = chunk[:limit - sent]
+            yield chunk
+            sent += len(chunk)
+            samples.append((time.perf_counter(), len(chunk)))
+
+def _download_stream(url: str, stop: threading.Event, samples: list, errors: list):
+    """Keep downloading from url until stopped, recording received bytes"""
+    try:
+        session = get_session()
+        while not stop.is_set():
+            with session.get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    samples.append((time.perf_counter(), len(chunk)))
+                    if stop.is_set():
+                        break
+    except Exception as e:
+        errors.append(str(e))
 
-def ping_server() -> float:
-    """Measure latency to the speedtest server with logging"""
+def _upload_stream(url: str, stop: threading.Event, samples: list, errors: list):
+    """Keep uploading to url until stopped, recording sent bytes"""
+    try:
+        session = get_session()
+        while not stop.is_set():
+            response = session.post(url, data=_upload_body(stop, samples, UPLOAD_REQUEST_BYTES),
+                                    headers={'Content-Type': 'application/octet-stream'}, timeout=60)
+            response.raise_for_status()
+    except Exception as e:
+        errors.append(str(e))
+
+def _bytes_between(samples: list, start: float, end: float) -> int:
+    return sum(size for stamp, size in list(samples) if start < stamp <= end)
+
+def _timeline(sample_lists: list, start: float, end: float, interval: float) -> list:
+    """Aggregate Mbps of every interval between start and end"""
+    timeline = []
+    tick = start
+    while tick < end:
+        tick_end = min(tick + interval, end)
+        moved = sum(_bytes_between(samples, tick, tick_end) for samples in sample_lists)
+        timeline.append(round(moved * 8 / (tick_end - tick) / 1_000_000, 2))
+        tick = tick_end
+    return timeline
+
+def _run_streams(stream_func, url: str, max_streams: int, duration: float,
+                 slow_start: float = SLOW_START_SECONDS, ramp_interval: float = RAMP_INTERVAL) -> dict:
+    """Ramp up parallel streams to saturation, then measure for duration seconds.
+
+    Streams are threads, requests releases the GIL while waiting on the
+    socket. Returns aggregate and per-stream Mbps over the measured window
+    and the aggregate Mbps of every ramp interval as a timeline. At most
+    POOL_MAXSIZE streams are opened.
+    """
+    max_streams = min(max_streams, POOL_MAXSIZE)
+    stop = threading.Event()
+    streams = []
+    errors = []
+
+    def add_stream():
+        samples = []
+        thread = threading.Thread(target=stream_func, args=(url, stop, samples, errors), daemon=True)
+        streams.append((thread, samples))
+        thread.start()
+
+    started = time.perf_counter()
+    add_stream()
+    previous_rate = None
+    saturated_at = None
+    while saturated_at is None:
+        time.sleep(ramp_interval)
+        now = time.perf_counter()
+        rate = sum(_bytes_between(samples, now - ramp_interval, now) for _, samples in streams) / ramp_interval
+        if len(streams) < max_streams and (previous_rate is None or rate > previous_rate * (1 + RAMP_GAIN)):
+            previous_rate = rate
+            add_stream()
+        else:
+            saturated_at = now
+
+    window_start = max(saturated_at, started + slow_start)
+    end = window_start + duration
+    while time.perf_counter() < end and any(thread.is_alive() for thread, _ in streams):
+        time.sleep(min(0.1, max(0.0, end - time.perf_counter())))
+    end = min(end, time.perf_counter())
+    stop.set()
+    for thread, _ in streams:
+        thread.join(timeout=5)
+
+    if not any(samples for _, samples in streams):
+        raise RuntimeError(errors[0] if errors else "No data transferred")
+
+    window = max(end - window_start, 1e-9)
+    per_stream = [_bytes_between(samples, window_start, end) for _, samples in streams]
+    timeline = _timeline([samples for _, samples in streams], started, end, ramp_interval)
+
+    return {
+        'speed_mbps': round(sum(per_stream) * 8 / window / 1_000_000, 2),
+        'streams': len(streams),
+        'per_stream_mbps': [round(size * 8 / window / 1_000_000, 2) for size in per_stream],
+        'measured_bytes': sum(per_stream),
+        'total_bytes': sum(size for _, samples in streams for _, size in samples),
+        'measured_seconds': round(window, 2),
+        'ramp_seconds': round(saturated_at - started, 2),
+        'skipped_seconds': round(window_start - started, 2),
+        'interval_seconds': ramp_interval,
+        'timeline_mbps': timeline,
+        'errors': errors
+    }
+
+def measure_download_streams(url: str = None, max_streams: int = MAX_STREAMS,
+                             duration: float = STREAM_TEST_SECONDS, **kwargs) -> dict:
+    """Multi-stream download measurement without logging"""
+    url = url or get_endpoints(select_server()['url'])['download']
+    return _run_streams(_download_stream, url, max_streams, duration, **kwargs)
+
+def measure_upload_streams(url: str = None, max_streams: int = MAX_STREAMS,
+                           duration: float = STREAM_TEST_SECONDS, **kwargs) -> dict:
+    """Multi-stream upload measurement without logging"""
+    url = url or get_endpoints(select_server()['url'])['upload']
+    return _run_streams(_upload_stream, url, max_streams, duration, **kwargs)
+
+def _logged_stream_test(test_type: str, measure, url: str, streams: int) -> float:
+    """Run a multi-stream measurement and log it like the single-stream tests"""
+    key = f'{test_type}_speed_mbps'
     start_time = time.time()
     try:
-        start = time.time()
-        response = requests.get(PING_URL, timeout=5)
-        end = time.time()
+        measured = measure(url, streams)
+        results = {key: measured.pop('speed_mbps'), 'mode': 'multi_stream', 'max_streams': streams}
+        results.update(measured)
+        results.update({'server_url': url, 'success': True})
         
-        if response.status_code == 200:
-            ping_ms = round((end - start) * 1000, 2)
-            
-            # Log ping result
-            results = {
-                'ping_ms': ping_ms,
-                'status_code': response.status_code,
-                'server_url': PING_URL,
-                'timeout': 5,
-                'success': True
-            }
-            
-        else:
-            ping_ms = -1
-            results = {
-                'ping_ms': ping_ms,
-                'status_code': response.status_code,
-                'server_url': PING_URL,
-                'timeout': 5,
-                'success': False,
-                'error': f"HTTP {response.status_code}"
-            }
-            
-        logger.log_benchmark_result('ping', results)
+        get_logger().log_benchmark_result(test_type, results)
+        return results[key]
+        
+    except Exception as e:
+        results = {
+            key: -1,
+            'mode': 'multi_stream',
+            'max_streams': streams,
+            'server_url': url,
+            'success': False,
+            'error': str(e),
+            'duration': round(time.time() - start_time, 2)
+        }
+        get_logger().log_benchmark_result(test_type, results)
+        return -1
+
+def ping_server(server: str = None) -> float:
+    """Measure latency to the speedtest server with logging.
+
+    Returns the median of the latency samples, min/median/max and jitter
+    are logged.
+    """
+    server = server or select_server()['url']
+    ping_url = get_endpoints(server)['ping']
+    start_time = time.time()
+    try:
+        latency = measure_latency(ping_url)
+        ping_ms = latency['median_ms']
+        
+        # Log ping result
+        results = {'ping_ms': ping_ms}
+        results.update(latency)
+        results.update({
+            'server_url': ping_url,
+            'timeout': PING_TIMEOUT,
+            'success': True
+        })
+        
+        get_logger().log_benchmark_result('ping', results)
         return ping_ms
         
     except Exception as e:
         results = {
             'ping_ms': -1,
-            'server_url': PING_URL,
-            'timeout': 5,
+            'server_url': ping_url,
+            'timeout': PING_TIMEOUT,
             'success': False,
             'error': str(e),
             'duration': round(time.time() - start_time, 2)
         }
-        logger.log_benchmark_result('ping', results)
+        if isinstance(e, requests.HTTPError) and e.response is not None:
+            results['status_code'] = e.response.status_code
+        get_logger().log_benchmark_result('ping', results)
         return -1
 
-def test_download_speed() -> float:
-    """Measure download speed with logging"""
+def test_download_speed(streams: int = None, server: str = None) -> float:
+    """Measure download speed with logging, over parallel streams if streams > 1"""
+    streams = streams or SpeedtestConfig.get_streams()
+    download_url = get_endpoints(server or select_server()['url'])['download']
+    if streams > 1:
+        return _logged_stream_test('download', measure_download_streams, download_url, streams)
+    
     start_time = time.time()
     try:
         start = time.time()
-        response = requests.get(DOWNLOAD_URL, stream=True, timeout=30)
+        response = get_session().get(download_url, stream=True, timeout=30)
         total_bytes = 0
         
         for chunk in response.iter_content(chunk_size=1024 * 1024):
@@ -79,80 +352,118 @@ def test_download_speed() -> float:
             'total_bytes': total_bytes,
             'total_mb': round(total_bytes / (1024 * 1024), 2),
             'duration_seconds': round(duration, 2),
-            'server_url': DOWNLOAD_URL,
+            'server_url': download_url,
             'success': True,
             'status_code': response.status_code
         }
         
-        logger.log_benchmark_result('download', results)
+        get_logger().log_benchmark_result('download', results)
         return speed_mbps
         
     except Exception as e:
         results = {
             'download_speed_mbps': -1,
-            'server_url': DOWNLOAD_URL,
+            'server_url': download_url,
             'success': False,
             'error': str(e),
             'duration': round(time.time() - start_time, 2)
         }
-        logger.log_benchmark_result('download', results)
+        get_logger().log_benchmark_result('download', results)
         return -1
 
-def test_upload_speed(size_mb: int = UPLOAD_SIZE_MB) -> float:
-    """Measure upload speed with logging"""
-    start_time = time.time()
-    try:
-        data = os.urandom(size_mb * 1024 * 1024)
-        files = {'file': ('upload.dat', data, 'application/octet-stream')}
-        
-        start = time.time()
-        response = requests.post(UPLOAD_URL, files=files, timeout=60)
-        end = time.time()
+def measure_upload(url: str, size_mb: float = UPLOAD_SIZE_MB, duration: float = None,
+                   interval: float = RAMP_INTERVAL) -> dict:
+    """Single-stream upload without logging, size or time bounded.
 
-        duration = end - start
-        
-        if response.status_code == 200:
-            speed_mbps = (len(data) * 8) / (duration * 1_000_000)
-            speed_mbps = round(speed_mbps, 2)
-            success = True
-        else:
-            speed_mbps = -1
-            success = False
+    Streams a chunked body from the reused random block, so memory stays
+    constant and the clock starts with the first byte sent. With a
+    ``duration`` the upload runs for that many seconds instead of sending
+    ``size_mb``.
+    """
+    samples = []
+    limit = None if duration else int(size_mb * 1024 * 1024)
+    requested = time.perf_counter()
+    response = get_session().post(url, data=_upload_body(threading.Event(), samples, limit, duration),
+                                  headers={'Content-Type': 'application/octet-stream'}, timeout=60)
+    end = time.perf_counter()
+    response.raise_for_status()
 
-        results = {
-            'upload_speed_mbps': speed_mbps,
-            'upload_size_mb': size_mb,
-            'upload_bytes': len(data),
-            'duration_seconds': round(duration, 2),
-            'server_url': UPLOAD_URL,
-            'success': success,
-            'status_code': response.status_code
-        }
+    # Connection setup and TLS happen before the body is read
+    start = samples[0][0] if samples else requested
+    total_bytes = sum(size for _, size in samples)
+    elapsed = end - start
+    return {
+        'speed_mbps': round(total_bytes * 8 / (elapsed * 1_000_000), 2),
+        'upload_bytes': total_bytes,
+        'upload_size_mb': round(total_bytes / (1024 * 1024), 2),
+        'duration_seconds': round(elapsed, 2),
+        'mode': 'time_bounded' if duration else 'size_bounded',
+        'interval_seconds': interval,
+        'timeline_mbps': _timeline([samples], start, end, interval),
+        'status_code': response.status_code
+    }
+
+def test_upload_speed(size_mb: int = UPLOAD_SIZE_MB, streams: int = None, server: str = None,
+                      duration: float = None) -> float:
+    """Measure upload speed with logging, over parallel streams if streams > 1.
+
+    A single stream uploads ``size_mb`` or, with ``duration``, uploads for
+    that many seconds.
+    """
+    streams = streams or SpeedtestConfig.get_streams()
+    upload_url = get_endpoints(server or select_server()['url'])['upload']
+    if streams > 1:
+        return _logged_stream_test('upload', measure_upload_streams, upload_url, streams)
+    
+    start_time = time.time()
+    try:
+        measured = measure_upload(upload_url, size_mb, duration)
+        results = {'upload_speed_mbps': measured.pop('speed_mbps')}
+        results.update(measured)
+        results.update({'server_url': upload_url, 'success': True})
         
-        logger.log_benchmark_result('upload', results)
-        return speed_mbps
+        get_logger().log_benchmark_result('upload', results)
+        return results['upload_speed_mbps']
         
     except Exception as e:
         results = {
             'upload_speed_mbps': -1,
             'upload_size_mb': size_mb,
-            'server_url': UPLOAD_URL,
+            'server_url': upload_url,
             'success': False,
             'error': str(e),
             'duration': round(time.time() - start_time, 2)
         }
-        logger.log_benchmark_result('upload', results)
+        if isinstance(e, requests.HTTPError) and e.response is not None:
+            results['status_code'] = e.response.status_code
+        get_logger().log_benchmark_result('upload', results)
         return -1
 
-def get_speedtest_results() -> dict:
-    """Return all speedtest results with comprehensive logging"""
+def get_speedtest_results(progress_callback=None, streams: int = None) -> dict:
+    """Return all speedtest results with comprehensive logging
+
+    ``progress_callback(stage, status, value)`` is called with status
+    'running' before and 'completed' after each stage. ``streams`` sets the
+    parallel connections for download and upload (SYSDASH_SPEEDTEST_STREAMS
+    by default). All stages use the lowest-latency registered server.
+    """
     test_start = time.time()
     
     print("Starting network speed test...")
+    server = select_server()
+    endpoints = get_endpoints(server['url'])
+    
+    def run_stage(stage, func):
+        if progress_callback:
+            progress_callback(stage, 'running', None)
+        value = func()
+        if progress_callback:
+            progress_callback(stage, 'completed', value)
+        return value
     
-    ping_result = ping_server()
-    download_result = test_download_speed()
-    upload_result = test_upload_speed()
+    ping_result = run_stage('ping', lambda: ping_server(server['url']))
+    download_result = run_stage('download', lambda: test_download_speed(streams=streams, server=server['url']))
+    upload_result = run_stage('upload', lambda: test_upload_speed(streams=streams, server=server['url']))
     
     test_end = time.time()
     total_duration = round(test_end - test_start, 2)
@@ -163,11 +474,13 @@ def get_speedtest_results() -> dict:
         "download_speed_mbps": download_result,
         "upload_speed_mbps": upload_result,
         "total_test_duration": total_duration,
+        "streams": streams or SpeedtestConfig.get_streams(),
         "server_info": {
-            "server_url": SERVER_URL,
-            "ping_endpoint": PING_URL,
-            "download_endpoint": DOWNLOAD_URL,
-            "upload_endpoint": UPLOAD_URL
+            "server_name": server['name'],
+            "server_url": server['url'],
+            "ping_endpoint": endpoints['ping'],
+            "download_endpoint": endpoints['download'],
+            "upload_endpoint": endpoints['upload']
         },
         "test_success": all([
             ping_result > 0,
@@ -177,7 +490,7 @@ def get_speedtest_results() -> dict:
     }
     
     # Log the complete speedtest session
-    logger.log_speedtest_result(complete_results, complete_results["server_info"])
+    get_logger().log_speedtest_result(complete_results, complete_results["server_info"])
     
     print(f"Speed test completed in {total_duration} seconds")
     
@@ -185,4 +498,4 @@ def get_speedtest_results() -> dict:
 
 def get_speedtest_history(limit: int = 10):
     """Get speedtest history from encrypted logs"""
-    return logger.get_speedtest_history(limit)
+    return get_logger().get_speedtest_history(limit)
@@ -0,0 +1,63 @@
+import os
+import json
+from typing import Optional
+
+class SpeedtestConfig:
+    """Configuration for the network speedtest"""
+
+    # Default settings
+    DEFAULT_SERVERS = ["http://fra1.syncwi.de:8080"]
+    DEFAULT_PING_SAMPLES = 5
+    DEFAULT_STREAMS = 1
+    SERVER_SELECTION_TTL = 600  # Re-probe server latency after 10 minutes
+
+    @classmethod
+    def _server_entry(cls, server) -> dict:
+        if isinstance(server, str):
+            return {'name': server.split('//')[-1].split(':')[0], 'url': server.rstrip('/')}
+        return {'name': server.get('name') or server['url'].split('//')[-1].split(':')[0],
+                'url': server['url'].rstrip('/')}
+
+    @classmethod
+    def get_servers(cls, config_file: Optional[str] = None) -> list:
+        """Get the speedtest server registry as a list of {'name', 'url'} dicts.
+
+        Read from a JSON file (SYSDASH_SPEEDTEST_CONFIG, a list of URLs or
+        of objects with 'url' and optional 'name'), else the comma-separated
+        SYSDASH_SPEEDTEST_SERVERS or single SYSDASH_SPEEDTEST_SERVER, else
+        the default server.
+        """
+        config_file = config_file or os.getenv('SYSDASH_SPEEDTEST_CONFIG')
+        if config_file:
+            try:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                servers = config.get('servers', []) if isinstance(config, dict) else config
+                if servers:
+                    return [cls._server_entry(server) for server in servers]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Could not load speedtest config {config_file}: {e}")
+
+        env_servers = os.getenv('SYSDASH_SPEEDTEST_SERVERS') or os.getenv('SYSDASH_SPEEDTEST_SERVER')
+        if env_servers:
+            servers = [url.strip() for url in env_servers.split(',') if url.strip()]
+            if servers:
+                return [cls._server_entry(url) for url in servers]
+
+        return [cls._server_entry(url) for url in cls.DEFAULT_SERVERS]
+
+    @classmethod
+    def get_ping_samples(cls) -> int:
+        """Get the number of latency samples per ping"""
+        try:
+            return max(1, int(os.getenv('SYSDASH_SPEEDTEST_PING_SAMPLES', cls.DEFAULT_PING_SAMPLES)))
+        except ValueError:
+            return cls.DEFAULT_PING_SAMPLES
+
+    @classmethod
+    def get_streams(cls) -> int:
+        """Get the default number of parallel download/upload streams"""
+        try:
+            return max(1, int(os.getenv('SYSDASH_SPEEDTEST_STREAMS', cls.DEFAULT_STREAMS)))
+        except ValueError:
+            return cls.DEFAULT_STREAMS
@@ -0,0 +1,76 @@
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+class StartupTasks:
+    """Startup work that runs after the server accepts requests.
+
+    Tasks run in order on one background thread, since they all touch the
+    encrypted log; a failing task is recorded and the next one still runs.
+    """
+
+    def __init__(self):
+        self.tasks = OrderedDict()
+        self.started_at = None
+        self.finished_at = None
+        self._functions = []
+        self._thread = None
+        self._done = threading.Event()
+
+    def add(self, name: str, function, *args, **kwargs):
+        """Register a task, must be called before start()"""
+        self.tasks[name] = {'status': 'pending', 'duration_seconds': None, 'error': None}
+        self._functions.append((name, function, args, kwargs))
+
+    def _run(self):
+        for name, function, args, kwargs in self._functions:
+            info = self.tasks[name]
+            info['status'] = 'running'
+            start = time.time()
+            try:
+                function(*args, **kwargs)
+                info['status'] = 'completed'
+            except Exception as e:
+                info['status'] = 'failed'
+                info['error'] = str(e)
+                print(f"⚠️ Startup task {name} failed: {e}")
+            info['duration_seconds'] = round(time.time() - start, 3)
+        self.finished_at = datetime.now().isoformat()
+        self._done.set()
+
+    def start(self):
+        """Run the registered tasks in the background"""
+        if self._thread is not None:
+            return
+        self.started_at = datetime.now().isoformat()
+        self._thread = threading.Thread(target=self._run, name='sysdash-startup', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until all tasks have finished"""
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def to_dict(self) -> dict:
+        return {
+            'ready': self.ready,
+            'ok': self.ready and all(info['status'] == 'completed' for info in self.tasks.values()),
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'tasks': {name: dict(info) for name, info in self.tasks.items()}
+        }
+
+_startup_tasks = None
+_startup_tasks_lock = threading.Lock()
+
+def get_startup_tasks() -> StartupTasks:
+    """Return the process-wide startup task list"""
+    global _startup_tasks
+    with _startup_tasks_lock:
+        if _startup_tasks is None:
+            _startup_tasks = StartupTasks()
+        return _startup_tasks
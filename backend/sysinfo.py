@@ -4,13 +4,21 @@ import platform
 import psutil
 import cpuinfo
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from .cpu_sampler import get_cpu_sampler
+from .cache import static_fact, dynamic_counter
+from .rates import CounterRates
 
+@static_fact
 def get_sys_info():
     return {
         "python_version": sys.version,
         "executable": sys.executable
     }
 
+@static_fact
 def get_platform_info():
     return {
         "processor": platform.processor(),
@@ -20,15 +28,20 @@ def get_platform_info():
         "architecture": platform.architecture()
     }
 
-def get_cpu_stats():
+@dynamic_counter()
+def get_cpu_stats(window: float = None):
+    """CPU usage from the background sampler, averaged over window seconds if given"""
     freq = psutil.cpu_freq()
+    per_core = get_cpu_sampler().get_per_core(window)
     return {
         "logical_cpus": psutil.cpu_count(logical=True),
         "physical_cores": psutil.cpu_count(logical=False),
-        "cpu_percent_per_core": psutil.cpu_percent(percpu=True, interval=1),
+        "cpu_percent_per_core": per_core,
+        "cpu_percent": round(sum(per_core) / len(per_core), 1) if per_core else 0.0,
         "cpu_freq": freq._asdict() if freq else None
     }
 
+@static_fact
 def get_cpu_details():
     try:
         info = cpuinfo.get_cpu_info()
@@ -36,6 +49,7 @@ def get_cpu_details():
     except Exception as e:
         return {"error": str(e)}
 
+@static_fact
 def get_lscpu_info():
     """For Linux systems only"""
     if os.name != "posix":
@@ -46,6 +60,7 @@ def get_lscpu_info():
     except Exception as e:
         return {"error": str(e)}
 
+@static_fact
 def get_wmic_info():
     """For Windows systems only - Updated for newer Windows versions"""
     if os.name != "nt":
@@ -70,6 +85,7 @@ def get_wmic_info():
     except Exception as e:
         return {"error": f"Windows CPU info not available: {str(e)}"}
 
+@static_fact
 def get_sysctl_info():
     """For macOS systems only"""
     if sys.platform != "darwin":
@@ -80,11 +96,11 @@ def get_sysctl_info():
     except Exception as e:
         return {"error": str(e)}
 
-def get_all_cpu_info():
+def get_all_cpu_info(cpu_window: float = None):
     result = {
         "sys_info": get_sys_info(),
         "platform_info": get_platform_info(),
-        "cpu_stats": get_cpu_stats(),
+        "cpu_stats": get_cpu_stats(cpu_window),
         "cpu_details": get_cpu_details(),
     }
     
@@ -98,6 +114,7 @@ def get_all_cpu_info():
     return result
 
 # ----- RAM Info -----
+@dynamic_counter()
 def get_ram_info():
     vm = psutil.virtual_memory()
     sm = psutil.swap_memory()
@@ -114,58 +131,217 @@ def get_ram_info():
     }
 
 # ----- Disk Info -----
-def get_disk_partitions():
-    partitions = psutil.disk_partitions(all=False)
+DEFAULT_DISK_USAGE_TIMEOUT = 2.0
+DISK_USAGE_WORKERS = 32
+
+# Kernel and memory-backed filesystems, no disk behind them
+PSEUDO_FILESYSTEMS = {
+    'autofs', 'binfmt_misc', 'bpf', 'cgroup', 'cgroup2', 'configfs', 'debugfs', 'devpts', 'devtmpfs',
+    'efivarfs', 'fusectl', 'hugetlbfs', 'mqueue', 'nsfs', 'overlay', 'proc', 'pstore', 'ramfs',
+    'rpc_pipefs', 'securityfs', 'sysfs', 'tmpfs', 'tracefs', 'fuse.lxcfs', 'fuse.gvfsd-fuse', 'fuse.portal',
+}
+
+# Filesystems whose usage calls can hang on an unreachable server
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'ncpfs', 'afs', '9p', 'ceph', 'glusterfs', 'fuse.glusterfs',
+    'fuse.sshfs', 'fuse.rclone', 'fuse.s3fs', 'lustre', 'gpfs', 'davfs', 'fuse.davfs2',
+}
+
+_usage_pool = None
+_usage_pending = {}
+_usage_cache = {}
+_usage_lock = threading.Lock()
+
+def get_disk_usage_timeout() -> float:
+    """Get the per-call timeout in seconds for partition usage"""
+    try:
+        return float(os.getenv('SYSDASH_DISK_USAGE_TIMEOUT', DEFAULT_DISK_USAGE_TIMEOUT))
+    except ValueError:
+        return DEFAULT_DISK_USAGE_TIMEOUT
+
+def _partition_usage(mountpoint: str) -> dict:
+    try:
+        usage = psutil.disk_usage(mountpoint)
+    except PermissionError:
+        # some partitions may not be accessible
+        return {"error": "Permission Denied"}
+    except OSError as e:
+        return {"error": str(e)}
+    return {
+        "total_size": usage.total,
+        "used": usage.used,
+        "free": usage.free,
+        "percent_used": usage.percent,
+    }
+
+def _submit_usage(mountpoint: str) -> tuple:
+    """Start a usage call unless one for this mount is still running (hung).
+
+    Returns (future, whether it was started by this call).
+    """
+    global _usage_pool
+    with _usage_lock:
+        future = _usage_pending.get(mountpoint)
+        if future is not None and not future.done():
+            return future, False
+        if _usage_pool is None:
+            _usage_pool = ThreadPoolExecutor(max_workers=DISK_USAGE_WORKERS, thread_name_prefix='sysdash-disk-usage')
+        future = _usage_pool.submit(_partition_usage, mountpoint)
+        _usage_pending[mountpoint] = future
+        return future, True
+
+@dynamic_counter()
+def get_disk_partitions(include_network: bool = False, include_pseudo: bool = False):
+    """Mounted partitions with usage, collected in parallel.
+
+    Every mount gets at most SYSDASH_DISK_USAGE_TIMEOUT seconds in total,
+    however many there are. A mount that doesn't answer in time (a hung
+    NFS or FUSE server) reports its last known usage marked as stale; its
+    call is not retried until the hung one returns.
+    """
+    if include_network or include_pseudo:
+        partitions = psutil.disk_partitions(all=True)
+    else:
+        partitions = psutil.disk_partitions(all=False)
+    partitions = [
+        p for p in partitions
+        if (include_network or p.fstype not in NETWORK_FILESYSTEMS)
+        and (include_pseudo or p.fstype not in PSEUDO_FILESYSTEMS)
+    ]
+
+    futures = {}
+    started = []
+    for p in partitions:
+        futures[p.mountpoint], fresh = _submit_usage(p.mountpoint)
+        if fresh:
+            started.append(futures[p.mountpoint])
+    # Mounts already known to hang are not waited for again
+    wait(started, timeout=get_disk_usage_timeout())
+
     result = []
+    now = time.monotonic()
     for p in partitions:
-        try:
-            usage = psutil.disk_usage(p.mountpoint)
-            result.append({
-                "device": p.device,
-                "mountpoint": p.mountpoint,
-                "fstype": p.fstype,
-                "opts": p.opts,
-                "total_size": usage.total,
-                "used": usage.used,
-                "free": usage.free,
-                "percent_used": usage.percent,
-            })
-        except PermissionError:
-            # some partitions may not be accessible
-            result.append({
-                "device": p.device,
-                "mountpoint": p.mountpoint,
-                "fstype": p.fstype,
-                "opts": p.opts,
-                "error": "Permission Denied"
-            })
+        entry = {
+            "device": p.device,
+            "mountpoint": p.mountpoint,
+            "fstype": p.fstype,
+            "opts": p.opts,
+        }
+        future = futures[p.mountpoint]
+        if future.done():
+            usage = future.result()
+            with _usage_lock:
+                _usage_cache[p.mountpoint] = (now, usage)
+            entry.update(usage)
+            entry["stale"] = False
+        else:
+            with _usage_lock:
+                cached = _usage_cache.get(p.mountpoint)
+            if cached:
+                entry.update(cached[1])
+                entry["stale"] = True
+                entry["stale_age_seconds"] = round(now - cached[0], 1)
+            else:
+                entry["error"] = "Timed out"
+                entry["stale"] = True
+        result.append(entry)
     return result
 
-def get_disk_io():
-    io_counters = psutil.disk_io_counters()
-    if io_counters:
-        return {
-            "read_count": io_counters.read_count,
-            "write_count": io_counters.write_count,
-            "read_bytes": io_counters.read_bytes,
-            "write_bytes": io_counters.write_bytes,
-            "read_time_ms": io_counters.read_time,
-            "write_time_ms": io_counters.write_time
-        }
-    else:
+_disk_rates = CounterRates()
+
+def _whole_disks(names) -> set:
+    """Names of whole block devices, partitions have no /sys/block entry"""
+    if os.path.isdir('/sys/block'):
+        return set(os.listdir('/sys/block')) & set(names)
+    return set(names)
+
+@dynamic_counter()
+def get_disk_io(include_dm: bool = True, include_loop: bool = False):
+    """Lifetime I/O totals plus per-device counters and rates.
+
+    One read of /proc/diskstats on Linux; rates, IOPS, average service
+    time (await) and utilisation are deltas against the previous call.
+    Device-mapper (dm-*) and loop devices can be left out of the device
+    list, the totals always cover all whole disks.
+    """
+    io_counters = psutil.disk_io_counters(perdisk=True)
+    if not io_counters:
         return {}
 
+    counters = {}
+    for name, c in io_counters.items():
+        counters[name] = {
+            "read_count": c.read_count,
+            "write_count": c.write_count,
+            "read_bytes": c.read_bytes,
+            "write_bytes": c.write_bytes,
+            "read_time_ms": c.read_time,
+            "write_time_ms": c.write_time,
+        }
+        # Time the device had I/O in flight, Linux only
+        if hasattr(c, 'busy_time'):
+            counters[name]["busy_time_ms"] = c.busy_time
+    rates, elapsed = _disk_rates.update(counters)
+
+    disks = _whole_disks(counters)
+    result = {key: sum(counters[name][key] for name in disks)
+              for key in ("read_count", "write_count", "read_bytes", "write_bytes", "read_time_ms", "write_time_ms")}
+
+    devices = {}
+    for name in sorted(disks):
+        if (not include_dm and name.startswith('dm-')) or (not include_loop and name.startswith('loop')):
+            continue
+        device = dict(counters[name])
+        rate = rates.get(name)
+        if rate is not None:
+            ops = rate["read_count_per_sec"] + rate["write_count_per_sec"]
+            device["rates"] = {
+                "read_bytes_per_sec": rate["read_bytes_per_sec"],
+                "write_bytes_per_sec": rate["write_bytes_per_sec"],
+                "read_iops": rate["read_count_per_sec"],
+                "write_iops": rate["write_count_per_sec"],
+                "await_ms": round((rate["read_time_ms_per_sec"] + rate["write_time_ms_per_sec"]) / ops, 3) if ops else 0.0,
+                "utilization_percent": min(100.0, round(rate["busy_time_ms_per_sec"] / 10, 1)) if "busy_time_ms_per_sec" in rate else None,
+            }
+            device["rate_interval_seconds"] = elapsed
+        else:
+            device["rates"] = None
+        devices[name] = device
+    result["devices"] = devices
+    return result
+
 # ----- Network Info -----
+_net_rates = CounterRates()
+
+def _net_counters(counters) -> dict:
+    return {
+        "rx_bytes": counters.bytes_recv,
+        "tx_bytes": counters.bytes_sent,
+        "rx_packets": counters.packets_recv,
+        "tx_packets": counters.packets_sent,
+        "rx_errors": counters.errin,
+        "tx_errors": counters.errout,
+        "rx_drops": counters.dropin,
+        "tx_drops": counters.dropout,
+    }
+
+@dynamic_counter()
 def get_network_info():
     addrs = psutil.net_if_addrs()
     stats = psutil.net_if_stats()
+    # One read of /proc/net/dev on Linux, rates come from the previous call
+    counters = {name: _net_counters(c) for name, c in psutil.net_io_counters(pernic=True).items()}
+    rates, elapsed = _net_rates.update(counters)
     result = {}
-    for iface_name, iface_addrs in addrs.items():
+    for iface_name in list(addrs) + [name for name in counters if name not in addrs]:
         result[iface_name] = {
-            "addresses": [{"family": str(addr.family), "address": addr.address, "netmask": addr.netmask, "broadcast": addr.broadcast} for addr in iface_addrs],
+            "addresses": [{"family": str(addr.family), "address": addr.address, "netmask": addr.netmask, "broadcast": addr.broadcast} for addr in addrs.get(iface_name, [])],
             "is_up": stats[iface_name].isup if iface_name in stats else None,
             "speed_mbps": stats[iface_name].speed if iface_name in stats else None,
             "mtu": stats[iface_name].mtu if iface_name in stats else None,
+            "counters": counters.get(iface_name),
+            "rates": rates.get(iface_name),
+            "rate_interval_seconds": elapsed if rates.get(iface_name) else None,
         }
     return result
 
@@ -1,6 +1,30 @@
-from .crypto_utils import SecureLogger
+from .crypto_utils import SecureLogger, default_password
 from datetime import datetime
 import json
+import os
+import threading
+
+# Shared loggers keyed by absolute log file path
+_logger_registry = {}
+_logger_registry_lock = threading.Lock()
+
+def get_logger(log_file: str = "logs/test_results.enc", password: str = None) -> 'TestResultLogger':
+    """Return the process-wide TestResultLogger for a log file.
+
+    Reusing one instance per file avoids repeating the key derivation and
+    lets all callers share the same write lock. Raises ValueError if the
+    file is already open with a different password.
+    """
+    password = password or default_password()
+    key = os.path.abspath(log_file)
+    with _logger_registry_lock:
+        logger = _logger_registry.get(key)
+        if logger is None:
+            logger = TestResultLogger(log_file, password)
+            _logger_registry[key] = logger
+        elif logger.secure_logger.password != password:
+            raise ValueError(f"Log file {log_file} is already open with a different password")
+        return logger
 
 class TestResultLogger:
     def __init__(self, log_file: str = "logs/test_results.enc", password: str = None):
@@ -41,14 +65,26 @@ class TestResultLogger:
             metadata={'snapshot_type': 'full_system'}
         )
     
-    def get_benchmark_history(self, benchmark_type: str = None, limit: int = 50):
+    def get_benchmark_history(self, benchmark_type: str = None, limit: int = 50, cursor: str = None):
         """Get benchmark history"""
         test_type = f"benchmark_{benchmark_type}" if benchmark_type else None
-        return self.secure_logger.get_test_results(test_type, limit)
+        return self.query_history(test_type, limit, cursor)['results']
     
-    def get_speedtest_history(self, limit: int = 50):
+    def get_speedtest_history(self, limit: int = 50, cursor: str = None):
         """Get speedtest history"""
-        return self.secure_logger.get_test_results("speedtest", limit)
+        return self.query_history("speedtest", limit, cursor)['results']
+    
+    def query_history(self, test_type: str = None, limit: int = 50, cursor: str = None,
+                      since: str = None, until: str = None) -> dict:
+        """Get a page of test results through the log index
+
+        Pass the returned ``next_cursor`` back as ``cursor`` to get the
+        next (older) page.
+        """
+        results, next_cursor = self.secure_logger.query_entries(
+            test_type, limit, since=since, until=until, before=cursor
+        )
+        return {'results': results, 'next_cursor': next_cursor}
     
     def get_test_statistics(self):
         """Get overall test statistics"""
@@ -1,15 +1,21 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, Response, HTTPException, Depends, Query
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from backend.log_backup import LogBackupManager
-from backend.init_logging import initialize_logging, cleanup_old_logs
+from backend.init_logging import prepare_logging, record_initialization, verify_logging, cleanup_old_logs
 from backend.logging_config import LoggingConfig
 from datetime import datetime
-from backend.test_logger import TestResultLogger
-from backend.benchmark import run_full_benchmark
-from backend.speedtest import get_speedtest_results
+from backend.test_logger import TestResultLogger, get_logger
+from backend.executor import run_blocking, shutdown_executors
+from backend.metrics_history import get_metrics_history, stop_metrics_history, parse_range
+from backend.jobs import get_job_manager, wait_for_job
+from backend.startup import get_startup_tasks
+import importlib.util
 import multiprocessing
 import uvicorn
+import json
+import sys
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
@@ -33,80 +39,22 @@ except ImportError as e:
             "network_info": {}
         }
 
-try:
-    from backend.speedtest import get_speedtest_results, ping_server, test_download_speed, test_upload_speed
-    SPEEDTEST_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import speedtest functions: {e}")
-    SPEEDTEST_AVAILABLE = False
+def _modules_available(*names) -> bool:
+    """Check that modules are installed without importing them"""
+    return all(importlib.util.find_spec(name) is not None for name in names)
 
-# Try to import speedtest functions
-try:
-    from backend.speedtest import get_speedtest_results, ping_server, test_download_speed, test_upload_speed
-    SPEEDTEST_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import speedtest functions: {e}")
-    SPEEDTEST_AVAILABLE = False
-    
-    # Create dummy functions for testing
-    def get_speedtest_results():
-        return {
-            "error": "Speedtest functions not available",
-            "ping_ms": -1,
-            "download_speed_mbps": -1,
-            "upload_speed_mbps": -1
-        }
-    
-    def ping_server():
-        return -1
-    
-    def test_download_speed():
-        return -1
-    
-    def test_upload_speed():
-        return -1
+# Speedtest and benchmark modules are heavy (requests, numpy, numba), the
+# routes import them on first use; here only check their dependencies
+SPEEDTEST_AVAILABLE = _modules_available('requests')
+if not SPEEDTEST_AVAILABLE:
+    print("Warning: Could not import speedtest functions: requests is not installed")
 
-# Try to import benchmark functions
-try:
-    from backend.benchmark import (
-        run_full_benchmark, 
-        cpu_single_thread, 
-        cpu_multi_thread, 
-        ram_copy_speed, 
-        disk_benchmark, 
-        gpu_benchmark
-    )
-    BENCHMARK_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import benchmark functions: {e}")
-    BENCHMARK_AVAILABLE = False
-    
-    # Create dummy functions for testing
-    def run_full_benchmark():
-        return {
-            "error": "Benchmark functions not available",
-            "cpu_single_thread_sec": -1,
-            "cpu_multi_thread_sec": -1,
-            "ram_copy_speed_MBps": -1,
-            "disk_write_MBps": -1,
-            "disk_read_MBps": -1,
-            "gpu_vector_add_sec": "GPU not available"
-        }
-    
-    def cpu_single_thread():
-        return -1
-    
-    def cpu_multi_thread():
-        return -1
-    
-    def ram_copy_speed():
-        return -1
-    
-    def disk_benchmark():
-        return -1, -1
-    
-    def gpu_benchmark():
-        return None
+BENCHMARK_AVAILABLE = _modules_available('numpy', 'psutil')
+if not BENCHMARK_AVAILABLE:
+    print("Warning: Could not import benchmark functions: numpy or psutil is not installed")
+
+# Seconds shutdown waits for unfinished startup tasks
+STARTUP_SHUTDOWN_TIMEOUT = 30
 
 # External URLS
 BOOTSTRAP_CSS_1 = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.7/dist/css/bootstrap.min.css"
@@ -118,24 +66,70 @@ app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
 template = Jinja2Templates(directory="frontend")
 
+def get_test_logger() -> TestResultLogger:
+    """Dependency providing the shared test result logger"""
+    return get_logger()
+
+async def run_heavy_job(job_type: str, **params):
+    """Queue a heavy job and wait for its result.
+
+    Every benchmark and speedtest run goes through the job queue, so only
+    one heavy job runs per host. Waiting doesn't take an executor thread.
+    """
+    job = get_job_manager().submit(job_type, **params)
+    await wait_for_job(job)
+    if job.status == 'failed':
+        raise job.exception or RuntimeError(job.error)
+    return job.result
+
+def _initialize_logging_task():
+    logger = prepare_logging()
+    record_initialization(logger)
+    print("✅ Secure logging system initialized")
+
+def _log_startup_task():
+    startup_info = {
+        'event': 'application_startup',
+        'timestamp': datetime.now().isoformat(),
+        'backend_available': BACKEND_AVAILABLE
+    }
+    get_logger().log_benchmark_result('system_event', startup_info)
+    print("✅ Application startup logged")
+
+def _verify_logs_task():
+    integrity = verify_logging(get_logger())
+    if integrity['status'] != 'valid':
+        raise RuntimeError(f"Log integrity check: {integrity['status']}")
+
+def _backup_task():
+    backup_name = LogBackupManager().create_backup()
+    print(f"✅ Initial backup created: {backup_name}")
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize logging system when the application starts"""
-    try:
-        initialize_logging()
-        print("✅ Secure logging system initialized")
-        
-        # Create initial backup if enabled
+    """Start background initialization, the server accepts requests right away.
+
+    Logging setup, the startup log entry, the integrity check and the
+    initial backup run in order on a background thread, /api/ready reports
+    their progress.
+    """
+    startup = get_startup_tasks()
+    if not startup.tasks:
+        startup.add('logging', _initialize_logging_task)
+        startup.add('startup_event', _log_startup_task)
+        startup.add('integrity_check', _verify_logs_task)
         if LoggingConfig.should_backup():
-            try:
-                backup_manager = LogBackupManager()
-                backup_path = backup_manager.create_backup()
-                print(f"✅ Initial backup created: {backup_path}")
-            except Exception as e:
-                print(f"⚠️ Could not create initial backup: {e}")
-                
-    except Exception as e:
-        print(f"❌ Error initializing logging system: {e}")
+            startup.add('backup', _backup_task)
+        startup.start()
+    
+    # Start recording metric history for /api/metrics/history
+    get_metrics_history()
+
+@app.get("/api/ready")
+async def api_ready():
+    """Readiness of the background startup tasks, 503 until they have finished"""
+    status = get_startup_tasks().to_dict()
+    return JSONResponse(status, status_code=200 if status['ready'] else 503)
 
 # Root Directory
 @app.get("/")
@@ -154,7 +148,7 @@ async def root(requests: Request):
 async def components(requests: Request):
     try:
         # Get full system information
-        system_info = get_full_system_info()
+        system_info = await run_blocking(get_full_system_info)
         print(f"System info retrieved: {type(system_info)}")  # Debug print
         
         return template.TemplateResponse("components.html",
@@ -190,15 +184,15 @@ async def tests(requests: Request):
 @app.get("/api/components")
 async def api_components():
     try:
-        return get_full_system_info()
+        return await run_blocking(get_full_system_info)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/cpu")
-async def api_cpu():
+async def api_cpu(window: float = None):
     try:
         from backend.sysinfo import get_all_cpu_info
-        return get_all_cpu_info()
+        return await run_blocking(get_all_cpu_info, window)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -206,17 +200,18 @@ async def api_cpu():
 async def api_ram():
     try:
         from backend.sysinfo import get_ram_info
-        return get_ram_info()
+        return await run_blocking(get_ram_info)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/disk")
-async def api_disk():
+async def api_disk(include_dm: bool = True, include_loop: bool = False,
+                   include_network: bool = False, include_pseudo: bool = False):
     try:
         from backend.sysinfo import get_disk_partitions, get_disk_io
         return {
-            "partitions": get_disk_partitions(),
-            "io": get_disk_io()
+            "partitions": await run_blocking(get_disk_partitions, include_network, include_pseudo),
+            "io": await run_blocking(get_disk_io, include_dm, include_loop)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -225,18 +220,84 @@ async def api_disk():
 async def api_network():
     try:
         from backend.sysinfo import get_network_info
-        return get_network_info()
+        return await run_blocking(get_network_info)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/stream/metrics")
+async def api_stream_metrics(request: Request):
+    """Server-Sent Events stream of live CPU, RAM, disk I/O and network counters
+
+    The first event is a full snapshot, later events only contain changed values.
+    """
+    from backend.live_metrics import get_metrics_broadcaster
+    broadcaster = get_metrics_broadcaster()
+    
+    async def event_stream():
+        async for message in broadcaster.subscribe():
+            if await request.is_disconnected():
+                break
+            yield f"event: {message['type']}\nid: {message['seq']}\ndata: {json.dumps(message)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/metrics/history")
+async def api_metrics_history(metric: str = None, range_: str = Query('1h', alias='range')):
+    """Get the recorded history of a metric, e.g. ?metric=cpu.percent&range=15m.
+
+    Without a metric the available metric names are listed.
+    """
+    history = get_metrics_history()
+    if metric is None:
+        return {"metrics": history.metrics()}
+    try:
+        return history.query(metric, parse_range(range_))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown metric '{metric}'")
+
+@app.get("/api/processes")
+async def api_processes(sort: str = 'cpu', limit: int = Query(20, ge=1, le=1000)):
+    """Top processes of the latest process table sample by cpu, rss, io or fds"""
+    from backend.process_sampler import get_process_sampler
+    try:
+        sampler = await run_blocking(get_process_sampler)
+        return sampler.top(sort, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus/OpenMetrics exposition of the latest pre-collected snapshot"""
+    from backend.metrics_exporter import get_metrics_exporter, CONTENT_TYPE
+    exporter = await run_blocking(get_metrics_exporter)
+    return Response(content=exporter.latest(), media_type=CONTENT_TYPE)
+
+@app.get("/api/cache/stats")
+async def api_cache_stats():
+    """Get hit/miss counters of the system information cache"""
+    from backend.cache import get_cache_stats
+    return get_cache_stats()
+
+@app.post("/api/cache/refresh")
+async def api_cache_refresh(kind: str = None):
+    """Drop cached system information, optionally only 'static' or 'dynamic' entries"""
+    if kind not in (None, "static", "dynamic"):
+        raise HTTPException(status_code=400, detail=f"Unknown cache kind: {kind}")
+    from backend.cache import refresh_cache
+    return {"refreshed": refresh_cache(kind)}
+
 # Speedtest API endpoints
 @app.get("/api/speedtest")
 async def api_speedtest():
     if not SPEEDTEST_AVAILABLE:
         raise HTTPException(status_code=503, detail="Speedtest functionality not available")
     try:
-        from backend.speedtest import get_speedtest_results
-        return get_speedtest_results()
+        return await run_heavy_job('speedtest')
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -245,28 +306,39 @@ async def api_speedtest_ping():
     if not SPEEDTEST_AVAILABLE:
         raise HTTPException(status_code=503, detail="Speedtest functionality not available")
     try:
-        from backend.speedtest import ping_server
-        return {"ping_ms": ping_server()}
+        return {"ping_ms": await run_heavy_job('speedtest_ping')}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/speedtest/download")
-async def api_speedtest_download():
+async def api_speedtest_download(streams: int = None):
     if not SPEEDTEST_AVAILABLE:
         raise HTTPException(status_code=503, detail="Speedtest functionality not available")
     try:
-        from backend.speedtest import test_download_speed
-        return {"download_speed_mbps": test_download_speed()}
+        return {"download_speed_mbps": await run_heavy_job('speedtest_download', streams=streams)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/api/speedtest/upload")
-async def api_speedtest_upload():
+async def api_speedtest_upload(streams: int = None, duration: float = None):
+    if not SPEEDTEST_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Speedtest functionality not available")
+    try:
+        return {"upload_speed_mbps": await run_heavy_job('speedtest_upload', streams=streams,
+                                                         duration=duration)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/speedtest/servers")
+async def api_speedtest_servers(refresh: bool = False):
+    """List the registered speedtest servers and the lowest-latency one in use"""
     if not SPEEDTEST_AVAILABLE:
         raise HTTPException(status_code=503, detail="Speedtest functionality not available")
     try:
-        from backend.speedtest import test_upload_speed
-        return {"upload_speed_mbps": test_upload_speed()}
+        from backend.speedtest import select_server
+        from backend.speedtest_config import SpeedtestConfig
+        selected = await run_blocking(select_server, refresh)
+        return {"servers": SpeedtestConfig.get_servers(), "selected": selected}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -276,8 +348,7 @@ async def api_benchmark():
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import run_full_benchmark
-        return run_full_benchmark()
+        return await run_heavy_job('benchmark')
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -286,8 +357,7 @@ async def api_benchmark_cpu_single():
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import cpu_single_thread
-        return {"cpu_single_thread_sec": cpu_single_thread()}
+        return {"cpu_single_thread_sec": await run_heavy_job('benchmark_cpu_single')}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -296,8 +366,7 @@ async def api_benchmark_cpu_multi():
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import cpu_multi_thread
-        return {"cpu_multi_thread_sec": cpu_multi_thread()}
+        return {"cpu_multi_thread_sec": await run_heavy_job('benchmark_cpu_multi')}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -306,22 +375,33 @@ async def api_benchmark_ram():
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import ram_copy_speed
-        return {"ram_copy_speed_MBps": ram_copy_speed()}
+        return {"ram_copy_speed_MBps": await run_heavy_job('benchmark_ram')}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/benchmark/disk")
-async def api_benchmark_disk():
+async def api_benchmark_disk(mountpoint: str = None, mode: str = 'direct', block_sizes: str = None,
+                             queue_depths: str = None, patterns: str = None, file_size_mb: int = 256):
+    """Run the disk benchmark, optionally sweeping comma-separated block sizes
+    (bytes) and queue depths on a mountpoint from /api/disk"""
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import disk_benchmark
-        write_speed, read_speed = disk_benchmark()
+        from backend.disk_bench import build_configurations, MB
+
+        def split(value, convert=str):
+            return [convert(item) for item in value.split(',') if item.strip()] if value else None
+
+        configurations = build_configurations(split(block_sizes, int), split(queue_depths, int), split(patterns))
+        write_speed, read_speed = await run_heavy_job('benchmark_disk', mountpoint=mountpoint, mode=mode,
+                                                      configurations=configurations,
+                                                      file_size=file_size_mb * MB)
         return {
             "disk_write_MBps": write_speed,
             "disk_read_MBps": read_speed
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -330,59 +410,81 @@ async def api_benchmark_gpu():
     if not BENCHMARK_AVAILABLE:
         raise HTTPException(status_code=503, detail="Benchmark functionality not available")
     try:
-        from backend.benchmark import gpu_benchmark
-        return {"gpu_vector_add_sec": gpu_benchmark()}
+        return {"gpu_vector_add_sec": await run_heavy_job('benchmark_gpu')}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Background job endpoints for long running tests
+@app.post("/api/jobs")
+async def api_submit_job(job_type: str = "benchmark"):
+    """Queue a benchmark or speedtest job and return its id right away"""
+    if job_type == "benchmark" and not BENCHMARK_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Benchmark functionality not available")
+    if job_type == "speedtest" and not SPEEDTEST_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Speedtest functionality not available")
+    try:
+        manager = get_job_manager()
+        job = manager.submit(job_type)
+        return manager.describe(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/jobs")
+async def api_list_jobs():
+    """List queued, running and recently finished jobs"""
+    return {"jobs": get_job_manager().list_jobs()}
+
+@app.get("/api/jobs/{job_id}")
+async def api_get_job(job_id: str):
+    """Get job status, per-stage progress and partial results"""
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return manager.describe(job)
+
 # Test history and statistics endpoints
+def set_next_cursor(response: Response, page: dict):
+    """Expose the cursor of the next (older) history page as a response header"""
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+
 @app.get("/api/test-history")
-async def api_test_history(test_type: str = None, limit: int = 50):
-    """Get test history from encrypted logs"""
+async def api_test_history(response: Response, test_type: str = None, limit: int = 50, cursor: str = None,
+                           since: str = None, until: str = None,
+                           logger: TestResultLogger = Depends(get_test_logger)):
+    """Get test history from encrypted logs
+
+    Pass the X-Next-Cursor response header back as ``cursor`` for older results.
+    """
     try:
-        from backend.test_logger import TestResultLogger
-        logger = TestResultLogger()
-        
-        if test_type:
-            if test_type.startswith('benchmark_'):
-                benchmark_type = test_type.replace('benchmark_', '')
-                return logger.get_benchmark_history(benchmark_type, limit)
-            elif test_type == 'speedtest':
-                return logger.get_speedtest_history(limit)
-            else:
-                return logger.secure_logger.get_test_results(test_type, limit)
-        else:
-            return logger.secure_logger.get_test_results(None, limit)
+        page = await run_blocking(logger.query_history, test_type, limit, cursor, since, until)
+        set_next_cursor(response, page)
+        return page['results']
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/test-statistics")
-async def api_test_statistics():
+async def api_test_statistics(logger: TestResultLogger = Depends(get_test_logger)):
     """Get test statistics from encrypted logs"""
     try:
-        from backend.test_logger import TestResultLogger
-        logger = TestResultLogger()
-        return logger.get_test_statistics()
+        return await run_blocking(logger.get_test_statistics)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/verify-logs")
-async def api_verify_logs():
+async def api_verify_logs(logger: TestResultLogger = Depends(get_test_logger)):
     """Verify integrity of encrypted log files"""
     try:
-        from backend.test_logger import TestResultLogger
-        logger = TestResultLogger()
-        return logger.verify_integrity()
+        return await run_blocking(logger.verify_integrity)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/export-logs")
-async def api_export_logs(output_file: str, password: str = None):
+async def api_export_logs(output_file: str, password: str = None, logger: TestResultLogger = Depends(get_test_logger)):
     """Export encrypted logs to a new file"""
     try:
-        from backend.test_logger import TestResultLogger
-        logger = TestResultLogger()
         success = logger.export_logs(output_file, password)
         return {"success": success, "output_file": output_file}
     except Exception as e:
@@ -390,20 +492,24 @@ async def api_export_logs(output_file: str, password: str = None):
 
 # Enhanced benchmark endpoints that return history
 @app.get("/api/benchmark-history/{benchmark_type}")
-async def api_benchmark_history(benchmark_type: str, limit: int = 10):
+async def api_benchmark_history(benchmark_type: str, response: Response, limit: int = 10, cursor: str = None,
+                                logger: TestResultLogger = Depends(get_test_logger)):
     """Get specific benchmark history"""
     try:
-        from backend.benchmark import get_benchmark_history
-        return get_benchmark_history(benchmark_type, limit)
+        page = await run_blocking(logger.query_history, f"benchmark_{benchmark_type}", limit, cursor)
+        set_next_cursor(response, page)
+        return page['results']
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/speedtest-history")
-async def api_speedtest_history(limit: int = 10):
+async def api_speedtest_history(response: Response, limit: int = 10, cursor: str = None,
+                                logger: TestResultLogger = Depends(get_test_logger)):
     """Get speedtest history"""
     try:
-        from backend.speedtest import get_speedtest_history
-        return get_speedtest_history(limit)
+        page = await run_blocking(logger.query_history, "speedtest", limit, cursor)
+        set_next_cursor(response, page)
+        return page['results']
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -412,10 +518,10 @@ async def api_create_backup():
     """Create a backup of the current log file"""
     try:
         backup_manager = LogBackupManager()
-        backup_path = backup_manager.create_backup()
+        backup_name = await run_blocking(backup_manager.create_backup)
         return {
             "success": True,
-            "backup_path": backup_path,
+            "backup_name": backup_name,
             "created_at": datetime.now().isoformat()
         }
     except Exception as e:
@@ -436,7 +542,7 @@ async def api_restore_backup(backup_filename: str):
     """Restore a log backup"""
     try:
         backup_manager = LogBackupManager()
-        success = backup_manager.restore_backup(backup_filename)
+        success = await run_blocking(backup_manager.restore_backup, backup_filename)
         return {
             "success": success,
             "restored_from": backup_filename,
@@ -449,7 +555,7 @@ async def api_restore_backup(backup_filename: str):
 async def api_cleanup_logs(days_to_keep: int = 30):
     """Clean up old log entries"""
     try:
-        result = cleanup_old_logs(days_to_keep)
+        result = await run_blocking(cleanup_old_logs, days_to_keep)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -469,56 +575,47 @@ async def api_log_config():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/test-history")
-async def api_test_history(test_type: str = None, limit: int = 10):
+async def api_test_history(test_type: str = None, limit: int = 10, logger: TestResultLogger = Depends(get_test_logger)):
     """Get test history with optional filtering"""
     try:
-        logger = TestResultLogger()
-        
         if test_type and test_type.startswith('benchmark_'):
             benchmark_type = test_type.replace('benchmark_', '')
             results = logger.get_benchmark_history(benchmark_type, limit)
         elif test_type == 'speedtest':
             results = logger.get_speedtest_history(limit)
         else:
-            # Get all results
-            all_results = logger.secure_logger.get_test_results()
-            if test_type:
-                all_results = [r for r in all_results if r.get('test_type') == test_type]
-            results = all_results[-limit:] if len(all_results) > limit else all_results
+            results = logger.secure_logger.get_test_results(test_type, limit)
             
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/test-statistics")
-async def api_test_statistics():
+async def api_test_statistics(logger: TestResultLogger = Depends(get_test_logger)):
     """Get comprehensive test statistics"""
     try:
-        logger = TestResultLogger()
-        stats = logger.get_test_statistics()
+        stats = await run_blocking(logger.get_test_statistics)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/verify-logs")
-async def api_verify_logs():
+async def api_verify_logs(logger: TestResultLogger = Depends(get_test_logger)):
     """Verify log file integrity"""
     try:
-        logger = TestResultLogger()
-        integrity = logger.verify_integrity()
+        integrity = await run_blocking(logger.verify_integrity)
         return integrity
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/speedtest")
-async def api_speedtest_with_logging():
+async def api_speedtest_with_logging(logger: TestResultLogger = Depends(get_test_logger)):
     """Run speed test and log results"""
     try:
         # Run speed test
-        results = get_speedtest_results()
+        results = await run_heavy_job('speedtest')
         
         # Log results
-        logger = TestResultLogger()
         logger.log_speedtest_result(results)
         
         return results
@@ -526,15 +623,13 @@ async def api_speedtest_with_logging():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/benchmark/full")
-async def api_full_benchmark_with_logging():
+async def api_full_benchmark_with_logging(logger: TestResultLogger = Depends(get_test_logger)):
     """Run full benchmark suite and log results"""
     try:
         # Run full benchmark
-        results = run_full_benchmark()
+        results = await run_heavy_job('benchmark')
         
         # Log individual benchmark results
-        logger = TestResultLogger()
-        
         # Log each benchmark type separately
         benchmark_mapping = {
             'cpu_single_thread_sec': 'cpu_single',
@@ -558,46 +653,14 @@ async def api_full_benchmark_with_logging():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Update the startup event to include more initialization
-@app.on_event("startup")
-async def startup_event():
-    """Initialize all systems when the application starts"""
-    try:
-        # Initialize logging system
-        from backend.init_logging import initialize_logging
-        initialize_logging()
-        print("✅ Secure logging system initialized")
-        
-        # Create initial backup if enabled
-        from backend.logging_config import LoggingConfig
-        if LoggingConfig.should_backup():
-            try:
-                from backend.log_backup import LogBackupManager
-                backup_manager = LogBackupManager()
-                backup_path = backup_manager.create_backup()
-                print(f"✅ Initial backup created: {backup_path}")
-            except Exception as e:
-                print(f"⚠️ Could not create initial backup: {e}")
-        
-        # Log application startup
-        logger = TestResultLogger()
-        startup_info = {
-            'event': 'application_startup',
-            'timestamp': datetime.now().isoformat(),
-            'backend_available': BACKEND_AVAILABLE
-        }
-        logger.log_benchmark_result('system_event', startup_info)
-        print("✅ Application startup logged")
-                
-    except Exception as e:
-        print(f"❌ Error during startup: {e}")
-
 # Add graceful shutdown logging
 @app.on_event("shutdown")
 async def shutdown_event():
     """Log application shutdown"""
+    # Let a running backup or log write finish before logging the shutdown
+    get_startup_tasks().wait(STARTUP_SHUTDOWN_TIMEOUT)
     try:
-        logger = TestResultLogger()
+        logger = get_logger()
         shutdown_info = {
             'event': 'application_shutdown',
             'timestamp': datetime.now().isoformat()
@@ -606,6 +669,14 @@ async def shutdown_event():
         print("✅ Application shutdown logged")
     except Exception as e:
         print(f"⚠️ Error logging shutdown: {e}")
+    
+    shutdown_executors()
+    # The kernel pool only exists if a benchmark imported it
+    if 'backend.cpu_kernels' in sys.modules:
+        sys.modules['backend.cpu_kernels'].shutdown_kernel_pool()
+    if 'backend.metrics_exporter' in sys.modules:
+        sys.modules['backend.metrics_exporter'].stop_metrics_exporter()
+    stop_metrics_history()
 
 # Run the Application
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the benchmark kernels
+"""
+
+import sys
+import os
+import pickle
+import tempfile
+import psutil
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend import benchmark
+from backend import disk_bench
+from backend import cpu_kernels
+
+def test_cpu_kernels():
+    """Test the CPU kernel suite and its scoring"""
+    print("🧮 Testing CPU kernels...")
+    
+    kernels = cpu_kernels.run_kernels(warmup=1, repeats=3)
+    assert set(kernels) == set(cpu_kernels.KERNELS)
+    for name, result in kernels.items():
+        assert result['min_rate'] <= result['median_rate'] <= result['max_rate']
+        assert result['score'] > 0, f"{name} should have a positive score"
+    scores = {name: result['score'] for name, result in kernels.items()}
+    print(f"  ✅ Kernel scores: {scores}")
+    
+    # Equal kernel scores give the same composite, and workers must pickle
+    assert cpu_kernels.composite_score([500, 500, 500]) == 500
+    assert pickle.loads(pickle.dumps(cpu_kernels.run_kernels)) is cpu_kernels.run_kernels
+    
+    duration, results = benchmark.measure_cpu_single(warmup=1, repeats=3)
+    assert duration > 0 and results['score'] > 0
+    print(f"  ✅ Single-thread score {results['score']}")
+
+    # The logged stage runs the kernels in the process pool, off this GIL
+    submitted = []
+    logged = []
+    class FakeLogger:
+        def log_benchmark_result(self, benchmark_type, results):
+            logged.append((benchmark_type, results))
+    real_pool, real_logger = benchmark.get_process_pool, benchmark.get_logger
+    def recording_pool():
+        pool = real_pool()
+        submitted.append(pool)
+        return pool
+    benchmark.get_process_pool, benchmark.get_logger = recording_pool, FakeLogger
+    try:
+        duration = benchmark.cpu_single_thread()
+    finally:
+        benchmark.get_process_pool, benchmark.get_logger = real_pool, real_logger
+    assert submitted and duration > 0
+    assert [benchmark_type for benchmark_type, _ in logged] == ['cpu_single']
+    print("  ✅ Single-thread stage runs in the process pool")
+
+    return True
+
+def test_kernel_pool():
+    """Test that the multi-core kernel pool is reused and pinned"""
+    print("📌 Testing persistent kernel pool...")
+    
+    pool = cpu_kernels.KernelPool()
+    try:
+        per_core, compute, startup = pool.run(['hash'], 1, 2)
+        assert startup > 0, "First run should pay the start-up cost"
+        assert len(per_core) == pool.workers, "Every worker should take exactly one task"
+        cores = [core['core'] for core in per_core if core['core'] is not None]
+        assert len(cores) == len(set(cores)), f"Workers should be pinned to distinct cores: {cores}"
+        print(f"  ✅ {pool.workers} workers started in {startup:.3f}s, pinned to {cores}")
+        
+        limits = {core['blas_thread_limit'] for core in per_core}
+        assert limits <= {'threadpoolctl', 'environment'}, f"Workers should run one BLAS thread: {limits}"
+        print(f"  ✅ BLAS limited to one thread per worker via {limits.pop()}")
+        
+        _, compute, startup = pool.run(['hash'], 1, 2)
+        assert startup == 0, "Second run should reuse the running pool"
+        assert compute > 0
+        print(f"  ✅ Reused pool computed in {compute:.3f}s")
+        
+        return True
+        
+    finally:
+        pool.close()
+
+def test_ram_bandwidth():
+    """Test the RAM bandwidth benchmark on a small buffer"""
+    print("🧠 Testing RAM bandwidth benchmark...")
+    
+    results = benchmark.measure_ram_bandwidth(buffer_bytes=24 * 1024 ** 2, passes=3, warmup=1)
+    
+    for kernel in ('read', 'write', 'copy', 'triad'):
+        summary = results[kernel]
+        assert summary['median_mbps'] > 0, f"{kernel} bandwidth should be positive"
+        assert summary['min_mbps'] <= summary['median_mbps'] <= summary['max_mbps']
+        assert summary['stdev_mbps'] >= 0
+    assert results['speed_mbps'] == results['copy']['median_mbps']
+    assert results['test_size_mb'] == 8
+    print(f"  ✅ Copy bandwidth {results['speed_mbps']} MB/s")
+    
+    # The default buffer is bounded by available memory
+    buffer_bytes = benchmark._ram_array_size() * 3 * 8
+    available = psutil.virtual_memory().available
+    assert buffer_bytes <= max(benchmark.RAM_BUFFER_MIN_BYTES, available * benchmark.RAM_BUFFER_FRACTION)
+    assert buffer_bytes <= benchmark.RAM_BUFFER_MAX_BYTES
+    print(f"  ✅ Default buffer of {buffer_bytes // 1024 ** 2} MB fits the memory budget")
+    
+    return True
+
+def test_disk_engine():
+    """Test the disk benchmark engine on a small file"""
+    print("💽 Testing disk benchmark engine...")
+    
+    configurations = disk_bench.build_configurations([4096], [1, 4], ['rand'], ['write', 'read'])
+    assert len(configurations) == 4
+    
+    report = disk_bench.run_disk_benchmark(mode='fsync', file_size=4 * disk_bench.MB,
+                                           configurations=configurations, duration=0.2)
+    assert report['mode'] == 'fsync'
+    assert report['target'] == tempfile.gettempdir()
+    for result in report['results']:
+        assert result['operations'] > 0 and result['iops'] > 0
+        latency = result['latency_ms']
+        assert latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max']
+        assert result['cached'] == (result['operation'] == 'read' and not disk_bench.CAN_DROP_CACHE)
+    print(f"  ✅ {len(report['results'])} configurations measured")
+    
+    # Direct I/O falls back to fsync where the filesystem rejects it
+    report = disk_bench.run_disk_benchmark(mode='direct', file_size=4 * disk_bench.MB,
+                                           configurations=[('seq', 'read', disk_bench.MB, 2)], duration=0.2)
+    assert report['mode'] in disk_bench.MODES
+    print(f"  ✅ Sequential read ran in {report['mode']} mode")
+    
+    for bad_call in (lambda: disk_bench.build_configurations([1000]),
+                     lambda: disk_bench.resolve_target('/not/a/mountpoint')):
+        try:
+            bad_call()
+            return False
+        except ValueError:
+            pass
+    print("  ✅ Invalid block sizes and mountpoints rejected")
+    
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Benchmark Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_cpu_kernels,
+        test_kernel_pool,
+        test_ram_bandwidth,
+        test_disk_engine
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
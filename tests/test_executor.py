@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the blocking work executors
+"""
+
+import sys
+import os
+import math
+import time
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.executor import run_blocking, run_cpu_bound, shutdown_executors
+
+def test_event_loop_stays_responsive():
+    """Test that blocking work in the thread pool does not stall the event loop"""
+    print("🧵 Testing thread pool offloading...")
+    
+    async def scenario():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        task = asyncio.create_task(ticker())
+        await run_blocking(time.sleep, 0.5)
+        task.cancel()
+        return ticks
+    
+    ticks = asyncio.run(scenario())
+    assert ticks >= 10, f"Event loop was blocked, only {ticks} ticks"
+    print(f"  ✅ Event loop ticked {ticks} times during blocking call")
+    
+    return True
+
+def test_process_pool():
+    """Test that CPU-bound work runs in the process pool"""
+    print("⚙️ Testing process pool offloading...")
+    
+    try:
+        result = asyncio.run(run_cpu_bound(math.factorial, 20))
+        assert result == math.factorial(20)
+        
+        worker_pid = asyncio.run(run_cpu_bound(os.getpid))
+        assert worker_pid != os.getpid(), "Work should run in a separate process"
+        print(f"  ✅ Work ran in worker process {worker_pid}")
+        
+        return True
+        
+    finally:
+        shutdown_executors(wait=True)
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Executor Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_event_loop_stays_responsive,
+        test_process_pool
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend import jobs
+from backend.jobs import JobManager, wait_for_job
+from backend.executor import get_thread_pool
+
+def _register_fake_job(release: threading.Event):
+    """Register a quick job type that reports two stages"""
+    def run_fake(progress_callback):
+        progress_callback('first', 'running', None)
+        progress_callback('first', 'completed', 1)
+        progress_callback('second', 'running', None)
+        release.wait(5)
+        progress_callback('second', 'completed', 2)
+        return {'first': 1, 'second': 2}
+    
+    jobs.JOB_TYPES['fake'] = (['first', 'second'], run_fake)
+
+def test_job_progress_and_queueing():
+    """Test that jobs report stage progress and run one at a time"""
+    print("📋 Testing job progress and queueing...")
+    
+    release = threading.Event()
+    _register_fake_job(release)
+    lock_file = os.path.join(tempfile.mkdtemp(), 'jobs.lock')
+    
+    try:
+        manager = JobManager(lock_file)
+        first = manager.submit('fake')
+        second = manager.submit('fake')
+        
+        # Wait until the first job is blocked in its second stage
+        deadline = time.time() + 5
+        while first.stages['second']['status'] != 'running' and time.time() < deadline:
+            time.sleep(0.01)
+        
+        state = manager.describe(first)
+        assert state['status'] == 'running', f"First job should be running: {state}"
+        assert state['partial_results'] == {'first': 1}, "Finished stage should be reported"
+        assert state['progress']['completed_stages'] == 1
+        print("  ✅ Partial results reported while running")
+        
+        queued = manager.describe(second)
+        assert queued['status'] == 'queued' and queued['queue_position'] == 1
+        print("  ✅ Second job waits in the queue")
+        
+        release.set()
+        assert second.wait(5), "Second job should finish"
+        assert first.status == 'completed' and second.status == 'completed'
+        assert manager.describe(second)['result'] == {'first': 1, 'second': 2}
+        print("  ✅ Both jobs completed in order")
+        
+        try:
+            manager.submit('unknown')
+            assert False, "Unknown job types should be rejected"
+        except ValueError:
+            print("  ✅ Unknown job type rejected")
+        
+        return True
+        
+    finally:
+        release.set()
+        jobs.JOB_TYPES.pop('fake', None)
+
+def test_waiting_without_pool_threads():
+    """Test that many waiting requests don't hold executor threads"""
+    print("⏳ Testing job waits on the event loop...")
+    
+    release = threading.Event()
+    _register_fake_job(release)
+    lock_file = os.path.join(tempfile.mkdtemp(), 'jobs.lock')
+    
+    try:
+        manager = JobManager(lock_file)
+        waiters = get_thread_pool()._max_workers * 2
+        
+        async def scenario():
+            jobs_waited = [manager.submit('fake') for _ in range(waiters)]
+            tasks = [asyncio.ensure_future(wait_for_job(job)) for job in jobs_waited]
+            await asyncio.sleep(0.1)
+            # The I/O pool still serves other work while every job waits
+            loop = asyncio.get_running_loop()
+            assert await asyncio.wait_for(loop.run_in_executor(get_thread_pool(), lambda: 42), 2) == 42
+            release.set()
+            await asyncio.wait_for(asyncio.gather(*tasks), 10)
+            return jobs_waited
+        
+        finished = asyncio.run(scenario())
+        assert all(job.status == 'completed' for job in finished)
+        print(f"  ✅ {waiters} waiting jobs, executor still free")
+        
+        # Single benchmark and speedtest stages are queued jobs too
+        assert 'benchmark_disk' in jobs.JOB_TYPES and 'benchmark_cpu_single' in jobs.JOB_TYPES
+        assert 'speedtest_ping' in jobs.JOB_TYPES and 'speedtest_upload' in jobs.JOB_TYPES
+        
+        # A host lock that can't be taken fails the job instead of the worker
+        if jobs.fcntl is not None:
+            broken = JobManager(os.path.join(lock_file + '.missing', 'jobs.lock'))
+            failed = broken.submit('fake')
+            assert failed.wait(5), "Job should finish when the host lock fails"
+            assert failed.status == 'failed' and isinstance(failed.exception, OSError)
+            assert broken.describe(failed)['queue_position'] is None
+            second = broken.submit('fake')
+            assert second.wait(5) and second.status == 'failed', "Worker should keep serving the queue"
+            print("  ✅ Host lock failures fail the job, the worker keeps running")
+        
+        return True
+        
+    finally:
+        release.set()
+        jobs.JOB_TYPES.pop('fake', None)
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Job Queue Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_job_progress_and_queueing,
+        test_waiting_without_pool_threads
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the live metrics stream
+"""
+
+import sys
+import os
+import asyncio
+import itertools
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.live_metrics import MetricsBroadcaster, compute_delta, collect_dynamic_metrics
+
+def test_compute_delta():
+    """Test that deltas only contain changed values"""
+    print("🔀 Testing metric deltas...")
+    
+    previous = {'cpu': {'percent': 10.0, 'per_core': [10.0, 10.0]}, 'net': {'eth0': {'bytes_recv': 1}, 'veth1': {}}}
+    current = {'cpu': {'percent': 10.0, 'per_core': [12.0, 10.0]}, 'net': {'eth0': {'bytes_recv': 5}}}
+    
+    delta = compute_delta(previous, current)
+    assert delta == {'cpu': {'per_core': [12.0, 10.0]}, 'net': {'eth0': {'bytes_recv': 5}, 'veth1': None}}, delta
+    assert compute_delta(current, current) == {}, "Unchanged snapshots should produce empty deltas"
+    print("  ✅ Only changed and removed keys reported")
+    
+    snapshot = collect_dynamic_metrics()
+    assert {'cpu', 'ram', 'disk_io', 'net'} <= set(snapshot)
+    print("  ✅ Collected live metrics snapshot")
+    
+    return True
+
+def test_shared_broadcaster():
+    """Test that all clients share one collector and get snapshot then deltas"""
+    print("📡 Testing shared metrics broadcaster...")
+    
+    counter = itertools.count()
+    calls = []
+    threads = []
+    
+    def collector():
+        value = next(counter)
+        calls.append(value)
+        threads.append(threading.current_thread())
+        return {'ram': {'used': value}, 'static': 'unchanged'}
+    
+    broadcaster = MetricsBroadcaster(interval=0.05, collector=collector)
+    
+    async def read_client(count):
+        messages = []
+        async for message in broadcaster.subscribe():
+            messages.append(message)
+            if len(messages) == count:
+                break
+        return messages
+    
+    async def scenario():
+        return await asyncio.gather(read_client(4), read_client(4))
+    
+    first, second = asyncio.run(scenario())
+    
+    for messages in (first, second):
+        assert messages[0]['type'] == 'snapshot'
+        assert 'static' in messages[0]['data']
+        for message in messages[1:]:
+            if message['type'] == 'delta':
+                assert set(message['data']) == {'ram'}, "Deltas should skip unchanged values"
+    print("  ✅ Clients received a snapshot followed by deltas")
+    
+    # Two clients reading four messages each must not double the collection work
+    assert len(calls) <= 6, f"Collector ran {len(calls)} times for two clients"
+    print(f"  ✅ Collector ran {len(calls)} times for both clients")
+    
+    assert threading.main_thread() not in threads, "Collection must not run on the event loop"
+    print("  ✅ First snapshot collected off the event loop")
+    
+    assert broadcaster.subscriber_count == 0, "Clients should unsubscribe when done"
+    
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Live Metrics Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_compute_delta,
+        test_shared_broadcaster
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the OpenMetrics exporter
+"""
+
+import sys
+import os
+import re
+import time
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.metrics_exporter import MetricFamilies, MetricsExporter
+from backend.test_logger import TestResultLogger
+
+SAMPLE_LINE = re.compile(r'^([a-z_]+)(\{[^}]*\})? (-?[0-9.e+]+|NaN|[+-]Inf)$')
+
+def parse_openmetrics(text: str) -> dict:
+    """Check the exposition format and return {sample name + labels: value}"""
+    lines = text.rstrip('\n').split('\n')
+    assert lines[-1] == '# EOF', "Exposition must end with # EOF"
+    families = {}
+    samples = {}
+    for line in lines[:-1]:
+        if line.startswith('# TYPE '):
+            _, _, name, metric_type = line.split(' ', 3)
+            assert name not in families, f"Family {name} declared twice"
+            families[name] = metric_type
+            continue
+        if line.startswith('# HELP '):
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f"Malformed sample line: {line}"
+        name = match.group(1)
+        family = name[:-6] if name.endswith('_total') else name[:-5] if name.endswith('_info') else name
+        assert family in families, f"Sample {name} has no TYPE"
+        if families[family] == 'counter':
+            assert name.endswith('_total'), f"Counter sample {name} must end with _total"
+        samples[name + (match.group(2) or '')] = float(match.group(3))
+    return samples
+
+def test_render_format():
+    """Test OpenMetrics rendering, suffixes and label escaping"""
+    print("📝 Testing OpenMetrics rendering...")
+    
+    families = MetricFamilies()
+    families.add('sysdash_disk_read_bytes', 'counter', 'Bytes read', 1024, {'device': 'sda'})
+    families.add('sysdash_filesystem_used_bytes', 'gauge', 'Used', 10, {'mountpoint': 'C:\\ "data"'})
+    families.add('sysdash_network_up', 'gauge', 'Up', True, {'interface': 'eth0'})
+    families.add('sysdash_skipped', 'gauge', 'No value', None)
+    for label, value in (('nan', float('nan')), ('pos', float('inf')), ('neg', float('-inf'))):
+        families.add('sysdash_test_score', 'gauge', 'Score', value, {'field': label})
+    text = families.render()
+    
+    samples = parse_openmetrics(text)
+    assert samples['sysdash_disk_read_bytes_total{device="sda"}'] == 1024
+    assert samples['sysdash_network_up{interface="eth0"}'] == 1
+    assert 'sysdash_test_score{field="nan"} NaN\n' in text
+    assert 'sysdash_test_score{field="pos"} +Inf\n' in text
+    assert 'sysdash_test_score{field="neg"} -Inf\n' in text
+    assert 'mountpoint="C:\\\\ \\"data\\""' in text, "Label values must be escaped"
+    assert 'sysdash_skipped' not in text, "Families without samples are left out"
+    print("  ✅ Counters, booleans and escaped labels rendered")
+    
+    return True
+
+def test_exporter_snapshot():
+    """Test that scrapes serve a pre-collected snapshot with test scores"""
+    print("📈 Testing exporter snapshot...")
+    
+    log_dir = tempfile.mkdtemp()
+    try:
+        logger = TestResultLogger(os.path.join(log_dir, 'test.enc'))
+        logger.log_benchmark_result('cpu_single', {'score': 1234.5, 'duration_seconds': 1.2})
+        logger.log_benchmark_result('system_event', {'event': 'application_startup'})
+        logger.log_speedtest_result({'ping_ms': 12.5, 'download_speed_mbps': 250.0, 'upload_speed_mbps': -1})
+        
+        queries = []
+        query_history = logger.query_history
+        logger.query_history = lambda *args, **kwargs: queries.append(args) or query_history(*args, **kwargs)
+        
+        exporter = MetricsExporter(interval=60, test_logger=logger)
+        assert exporter.latest() is None
+        start = time.time()
+        exporter.collect()
+        duration = time.time() - start
+        samples = parse_openmetrics(exporter.latest())
+        
+        assert samples['sysdash_test_score{test_type="benchmark_cpu_single",field="score"}'] == 1234.5
+        assert samples['sysdash_test_score{test_type="speedtest",field="download_speed_mbps"}'] == 250.0
+        assert not any('upload_speed_mbps' in key for key in samples), "Error sentinels are not exported"
+        assert not any('system_event' in key for key in samples), "System events are not scores"
+        assert 'sysdash_memory_total_bytes' in samples and 'sysdash_cpu_usage_percent' in samples
+        assert any(key.startswith('sysdash_network_receive_bytes_total{') for key in samples)
+        print(f"  ✅ Collected {len(samples)} series in {duration * 1000:.0f} ms")
+        
+        # Scores are only re-read when the log changes
+        exporter.collect()
+        assert len(queries) == 2, f"Unchanged log should not be queried again: {len(queries)}"
+        logger.log_benchmark_result('cpu_single', {'score': 2000.0})
+        exporter.collect()
+        samples = parse_openmetrics(exporter.latest())
+        assert samples['sysdash_test_score{test_type="benchmark_cpu_single",field="score"}'] == 2000.0
+        print("  ✅ Scores refreshed only after the log changed")
+        
+        # A scrape only returns the rendered text
+        start = time.time()
+        for _ in range(1000):
+            exporter.latest()
+        assert time.time() - start < 0.1, "Scrapes must not collect"
+        print("  ✅ 1000 scrapes served from the snapshot")
+        
+        return True
+        
+    finally:
+        shutil.rmtree(log_dir)
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Metrics Exporter Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_render_format,
+        test_exporter_snapshot
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the metrics history store
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.metrics_history import MetricsHistory, parse_range
+
+def test_rollups():
+    """Test that samples roll up into fixed-size 1s/1m/1h rings"""
+    print("🗃️ Testing metric rollups...")
+    
+    history = MetricsHistory()
+    start = time.time() - 7200
+    start -= start % 3600
+    for second in range(7200):
+        history.record({'cpu.percent': second % 60}, start + second)
+    
+    rings = history._series['cpu.percent']
+    assert rings[0]._count == 3600, "1s ring should keep one hour"
+    assert len(rings[0]._times) == 3600, "Ring arrays must not grow"
+    assert rings[1]._count == 119, f"Every completed minute should be rolled up: {rings[1]._count}"
+    assert all(value == 29.5 for _, value in rings[1].points()), "Minute points should be averages"
+    assert rings[2]._count == 1, "The first hour should be rolled up"
+    print("  ✅ 1s, 1m and 1h rollups with fixed capacity")
+    
+    result = history.query('cpu.percent', parse_range('10m'))
+    assert result['resolution'] == '1s'
+    assert result['points'] == sorted(result['points']), "Points should be oldest first"
+    assert history.query('cpu.percent', parse_range('6h'))['resolution'] == '1m'
+    assert history.query('cpu.percent', parse_range('7d'))['resolution'] == '1h'
+    print("  ✅ Queries use the finest resolution covering the range")
+    
+    for bad_range in ('0', '5y', 'soon'):
+        try:
+            parse_range(bad_range)
+            return False
+        except ValueError:
+            pass
+    try:
+        history.query('missing', 60)
+        return False
+    except KeyError:
+        pass
+    print("  ✅ Invalid ranges and unknown metrics rejected")
+    
+    return True
+
+def test_collector_rates():
+    """Test that counters are recorded as per-second rates"""
+    print("📈 Testing metrics collector...")
+    
+    counter = {'bytes': 0}
+    def fake_collector():
+        counter['bytes'] += 1000
+        return {
+            'cpu': {'percent': 50.0, 'per_core': [40.0, 60.0]},
+            'ram': {'used': 1024, 'percent': 10.0, 'swap_used': 0},
+            'disk_io': {'read_bytes': counter['bytes'], 'write_bytes': 0},
+            'net': {'lo': {'bytes_sent': counter['bytes'], 'bytes_recv': counter['bytes']}}
+        }
+    
+    history = MetricsHistory(interval=0.05, collector=fake_collector)
+    history.start()
+    time.sleep(0.5)
+    history.stop()
+    
+    metrics = history.metrics()
+    assert {'cpu.percent', 'cpu.core0', 'cpu.core1', 'ram.used', 'disk.read_bytes_per_sec',
+            'net.bytes_recv_per_sec'} <= set(metrics), metrics
+    rate = history._series['disk.read_bytes_per_sec'][0]._sum
+    assert rate > 0, "Disk counter should be recorded as a rate"
+    print(f"  ✅ Collected {len(metrics)} metrics")
+    
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Metrics History Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_rollups,
+        test_collector_rates
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the process table sampler
+"""
+
+import sys
+import os
+import time
+import subprocess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.process_sampler import ProcessSampler
+
+BUSY_CHILD = "import time\nend = time.time() + 30\nwhile time.time() < end: pass"
+FD_CHILD = "import sys, time\nfiles = [open(sys.executable, 'rb') for _ in range(500)]\ntime.sleep(30)"
+
+def test_top_processes():
+    """Test top-N by CPU and open file descriptors with reused Process objects"""
+    print("📋 Testing top processes...")
+
+    busy = subprocess.Popen([sys.executable, '-c', BUSY_CHILD])
+    fds = subprocess.Popen([sys.executable, '-c', FD_CHILD])
+    try:
+        sampler = ProcessSampler(interval=0.5)
+        time.sleep(0.5)
+        sampler._take_sample()
+        tracked = sampler._tracked[busy.pid].process
+        time.sleep(0.5)
+        sampler._take_sample()
+        assert sampler._tracked[busy.pid].process is tracked, "Process objects should be reused between ticks"
+
+        top_cpu = sampler.top('cpu', 5)
+        assert top_cpu['process_count'] > 2
+        assert busy.pid in [p['pid'] for p in top_cpu['processes']], "Busy child should be among the top CPU users"
+        busy_row = next(p for p in top_cpu['processes'] if p['pid'] == busy.pid)
+        assert busy_row['cpu_percent'] > 20, f"Busy child should use a core: {busy_row['cpu_percent']}"
+        print(f"  ✅ Busy child at {busy_row['cpu_percent']}% CPU among {top_cpu['process_count']} processes")
+
+        top_fds = sampler.top('fds', 3)
+        assert top_fds['processes'][0]['pid'] == fds.pid, "Child with 500 open files should lead by fds"
+        print(f"  ✅ {top_fds['processes'][0]['num_fds']} open fds on top")
+
+        assert len(sampler.top('rss', 2)['processes']) == 2
+        assert all('read_bytes_per_sec' in p for p in sampler.top('io', 3)['processes'])
+        try:
+            sampler.top('name')
+            assert False, "Unknown sort should raise"
+        except ValueError:
+            pass
+
+        # Exited processes are dropped on the next tick
+        busy.kill()
+        busy.wait()
+        sampler._take_sample()
+        assert busy.pid not in sampler._tracked
+        assert busy.pid not in [p['pid'] for p in sampler.top('cpu', 1000)['processes']]
+        print("  ✅ Exited process dropped from the table")
+
+        return True
+
+    finally:
+        for child in (busy, fds):
+            child.kill()
+            child.wait()
+
+def test_sampler_thread():
+    """Test that the sampler thread keeps the snapshot fresh"""
+    print("🔁 Testing sampler thread...")
+
+    sampler = ProcessSampler(interval=0.2)
+    sampler.start()
+    try:
+        first = sampler.top()['timestamp']
+        time.sleep(0.7)
+        result = sampler.top()
+        assert result['timestamp'] > first, "Snapshot should be refreshed in the background"
+        assert result['sample_duration_seconds'] < 0.2 * 5, "A tick should be cheap on a test host"
+        print(f"  ✅ Tick took {result['sample_duration_seconds'] * 1000:.1f} ms for {result['process_count']} processes")
+    finally:
+        sampler.stop()
+
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Process Sampler Tests")
+    print("=" * 50)
+
+    tests = [
+        test_top_processes,
+        test_sampler_thread
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
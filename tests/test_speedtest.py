@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test script for the speedtest engine against a local stand-in server
+"""
+
+import sys
+import os
+import json
+import shutil
+import time
+import tempfile
+import tracemalloc
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend import speedtest
+from backend.speedtest_config import SpeedtestConfig
+
+DOWNLOAD_BYTES = 32 * 1024 * 1024
+
+class SpeedtestHandler(BaseHTTPRequestHandler):
+    """Minimal speedtest server: ping, download and (chunked) upload"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    payload = b'\0' * (1024 * 1024)
+    delay = 0
+    connections = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        type(self).connections += 1
+        try:
+            super().handle()
+        except ConnectionResetError:
+            # Streams are cut off mid-transfer when the test stops
+            pass
+
+    def do_GET(self):
+        if self.path.endswith('/ping'):
+            time.sleep(self.delay)
+            self.send_response(200)
+            self.send_header('Content-Length', '4')
+            self.end_headers()
+            self.wfile.write(b'pong')
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(DOWNLOAD_BYTES))
+        self.end_headers()
+        try:
+            for _ in range(DOWNLOAD_BYTES // len(self.payload)):
+                self.wfile.write(self.payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self):
+        received = 0
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                received += len(self.rfile.read(size))
+                self.rfile.readline()
+        else:
+            length = int(self.headers.get('Content-Length', 0))
+            while received < length:
+                received += len(self.rfile.read(min(1024 * 1024, length - received)))
+        body = str(received).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_server(delay: float = 0):
+    handler = type('DelayedHandler', (SpeedtestHandler,), {'delay': delay, 'connections': 0})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/speedtest"
+
+def test_multi_stream_download():
+    """Test the multi-stream download against the local server"""
+    print("⬇️ Testing multi-stream download...")
+    
+    server, base_url = start_server()
+    try:
+        result = speedtest.measure_download_streams(f"{base_url}/download", max_streams=3, duration=0.6,
+                                                    slow_start=0.3, ramp_interval=0.2)
+        assert result['speed_mbps'] > 0, "Download should move data"
+        assert 1 <= result['streams'] <= 3
+        assert len(result['per_stream_mbps']) == result['streams']
+        assert result['skipped_seconds'] >= 0.3, "Slow start should not be measured"
+        assert result['measured_bytes'] < result['total_bytes']
+        assert result['timeline_mbps'], "Throughput over time should be reported"
+        print(f"  ✅ {result['speed_mbps']} Mbps over {result['streams']} streams")
+        
+        return True
+        
+    finally:
+        server.shutdown()
+
+def test_multi_stream_upload():
+    """Test the multi-stream upload against the local server"""
+    print("⬆️ Testing multi-stream upload...")
+    
+    server, base_url = start_server()
+    try:
+        result = speedtest.measure_upload_streams(f"{base_url}/upload", max_streams=2, duration=0.6,
+                                                  slow_start=0.3, ramp_interval=0.2)
+        assert result['speed_mbps'] > 0, "Upload should move data"
+        assert not result['errors'], f"Upload streams failed: {result['errors']}"
+        print(f"  ✅ {result['speed_mbps']} Mbps over {result['streams']} streams")
+        
+        return True
+        
+    finally:
+        server.shutdown()
+
+def test_server_registry():
+    """Test loading the server registry from environment and config file"""
+    print("🗺️ Testing speedtest server registry...")
+    
+    saved = {key: os.environ.pop(key, None) for key in
+             ('SYSDASH_SPEEDTEST_CONFIG', 'SYSDASH_SPEEDTEST_SERVERS', 'SYSDASH_SPEEDTEST_SERVER')}
+    config_dir = tempfile.mkdtemp()
+    try:
+        assert [s['url'] for s in SpeedtestConfig.get_servers()] == SpeedtestConfig.DEFAULT_SERVERS
+        
+        os.environ['SYSDASH_SPEEDTEST_SERVERS'] = 'http://a.example:8080, http://b.example:8080/'
+        assert [s['url'] for s in SpeedtestConfig.get_servers()] == ['http://a.example:8080', 'http://b.example:8080']
+        print("  ✅ Servers from environment")
+        
+        config_file = os.path.join(config_dir, 'speedtest.json')
+        with open(config_file, 'w') as f:
+            json.dump({'servers': [{'name': 'local', 'url': 'http://127.0.0.1:9000'}]}, f)
+        os.environ['SYSDASH_SPEEDTEST_CONFIG'] = config_file
+        assert SpeedtestConfig.get_servers() == [{'name': 'local', 'url': 'http://127.0.0.1:9000'}]
+        print("  ✅ Servers from config file take precedence")
+        
+        return True
+        
+    finally:
+        for key, value in saved.items():
+            os.environ.pop(key, None)
+            if value is not None:
+                os.environ[key] = value
+        shutil.rmtree(config_dir)
+
+def test_latency_and_server_selection():
+    """Test latency sampling over one connection and lowest-latency selection"""
+    print("📡 Testing latency sampling and server selection...")
+    
+    fast, fast_url = start_server()
+    slow, slow_url = start_server(delay=0.05)
+    saved = os.environ.pop('SYSDASH_SPEEDTEST_CONFIG', None), os.environ.get('SYSDASH_SPEEDTEST_SERVERS')
+    try:
+        latency = speedtest.measure_latency(f"{fast_url}/ping", samples=5)
+        assert latency['samples'] == 5
+        assert latency['min_ms'] <= latency['median_ms'] <= latency['max_ms']
+        assert latency['jitter_ms'] >= 0
+        assert fast.RequestHandlerClass.connections == 1, "Samples should reuse one pooled connection"
+        print(f"  ✅ Latency {latency['median_ms']} ms (jitter {latency['jitter_ms']} ms) over one connection")
+        
+        base = lambda url: url[:-len('/speedtest')]
+        os.environ['SYSDASH_SPEEDTEST_SERVERS'] = f"{base(slow_url)},{base(fast_url)}"
+        selected = speedtest.select_server(force=True)
+        assert selected['url'] == base(fast_url), f"Fastest server should be chosen: {selected}"
+        assert speedtest.select_server()['url'] == selected['url']
+        print(f"  ✅ Selected {selected['url']}")
+        
+        return True
+        
+    finally:
+        fast.shutdown()
+        slow.shutdown()
+        if saved[0] is not None:
+            os.environ['SYSDASH_SPEEDTEST_CONFIG'] = saved[0]
+        if saved[1] is None:
+            os.environ.pop('SYSDASH_SPEEDTEST_SERVERS', None)
+        else:
+            os.environ['SYSDASH_SPEEDTEST_SERVERS'] = saved[1]
+        speedtest._selected_server = None
+
+def test_streaming_upload():
+    """Test size and time bounded streaming uploads"""
+    print("📤 Testing streaming upload...")
+    
+    server, base_url = start_server()
+    try:
+        speedtest._random_block()
+        tracemalloc.start()
+        result = speedtest.measure_upload(f"{base_url}/upload", size_mb=64)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert result['upload_bytes'] == 64 * 1024 * 1024
+        assert result['mode'] == 'size_bounded'
+        assert peak < 8 * 1024 * 1024, f"Upload should stream in constant memory, peaked at {peak} bytes"
+        print(f"  ✅ 64 MB uploaded at {result['speed_mbps']} Mbps, peak memory {peak // 1024} KB")
+        
+        result = speedtest.measure_upload(f"{base_url}/upload", duration=0.5, interval=0.1)
+        assert result['mode'] == 'time_bounded'
+        assert 0.4 <= result['duration_seconds'] <= 1.5
+        assert len(result['timeline_mbps']) >= 4, "Throughput over time should be reported"
+        print(f"  ✅ Time bounded upload sent {result['upload_size_mb']} MB in {result['duration_seconds']}s")
+        
+        # The clock starts when the body is first read, after connection setup
+        samples = []
+        created = time.perf_counter()
+        body = speedtest._upload_body(threading.Event(), samples, limit=1024)
+        time.sleep(0.2)
+        next(body)
+        assert samples[0][1] == 0 and samples[0][0] >= created + 0.2
+        print("  ✅ Upload timing starts with the first chunk")
+        
+        return True
+        
+    finally:
+        server.shutdown()
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Speedtest Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_server_registry,
+        test_latency_and_server_selection,
+        test_multi_stream_download,
+        test_multi_stream_upload,
+        test_streaming_upload
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
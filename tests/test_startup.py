@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for SysDash startup (lazy imports and background initialization)
+"""
+
+import sys
+import os
+import json
+import time
+import subprocess
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Importing main must stay well below this, fastapi alone takes ~0.4s
+STARTUP_BUDGET_SECONDS = 3.0
+
+HEAVY_MODULES = ['numpy', 'numba', 'requests', 'backend.benchmark', 'backend.speedtest', 'backend.cpu_kernels']
+
+def run_python(code: str) -> dict:
+    """Run code in a fresh interpreter from the repo root, return its JSON output"""
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_main_import():
+    """Test that importing main skips heavy subsystems and key derivation"""
+    print("🚀 Testing main import...")
+
+    start = time.perf_counter()
+    output = run_python(
+        "import sys, json, time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "from backend import test_logger\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start,\n"
+        "                  'loaded': [m for m in %r if m in sys.modules],\n"
+        "                  'loggers': len(test_logger._logger_registry)}))" % HEAVY_MODULES
+    )
+    wall = time.perf_counter() - start
+
+    assert output['loaded'] == [], f"Heavy modules imported at startup: {output['loaded']}"
+    assert output['loggers'] == 0, "No test logger (PBKDF2 key derivation) should be created on import"
+    assert output['seconds'] < STARTUP_BUDGET_SECONDS, f"Importing main took {output['seconds']:.2f}s"
+    print(f"  ✅ import main: {output['seconds']:.3f}s ({wall:.3f}s with interpreter)")
+
+    return True
+
+def test_lazy_modules():
+    """Test that backend exports and benchmark/speedtest modules load lazily"""
+    print("💤 Testing lazy modules...")
+
+    output = run_python(
+        "import sys, json\n"
+        "import backend\n"
+        "before = [m for m in %r if m in sys.modules]\n"
+        "resolved = callable(backend.ping_server)\n"
+        "import backend.benchmark\n"
+        "from backend import test_logger\n"
+        "print(json.dumps({'before': before, 'resolved': resolved,\n"
+        "                  'numba': 'numba' in sys.modules,\n"
+        "                  'loggers': len(test_logger._logger_registry)}))" % HEAVY_MODULES
+    )
+
+    assert output['before'] == [], f"Importing backend loaded: {output['before']}"
+    assert output['resolved'], "Lazy exports should resolve on access"
+    assert not output['numba'], "numba should only be imported when the GPU benchmark runs"
+    assert output['loggers'] == 0, "Benchmark and speedtest modules should create their logger on first use"
+    print("  ✅ Exports resolve on access, no logger or numba at import")
+
+    return True
+
+def test_background_tasks():
+    """Test that startup tasks run in the background and report readiness"""
+    print("⏳ Testing background startup tasks...")
+
+    from backend.startup import StartupTasks
+
+    release = threading.Event()
+    order = []
+
+    def slow_task():
+        release.wait(5)
+        order.append('slow')
+
+    def failing_task():
+        order.append('failing')
+        raise RuntimeError("backup disk full")
+
+    startup = StartupTasks()
+    startup.add('slow', slow_task)
+    startup.add('failing', failing_task)
+    startup.add('last', order.append, 'last')
+
+    start = time.perf_counter()
+    startup.start()
+    assert time.perf_counter() - start < 0.5, "start() must not wait for the tasks"
+    status = startup.to_dict()
+    assert not status['ready'] and not status['ok'], "Should not be ready while tasks run"
+    assert status['tasks']['slow']['status'] in ('pending', 'running'), status
+
+    release.set()
+    assert startup.wait(5), "Tasks should finish"
+    status = startup.to_dict()
+    assert order == ['slow', 'failing', 'last'], f"Tasks should run in order: {order}"
+    assert status['ready'] and not status['ok'], "A failed task makes startup not ok"
+    assert status['tasks']['failing']['error'] == 'backup disk full', status
+    assert status['tasks']['last']['status'] == 'completed', "Tasks after a failure still run"
+    print(f"  ✅ Ready after tasks: {[name + ':' + info['status'] for name, info in status['tasks'].items()]}")
+
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash Startup Tests")
+    print("=" * 50)
+
+    tests = [
+        test_main_import,
+        test_lazy_modules,
+        test_background_tasks
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
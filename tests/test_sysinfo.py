@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Test script for system information collection
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.cpu_sampler import CpuSampler
+import threading
+import psutil
+from collections import namedtuple
+from backend.sysinfo import get_cpu_stats, get_cpu_details, get_network_info, get_disk_io, get_disk_partitions
+from backend.cache import get_cache_stats, refresh_cache
+from backend.rates import CounterRates
+
+def test_cpu_sampler():
+    """Test that the CPU sampler fills its ring buffer in the background"""
+    print("📈 Testing CPU sampler...")
+    
+    sampler = CpuSampler(interval=0.05, history_size=5)
+    sampler.start()
+    
+    try:
+        assert sampler.get_per_core(), "A sample should be available right after start"
+        
+        time.sleep(0.5)
+        samples = sampler.get_samples(window=60)
+        assert len(samples) == 5, f"Ring buffer should be capped at 5 samples, got {len(samples)}"
+        print(f"  ✅ Ring buffer holds {len(samples)} samples")
+        
+        per_core = sampler.get_per_core(window=1)
+        assert all(0.0 <= value <= 100.0 for value in per_core)
+        print(f"  ✅ Averaged usage over {len(per_core)} cores")
+        
+        return True
+        
+    finally:
+        sampler.stop()
+
+def test_cpu_stats_is_non_blocking():
+    """Test that get_cpu_stats returns without sleeping"""
+    print("⏱️ Testing get_cpu_stats latency...")
+    
+    get_cpu_stats()  # Starts the shared sampler
+    
+    start = time.time()
+    stats = get_cpu_stats()
+    duration = time.time() - start
+    
+    assert duration < 0.5, f"get_cpu_stats took {duration:.2f}s"
+    assert len(stats['cpu_percent_per_core']) == stats['logical_cpus']
+    print(f"  ✅ get_cpu_stats returned in {duration*1000:.1f} ms")
+    
+    return True
+
+def test_static_facts_cached():
+    """Test that static hardware facts are computed once until refreshed"""
+    print("🗄️ Testing sysinfo cache...")
+    
+    refresh_cache('static')
+    before = get_cache_stats()['get_cpu_details']
+    
+    first = get_cpu_details()
+    second = get_cpu_details()
+    assert first == second
+    
+    after = get_cache_stats()['get_cpu_details']
+    assert after['misses'] == before['misses'] + 1, "Only the first call should miss"
+    assert after['hits'] == before['hits'] + 1, "Second call should be a cache hit"
+    print(f"  ✅ get_cpu_details hits={after['hits']} misses={after['misses']}")
+    
+    # Cached values are copies, mutating them must not leak into the cache
+    second['injected'] = True
+    assert 'injected' not in get_cpu_details()
+    
+    refresh_cache('static')
+    get_cpu_details()
+    assert get_cache_stats()['get_cpu_details']['misses'] == after['misses'] + 1
+    print("  ✅ Refresh forces recomputation")
+    
+    stats = get_cache_stats()
+    assert stats['get_ram_info']['kind'] == 'dynamic' and stats['get_ram_info']['ttl_seconds']
+    
+    return True
+
+def test_counter_rates():
+    """Test delta-based rates from the cached previous sample"""
+    print("📶 Testing counter rates...")
+    
+    rates = CounterRates(min_interval=0.5)
+    first, elapsed = rates.update({'eth0': {'rx_bytes': 1000}}, now=100.0)
+    assert first == {'eth0': None} and elapsed == 0, "First sample has no rate"
+    
+    second, elapsed = rates.update({'eth0': {'rx_bytes': 3000}, 'veth1': {'rx_bytes': 5}}, now=102.0)
+    assert second['eth0'] == {'rx_bytes_per_sec': 1000.0} and elapsed == 2.0
+    assert second['veth1'] is None, "New devices start without a rate"
+    
+    # Too close to the previous sample, the rate is taken against it but it is kept
+    third, _ = rates.update({'eth0': {'rx_bytes': 3100}}, now=102.1)
+    assert third['eth0']['rx_bytes_per_sec'] == 1000.0
+    
+    # Counter reset, no negative rates
+    fourth, _ = rates.update({'eth0': {'rx_bytes': 10}}, now=104.0)
+    assert fourth['eth0']['rx_bytes_per_sec'] == 0
+    print("  ✅ Rates, new devices and counter resets handled")
+    
+    return True
+
+def test_network_counters():
+    """Test per-interface counters and rates in get_network_info"""
+    print("🌐 Testing network counters...")
+    
+    refresh_cache('dynamic')
+    get_network_info()
+    time.sleep(0.6)
+    refresh_cache('dynamic')
+    info = get_network_info()
+    
+    assert info, "At least one interface expected"
+    for name, iface in info.items():
+        counters = iface['counters']
+        assert counters is None or {'rx_bytes', 'tx_bytes', 'rx_packets', 'tx_drops', 'rx_errors'} <= set(counters)
+        if iface['rates'] is not None:
+            assert all(rate >= 0 for rate in iface['rates'].values())
+            assert iface['rate_interval_seconds'] >= 0.5
+    with_rates = [name for name, iface in info.items() if iface['rates']]
+    assert with_rates, "Second call should have rates"
+    print(f"  ✅ Counters for {len(info)} interfaces, rates for {len(with_rates)}")
+    
+    return True
+
+def test_disk_io_rates():
+    """Test per-device I/O counters, rates and device filters in get_disk_io"""
+    print("💽 Testing per-disk I/O...")
+    
+    refresh_cache('dynamic')
+    first = get_disk_io()
+    if not first:
+        print("  ⚠️ No disk I/O counters on this host, skipping")
+        return True
+    time.sleep(0.6)
+    refresh_cache('dynamic')
+    info = get_disk_io(include_dm=False, include_loop=False)
+    
+    assert info['read_bytes'] >= first['read_bytes'], "Totals are lifetime counters"
+    assert not any(name.startswith(('dm-', 'loop')) for name in info['devices'])
+    for name, device in info['devices'].items():
+        rates = device['rates']
+        assert rates is not None, f"{name} should have rates on the second call"
+        assert rates['read_iops'] >= 0 and rates['await_ms'] >= 0
+        assert rates['utilization_percent'] is None or 0 <= rates['utilization_percent'] <= 100
+    print(f"  ✅ Rates for {sorted(info['devices'])}")
+    
+    return True
+
+def test_partition_timeouts():
+    """Test that a hung mount can't block partition enumeration"""
+    print("⏳ Testing partition usage timeouts...")
+    
+    Partition = namedtuple('Partition', 'device mountpoint fstype opts')
+    Usage = namedtuple('Usage', 'total used free percent')
+    partitions = [
+        Partition('/dev/sda1', '/', 'ext4', 'rw'),
+        Partition('server:/export', '/mnt/nfs', 'nfs4', 'rw'),
+        Partition('mergerfs', '/mnt/hung', 'fuse.mergerfs', 'rw'),
+        Partition('proc', '/proc', 'proc', 'rw'),
+    ] + [Partition(f'/dev/sdb{i}', f'/mnt/data{i}', 'xfs', 'rw') for i in range(20)]
+    hang = threading.Event()
+    release = threading.Event()
+    
+    def fake_disk_usage(mountpoint):
+        if mountpoint == '/mnt/hung' and hang.is_set():
+            release.wait(10)
+        time.sleep(0.05)
+        return Usage(100, 40, 60, 40.0)
+    
+    original = psutil.disk_partitions, psutil.disk_usage
+    psutil.disk_partitions = lambda all=False: partitions
+    psutil.disk_usage = fake_disk_usage
+    os.environ['SYSDASH_DISK_USAGE_TIMEOUT'] = '0.5'
+    try:
+        refresh_cache('dynamic')
+        start = time.time()
+        default = get_disk_partitions()
+        assert time.time() - start < 0.5, "Usage should be collected in parallel"
+        assert [p['mountpoint'] for p in default] == ['/', '/mnt/hung'] + [f'/mnt/data{i}' for i in range(20)]
+        assert all(not p['stale'] and p['used'] == 40 for p in default)
+        print("  ✅ 22 mounts collected in parallel, NFS and proc filtered")
+        
+        hang.set()
+        refresh_cache('dynamic')
+        start = time.time()
+        mounts = {p['mountpoint']: p for p in get_disk_partitions(include_network=True, include_pseudo=True)}
+        duration = time.time() - start
+        assert duration < 1.0, f"Should be bounded by the timeout, took {duration:.2f}s"
+        assert mounts['/mnt/hung']['stale'] and mounts['/mnt/hung']['used'] == 40, "Hung mount reports cached usage"
+        assert not mounts['/mnt/nfs']['stale'] and '/proc' in mounts
+        print(f"  ✅ Hung mount answered from cache after {duration:.2f}s")
+        
+        # The hung call is not piled up again
+        refresh_cache('dynamic')
+        start = time.time()
+        assert get_disk_partitions()[1]['stale']
+        assert time.time() - start < 0.4, "Known hung mounts should not be waited for again"
+        print("  ✅ Hung mount is not retried or waited for while its call is pending")
+    finally:
+        release.set()
+        psutil.disk_partitions, psutil.disk_usage = original
+        del os.environ['SYSDASH_DISK_USAGE_TIMEOUT']
+        refresh_cache('dynamic')
+    
+    return True
+
+def run_all_tests():
+    """Run all tests"""
+    print("🚀 Starting SysDash System Info Tests")
+    print("=" * 50)
+    
+    tests = [
+        test_cpu_sampler,
+        test_cpu_stats_is_non_blocking,
+        test_static_facts_cached,
+        test_counter_rates,
+        test_network_counters,
+        test_disk_io_rates,
+        test_partition_timeouts
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+                print("✅ PASSED\n")
+            else:
+                failed += 1
+                print("❌ FAILED\n")
+        except Exception as e:
+            failed += 1
+            print(f"❌ FAILED: {e}\n")
+    
+    print("=" * 50)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
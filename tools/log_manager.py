@@ -38,11 +38,18 @@ def main():
     backup_parser = subparsers.add_parser('backup', help='Create backup of log file')
     backup_parser.add_argument('--log-file', help='Path to log file')
     
+    # Backups command
+    subparsers.add_parser('backups', help='List available backups')
+    
     # Restore command
     restore_parser = subparsers.add_parser('restore', help='Restore from backup')
-    restore_parser.add_argument('backup_file', help='Backup file to restore')
+    restore_parser.add_argument('backup_name', help='Backup name to restore (see the backups command)')
     restore_parser.add_argument('--target', help='Target file path')
     
+    # Migrate command
+    migrate_parser = subparsers.add_parser('migrate', help='Convert a legacy log file to the append-only format')
+    migrate_parser.add_argument('--log-file', help='Path to log file')
+    
     # Cleanup command
     cleanup_parser = subparsers.add_parser('cleanup', help='Clean up old log entries')
     cleanup_parser.add_argument('--days', type=int, default=30, help='Days to keep (default: 30)')
@@ -91,17 +98,33 @@ def main():
         
         elif args.command == 'backup':
             backup_manager = LogBackupManager()
-            backup_path = backup_manager.create_backup(args.log_file)
-            print(f"✅ Backup created: {backup_path}")
+            backup_name = backup_manager.create_backup(args.log_file)
+            print(f"✅ Backup created: {backup_name}")
+        
+        elif args.command == 'backups':
+            backup_manager = LogBackupManager()
+            backups = backup_manager.list_backups()
+            if not backups:
+                print("No backups found")
+            for backup in backups:
+                print(f"{backup['filename']}  {backup['created']}  {backup['size']} bytes  {backup['metadata']['original_file']}")
         
         elif args.command == 'restore':
             backup_manager = LogBackupManager()
-            success = backup_manager.restore_backup(args.backup_file, args.target)
+            success = backup_manager.restore_backup(args.backup_name, args.target)
             if success:
-                print(f"✅ Backup restored from: {args.backup_file}")
+                print(f"✅ Backup restored from: {args.backup_name}")
             else:
                 print("❌ Restore failed - integrity check failed")
         
+        elif args.command == 'migrate':
+            logger = TestResultLogger(args.log_file) if args.log_file else TestResultLogger()
+            migrated = logger.secure_logger.migrate_legacy_log()
+            if migrated:
+                print(f"✅ Migrated {migrated} entries to the append-only format")
+            else:
+                print("ℹ️ Log file already uses the append-only format")
+        
         elif args.command == 'cleanup':
             result = cleanup_old_logs(args.days)
             if 'error' in result: